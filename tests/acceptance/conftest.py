@@ -1,7 +1,6 @@
 import pytest
 
-from utils.import_current_votes import is_there_any_vote_scripts, is_there_any_upgrade_scripts
-from utils.test.governance_helpers import execute_vote_and_process_dg_proposals
+from utils.test.governance_helpers import AUTOEXECUTE_VOTE
 from utils.dual_governance import is_there_any_proposals_from_env, process_pending_proposals
 
 
@@ -10,6 +9,11 @@ def autoexecute_dg_proposals():
     process_pending_proposals()
 
 
-@pytest.fixture(scope="module", autouse=is_there_any_vote_scripts() or is_there_any_upgrade_scripts() or is_there_any_proposals_from_env())
-def autoexecute_vote(module_isolation, helpers, vote_ids_from_env, dg_proposal_ids_from_env):
-    execute_vote_and_process_dg_proposals(helpers, vote_ids_from_env, dg_proposal_ids_from_env)
+@pytest.fixture(scope="module")
+def module_isolation(enacted_module_isolation):
+    """Overrides the brownie fixture, see `enacted_module_isolation`"""
+
+
+@pytest.fixture(scope="module", autouse=AUTOEXECUTE_VOTE)
+def autoexecute_vote(module_isolation):
+    """The votes and DG proposals are executed by `module_isolation`"""
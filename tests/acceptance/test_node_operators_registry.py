@@ -1,3 +1,5 @@
+import operator
+
 import pytest
 from brownie import ZERO_ADDRESS, interface, web3, reverts  # type: ignore
 
@@ -13,6 +15,7 @@ from utils.config import (
     CURATED_STAKING_MODULE_OPERATORS_ACTIVE_COUNT,
     CURATED_STAKING_MODULE_TYPE,
 )
+from utils.node_operators_reader import read_node_operators
 
 @pytest.fixture
 def voting(accounts):
@@ -96,9 +99,24 @@ def test_nor_state(contract):
     assert summary["totalDepositedValidators"] >= 177397
     assert summary["depositableValidatorsCount"] > 0
 
-    for id in range(node_operators_count):
-        node_operator = contract.getNodeOperator(id, True)
-
+    state = read_node_operators(contract)
+    operators, summaries = state.operators, state.summaries
+    assert len(operators) == node_operators_count
+
+    # Invariant check
+    # https://github.com/lidofinance/lido-dao/blob/cadffa46a2b8ed6cfa1127fca2468bae1a82d6bf/contracts/0.4.24/nos/NodeOperatorsRegistry.sol#L168
+    for left, right in (
+        (operators["totalExitedValidators"], operators["totalDepositedValidators"]),
+        (operators["totalDepositedValidators"], operators["totalVettedValidators"]),
+        (operators["totalVettedValidators"], operators["totalAddedValidators"]),
+        (summaries["totalExitedValidators"], summaries["totalDepositedValidators"]),
+    ):
+        assert not operators.ids_where(map(operator.gt, left, right))
+    # uint64 in getNodeOperator, uint256 in getNodeOperatorSummary
+    for name in ("totalExitedValidators", "totalDepositedValidators"):
+        assert list(operators[name]) == summaries[name]
+
+    for id, (node_operator, node_operator_summary) in enumerate(zip(operators.rows(), summaries.rows())):
         deactivated_node_operators = [12, 1, 32] # on vote 24-01-16, NO id 32 deactivated on vote 08-04-26
 
         assert node_operator["active"] == (id not in deactivated_node_operators)
@@ -106,14 +124,6 @@ def test_nor_state(contract):
         assert node_operator["name"] != ""
         assert node_operator["rewardAddress"] != ZERO_ADDRESS
 
-        # Invariant check
-        # https://github.com/lidofinance/lido-dao/blob/cadffa46a2b8ed6cfa1127fca2468bae1a82d6bf/contracts/0.4.24/nos/NodeOperatorsRegistry.sol#L168
-        assert node_operator["totalExitedValidators"] >= 0
-        assert node_operator["totalExitedValidators"] <= node_operator["totalDepositedValidators"]
-        assert node_operator["totalDepositedValidators"] <= node_operator["totalVettedValidators"]
-        assert node_operator["totalVettedValidators"] <= node_operator["totalAddedValidators"]
-
-        node_operator_summary = contract.getNodeOperatorSummary(id)
         exited_node_operators = [12, 1] # NO id 12 was added on vote 23-05-23, NO id 1 was added on vote 03-10-23
         soft_limit_0_node_operators = [32, 3] # NO id 32 was added on vote 10-12-25, NO id 3 was added on vote 08-04-26
         assert node_operator_summary["targetLimitMode"] == (1 if id in exited_node_operators or id in soft_limit_0_node_operators else 0)
@@ -124,16 +134,8 @@ def test_nor_state(contract):
         # Can be more than 0 in regular protocol operations
         # assert node_operator_summary["stuckPenaltyEndTimestamp"] == 0
 
-        # Invariant check
-        # https://github.com/lidofinance/lido-dao/blob/cadffa46a2b8ed6cfa1127fca2468bae1a82d6bf/contracts/0.4.24/nos/NodeOperatorsRegistry.sol#L168
-        assert node_operator_summary["totalExitedValidators"] >= 0
-        assert node_operator_summary["totalExitedValidators"] <= node_operator_summary["totalDepositedValidators"]
-
         assert node_operator_summary["depositableValidatorsCount"] is not None
 
-        assert node_operator["totalExitedValidators"] == node_operator_summary["totalExitedValidators"]
-        assert node_operator["totalDepositedValidators"] == node_operator_summary["totalDepositedValidators"]
-
         if id in soft_limit_0_node_operators:
             assert node_operator_summary["depositableValidatorsCount"] == 0
         else:
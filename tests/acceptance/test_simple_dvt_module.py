@@ -1,3 +1,5 @@
+import operator
+
 import pytest
 from brownie import ZERO_ADDRESS, interface, web3, reverts  # type: ignore
 
@@ -21,6 +23,7 @@ from utils.config import (
     EASYTRACK_SIMPLE_DVT_UPDATE_TARGET_VALIDATOR_LIMITS_FACTORY,
     EASYTRACK_SIMPLE_DVT_CHANGE_NODE_OPERATOR_MANAGERS_FACTORY,
 )
+from utils.node_operators_reader import read_node_operators
 
 REQUEST_BURN_SHARES_ROLE = "0x4be29e0e4eb91f98f709d98803cba271592782e293b84a625e025cbb40197ba8"
 STAKING_ROUTER_ROLE = "0xbb75b874360e0bfd87f964eadd8276d8efb7c942134fc329b513032d0803e0c6"
@@ -109,22 +112,29 @@ def test_simple_dvt_state(contract):
     deactivated_node_operators = []  # reserved for future use
     exited_node_operators = []  # reserved for future use
 
-    for id in range(node_operators_count):
-        node_operator = contract.getNodeOperator(id, True)
-
+    state = read_node_operators(contract)
+    operators, summaries = state.operators, state.summaries
+    assert len(operators) == node_operators_count
+
+    # Invariant check
+    # https://github.com/lidofinance/lido-dao/blob/cadffa46a2b8ed6cfa1127fca2468bae1a82d6bf/contracts/0.4.24/nos/NodeOperatorsRegistry.sol#L168
+    for left, right in (
+        (operators["totalExitedValidators"], operators["totalDepositedValidators"]),
+        (operators["totalDepositedValidators"], operators["totalVettedValidators"]),
+        (operators["totalVettedValidators"], operators["totalAddedValidators"]),
+        (summaries["totalExitedValidators"], summaries["totalDepositedValidators"]),
+    ):
+        assert not operators.ids_where(map(operator.gt, left, right))
+    # uint64 in getNodeOperator, uint256 in getNodeOperatorSummary
+    for name in ("totalExitedValidators", "totalDepositedValidators"):
+        assert list(operators[name]) == summaries[name]
+
+    for id, (node_operator, node_operator_summary) in enumerate(zip(operators.rows(), summaries.rows())):
         assert node_operator["active"] == (id not in deactivated_node_operators)
         assert node_operator["name"] is not None
         assert node_operator["name"] != ""
         assert node_operator["rewardAddress"] != ZERO_ADDRESS
 
-        # Invariant check
-        # https://github.com/lidofinance/lido-dao/blob/cadffa46a2b8ed6cfa1127fca2468bae1a82d6bf/contracts/0.4.24/nos/NodeOperatorsRegistry.sol#L168
-        assert node_operator["totalExitedValidators"] >= 0
-        assert node_operator["totalExitedValidators"] <= node_operator["totalDepositedValidators"]
-        assert node_operator["totalDepositedValidators"] <= node_operator["totalVettedValidators"]
-        assert node_operator["totalVettedValidators"] <= node_operator["totalAddedValidators"]
-
-        node_operator_summary = contract.getNodeOperatorSummary(id)
         if id in exited_node_operators:
             assert (
                 node_operator_summary["targetLimitMode"] > 0
@@ -139,16 +149,8 @@ def test_simple_dvt_state(contract):
         # Can be more than 0 in regular protocol operations
         # assert node_operator_summary["stuckPenaltyEndTimestamp"] == 0
 
-        # Invariant check
-        # https://github.com/lidofinance/lido-dao/blob/cadffa46a2b8ed6cfa1127fca2468bae1a82d6bf/contracts/0.4.24/nos/NodeOperatorsRegistry.sol#L168
-        assert node_operator_summary["totalExitedValidators"] >= 0
-        assert node_operator_summary["totalExitedValidators"] <= node_operator_summary["totalDepositedValidators"]
-
         assert node_operator_summary["depositableValidatorsCount"] is not None
 
-        assert node_operator["totalExitedValidators"] == node_operator_summary["totalExitedValidators"]
-        assert node_operator["totalDepositedValidators"] == node_operator_summary["totalDepositedValidators"]
-
         if node_operator_summary["targetLimitMode"] == 0:
             no_depositable_validators_count = (
                 node_operator["totalVettedValidators"] - node_operator["totalDepositedValidators"]
@@ -5,6 +5,7 @@ import brownie.exceptions
 import pytest
 
 from brownie import chain, interface, web3, network
+from brownie._config import CONFIG
 from brownie.network import state
 from brownie.network.contract import Contract
 
@@ -15,7 +16,16 @@ from utils.config import contracts, network_name, get_vote_duration
 from utils.config import *
 from utils.txs.deploy import deploy_from_prepared_tx
 from utils.test.helpers import ETH
+from utils.test.fork_state_pool import fork_state_pool
+from utils.test.governance_helpers import (
+    AUTOEXECUTE_VOTE,
+    enacted_state_key,
+    execute_vote_and_process_dg_proposals,
+)
 from utils.balance import set_balance, set_balance_in_wei
+from tests.fork_workers import ForkWorkersPlugin
+from tests.timings import TimingsPlugin
+from tests.rpc_profile import RPC_PROFILE, RpcProfilePlugin
 from functools import wraps
 
 ENV_OMNIBUS_BYPASS_EVENTS_DECODING = "OMNIBUS_BYPASS_EVENTS_DECODING"
@@ -24,6 +34,13 @@ ENV_OMNIBUS_VOTE_IDS = "OMNIBUS_VOTE_IDS"
 ENV_DG_PROPOSAL_IDS = "DG_PROPOSAL_IDS"
 
 
+def pytest_configure(config):
+    config.pluginmanager.register(ForkWorkersPlugin(config), "fork-workers")
+    config.pluginmanager.register(TimingsPlugin(config), "timings")
+    if RPC_PROFILE:
+        config.pluginmanager.register(RpcProfilePlugin(config), "rpc-profile")
+
+
 @pytest.fixture(scope="function", autouse=True)
 def shared_setup(fn_isolation):
     pass
@@ -200,6 +217,29 @@ def dg_proposal_ids_from_env() -> [int]:
     return get_active_proposals_from_env()
 
 
+@pytest.fixture(scope="module")
+def enacted_module_isolation(helpers, vote_ids_from_env, dg_proposal_ids_from_env):
+    """
+    `module_isolation` of the acceptance and regression tests. If a vote is auto-executed, every module
+    starts from the state after the votes and DG proposals execution. The execution runs once per session,
+    the next modules revert to the fork snapshot taken after it.
+    """
+    if not AUTOEXECUTE_VOTE:
+        chain.reset()
+        yield
+        if not CONFIG.argv["interrupt"]:
+            chain.reset()
+        return
+
+    key = enacted_state_key(vote_ids_from_env, dg_proposal_ids_from_env)
+    fork_state_pool.restore(
+        key, lambda: execute_vote_and_process_dg_proposals(helpers, vote_ids_from_env, dg_proposal_ids_from_env)
+    )
+    yield
+    if not CONFIG.argv["interrupt"] and not fork_state_pool.restore(key):
+        chain.reset()
+
+
 @pytest.fixture(scope="module")
 def bypass_events_decoding() -> bool:
     if os.getenv(ENV_OMNIBUS_BYPASS_EVENTS_DECODING):
@@ -0,0 +1,62 @@
+"""
+Runs the suite on several fork nodes with pytest-xdist:
+
+    brownie test -n 4 --network mfh-1
+
+Brownie launches a hardhat fork for every worker on the network port shifted by the worker number,
+this plugin points the worker network host at that port, so `mfh-1` with 4 workers uses the forks
+on 8545..8548. The test modules are sent to the workers longest first by the durations
+of the previous runs from the timing database, see tests/timings.py.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Dict
+
+import pytest
+from brownie._config import CONFIG
+
+from utils.test.timing_db import TimingDatabase, order_modules
+
+# Base port of the worker forks, the network port is used if not set
+XDIST_FORK_BASE_PORT = os.getenv("XDIST_FORK_BASE_PORT")
+
+
+def make_duration_scheduler(durations: Dict[str, float]):
+    from xdist.scheduler import LoadFileScheduling
+
+    class DurationScheduling(LoadFileScheduling):
+        """
+        Sends the whole modules to the workers like the brownie file scheduling, but the longest
+        modules go first, so the short ones fill the gaps at the end of the run.
+        """
+
+        def _assign_work_unit(self, node):
+            if not getattr(self, "_ordered", False):
+                order = order_modules(list(self.workqueue), durations)
+                self.workqueue = OrderedDict((scope, self.workqueue[scope]) for scope in order)
+                self._ordered = True
+            super()._assign_work_unit(node)
+
+    return DurationScheduling
+
+
+class ForkWorkersPlugin:
+    def __init__(self, config):
+        self.config = config
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        return make_duration_scheduler(TimingDatabase().module_durations())(config, log)
+
+    def pytest_sessionstart(self, session):
+        if not hasattr(self.config, "workerinput"):
+            return
+
+        # the worker port is already shifted by brownie, but the host of the hardhat networks includes the port
+        network_id = self.config.workerinput["network"] or CONFIG.settings["networks"]["default"]
+        settings = CONFIG.networks[network_id]
+        worker_id = int("".join(char for char in self.config.workerinput["workerid"] if char.isdigit()))
+        if XDIST_FORK_BASE_PORT is not None:
+            settings["cmd_settings"]["port"] = int(XDIST_FORK_BASE_PORT) + worker_id
+        settings["host"] = f"http://127.0.0.1:{settings['cmd_settings']['port']}"
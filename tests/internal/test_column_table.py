@@ -0,0 +1,33 @@
+from array import array
+
+from brownie.convert.datatypes import Wei
+
+from utils.column_table import ColumnTable
+
+TYPES = {"active": "bool", "name": "string", "totalDepositedValidators": "uint64", "totalExitedValidators": "uint64"}
+
+
+def test_column_table_uint64_columns_are_arrays():
+    rows = [
+        {"active": True, "name": "first", "totalDepositedValidators": Wei(10), "totalExitedValidators": Wei(1)},
+        {"active": False, "name": "second", "totalDepositedValidators": Wei(20), "totalExitedValidators": Wei(0)},
+    ]
+    table = ColumnTable(rows, TYPES)
+
+    assert len(table) == 2
+    assert isinstance(table["totalDepositedValidators"], array)
+    assert table["totalDepositedValidators"].typecode == "Q"
+    assert table["totalExitedValidators"] == array("Q", [1, 0])
+    assert type(table["active"]) is list
+    assert type(table["name"]) is list
+    assert table.row(1) == rows[1]
+
+
+def test_column_table_column_type_depends_on_declared_type_only():
+    small = ColumnTable([{"value": Wei(1)}, {"value": Wei(2)}], {"value": "uint256"})
+    large = ColumnTable([{"value": Wei(2**64)}, {"value": Wei(2)}], {"value": "uint256"})
+    untyped = ColumnTable([{"value": Wei(1)}, {"value": Wei(2)}])
+
+    assert small["value"] == [1, 2]
+    assert large["value"] == [2**64, 2]
+    assert untyped["value"] == [1, 2]
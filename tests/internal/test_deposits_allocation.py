@@ -0,0 +1,53 @@
+import random
+
+from utils.deposits_allocation import (
+    AllocationScenario,
+    allocate_min_first,
+    get_deposits_allocation,
+    get_deposits_allocations,
+)
+
+
+def _allocate_key_by_key(buckets, capacities, allocation_size):
+    """Every key goes to the lowest bucket below its capacity, the lowest index first on ties"""
+    buckets = list(buckets)
+    allocated = 0
+    for _ in range(allocation_size):
+        candidates = [index for index, bucket in enumerate(buckets) if bucket < capacities[index]]
+        if not candidates:
+            break
+        buckets[min(candidates, key=lambda index: buckets[index])] += 1
+        allocated += 1
+    return allocated, buckets
+
+
+def test_allocate_min_first_fills_lowest_buckets_first():
+    assert allocate_min_first([0, 5, 10], [20, 20, 20], 8) == (8, [7, 6, 10])
+    assert allocate_min_first([0, 5, 10], [3, 20, 20], 8) == (8, [3, 10, 10])
+    # the capacities are less than the allocation size
+    assert allocate_min_first([0, 5, 10], [3, 6, 10], 100) == (4, [3, 6, 10])
+    assert allocate_min_first([4, 4], [4, 4], 1) == (0, [4, 4])
+
+
+def test_allocate_min_first_matches_key_by_key_allocation():
+    rng = random.Random(7)
+    for _ in range(2000):
+        modules = rng.randint(1, 6)
+        buckets = [rng.randint(0, 30) for _ in range(modules)]
+        capacities = [rng.randint(0, 40) for _ in range(modules)]
+        allocation_size = rng.randint(0, 120)
+
+        assert allocate_min_first(buckets, capacities, allocation_size) == _allocate_key_by_key(
+            buckets, capacities, allocation_size
+        )
+
+
+def test_deposits_allocation_limits():
+    scenario = AllocationScenario(
+        target_shares=[10000, 500, 10000], active_keys=[100, 0, 10], depositable_keys=[5, 100, 20], keys_to_allocate=50
+    )
+
+    # the second module is limited by the target share, the others by the depositable keys
+    assert get_deposits_allocation(*scenario) == (33, [105, 8, 30])
+    assert get_deposits_allocation(*scenario._replace(ignore_depositable=True)) == (50, [100, 8, 52])
+    assert get_deposits_allocations([scenario, scenario]) == [(33, [105, 8, 30])] * 2
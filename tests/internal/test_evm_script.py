@@ -0,0 +1,59 @@
+from avotes_parser.core import Call
+from avotes_parser.core.ABI.utilities.exceptions import ABIEtherscanNetworkError
+from brownie import convert
+from web3 import Web3
+
+from utils import evm_script
+from utils.evm_script import decode_evm_script, encode_call_script
+
+TOKEN = convert.to_address("0x00000000000000000000000000000000000000aa")
+UNVERIFIED = convert.to_address("0x00000000000000000000000000000000000000bb")
+
+TRANSFER = {
+    "type": "function",
+    "name": "transfer",
+    "inputs": [{"name": "to", "type": "address"}, {"name": "amount", "type": "uint256"}],
+    "outputs": [{"name": "", "type": "bool"}],
+    "stateMutability": "nonpayable",
+}
+TRANSFER_SELECTOR = "0xa9059cbb"
+
+
+def _transfer_calldata(to, amount):
+    return TRANSFER_SELECTOR + Web3.to_bytes(hexstr=to).rjust(32, b"\0").hex() + amount.to_bytes(32, "big").hex()
+
+
+def test_decode_evm_script_reports_failed_abi_lookup_per_call(monkeypatch):
+    lookups = []
+
+    def get_method_abi(address, method_id):
+        lookups.append((address, method_id))
+        if address == UNVERIFIED:
+            raise ABIEtherscanNetworkError("explorer is down")
+        return TRANSFER
+
+    decodes = []
+    decode_encoded_call = evm_script.decode_encoded_call
+
+    def counting_decode_encoded_call(encoded_call, resolved_abis=None):
+        decodes.append(encoded_call.address)
+        return decode_encoded_call(encoded_call, resolved_abis)
+
+    monkeypatch.setattr(evm_script, "get_method_abi", get_method_abi)
+    monkeypatch.setattr(evm_script, "decode_encoded_call", counting_decode_encoded_call)
+
+    script = encode_call_script(
+        [
+            (TOKEN, _transfer_calldata(UNVERIFIED, 1)),
+            (UNVERIFIED, _transfer_calldata(TOKEN, 2)),
+            (TOKEN, _transfer_calldata(UNVERIFIED, 3)),
+        ]
+    )
+    (first, failed, last) = decode_evm_script(script, verbose=False)
+
+    assert isinstance(first, Call) and first.inputs[1].value == 1
+    assert isinstance(last, Call) and last.inputs[1].value == 3
+    assert failed == repr(ABIEtherscanNetworkError("explorer is down"))
+    # every ABI is looked up once, the calls decoded while resolving are not decoded again
+    assert sorted(lookups) == [(TOKEN, TRANSFER_SELECTOR), (UNVERIFIED, TRANSFER_SELECTOR)]
+    assert len(decodes) == 4
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from utils.test.exit_bus_data import (
+    DATA_FORMAT_LIST,
+    LidoValidator,
+    decode_exit_requests,
+    encode_data,
+    sort_validators_to_eject,
+)
+
+
+def _validators_to_eject(rng, count):
+    return [
+        (
+            (rng.randint(1, 3), rng.randint(0, 2**40 - 1)),
+            LidoValidator(index=rng.randint(0, 2**64 - 1), pubkey="0x" + rng.randbytes(48).hex()),
+        )
+        for _ in range(count)
+    ]
+
+
+def _encode_request(module_id, node_operator_id, validator):
+    """The request bytes concatenated field by field"""
+    return (
+        module_id.to_bytes(3, "big")
+        + node_operator_id.to_bytes(5, "big")
+        + validator.index.to_bytes(8, "big")
+        + bytes.fromhex(validator.pubkey[2:])
+    )
+
+
+def test_exit_bus_data_encoding():
+    validators_to_eject = _validators_to_eject(random.Random(11), 50)
+
+    data, data_format = encode_data(validators_to_eject)
+
+    assert data_format == DATA_FORMAT_LIST
+    assert data == b"".join(
+        _encode_request(module_id, node_operator_id, validator)
+        for (module_id, node_operator_id), validator in sort_validators_to_eject(validators_to_eject)
+    )
+    assert encode_data(validators_to_eject, sort=False)[0] == b"".join(
+        _encode_request(module_id, node_operator_id, validator)
+        for (module_id, node_operator_id), validator in validators_to_eject
+    )
+
+
+def test_exit_bus_data_decode_encoded():
+    validators_to_eject = _validators_to_eject(random.Random(12), 50)
+
+    data, _ = encode_data(validators_to_eject, sort=False)
+
+    assert [
+        (record.module_id, record.node_operator_id, record.validator_index, "0x" + record.pubkey.hex())
+        for record in decode_exit_requests(data)
+    ] == [
+        (module_id, node_operator_id, validator.index, validator.pubkey)
+        for (module_id, node_operator_id), validator in validators_to_eject
+    ]
+
+
+def test_exit_bus_data_errors():
+    ((index, validator),) = _validators_to_eject(random.Random(13), 1)
+
+    with pytest.raises(ValueError, match="pub key"):
+        encode_data([(index, LidoValidator(validator.index, validator.pubkey[:-2]))])
+    with pytest.raises(OverflowError):
+        encode_data([((2**24, 0), validator)])
+    with pytest.raises(ValueError, match="length"):
+        list(decode_exit_requests(encode_data([(index, validator)])[0][:-1]))
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+from eth_hash.auto import keccak
+
+from utils.test.extra_data import ExtraDataLengths, ExtraDataService, FormatList, ItemType, ZERO_HASH
+
+MAX_ITEMS_COUNT = 2
+MAX_NO_IN_PAYLOAD_COUNT = 3
+
+
+def _exited_validators(rng):
+    return {
+        (module_id, operator_id): rng.randint(0, 2**128 - 1)
+        for module_id in (1, 2, 3)
+        for operator_id in rng.sample(range(1000), rng.randint(1, 7))
+    }
+
+
+def _encode_item(index, payload):
+    """The item bytes concatenated field by field"""
+    return (
+        index.to_bytes(ExtraDataLengths.ITEM_INDEX, "big")
+        + ItemType.EXTRA_DATA_TYPE_EXITED_VALIDATORS.value.to_bytes(ExtraDataLengths.ITEM_TYPE, "big")
+        + payload.module_id.to_bytes(ExtraDataLengths.MODULE_ID, "big")
+        + len(payload.node_operator_ids).to_bytes(ExtraDataLengths.NODE_OPS_COUNT, "big")
+        + b"".join(id.to_bytes(ExtraDataLengths.NODE_OPERATOR_IDS, "big") for id in payload.node_operator_ids)
+        + b"".join(count.to_bytes(ExtraDataLengths.EXITED_VALS_COUNT, "big") for count in payload.vals_counts)
+    )
+
+
+def test_extra_data_encoding():
+    exited_validators = _exited_validators(random.Random(5))
+    payloads = ExtraDataService.build_validators_payloads(exited_validators, MAX_NO_IN_PAYLOAD_COUNT)
+
+    items_count, txs = ExtraDataService.build_extra_transactions_data(payloads, MAX_ITEMS_COUNT)
+
+    items = [_encode_item(index, payload) for index, payload in enumerate(payloads)]
+    assert items_count == len(payloads)
+    assert txs == [b"".join(items[i : i + MAX_ITEMS_COUNT]) for i in range(0, len(items), MAX_ITEMS_COUNT)]
+
+    hashes, hashed_txs = ExtraDataService.add_hashes_to_transactions(txs)
+    next_hash = ZERO_HASH
+    for tx, hashed_tx, tx_hash in reversed(list(zip(txs, hashed_txs, hashes))):
+        assert hashed_tx == next_hash + tx
+        next_hash = keccak(hashed_tx)
+        assert tx_hash == next_hash
+
+
+def test_extra_data_decode_encoded():
+    exited_validators = _exited_validators(random.Random(6))
+
+    extra_data = ExtraDataService.collect(exited_validators, MAX_ITEMS_COUNT, MAX_NO_IN_PAYLOAD_COUNT)
+    items = list(ExtraDataService.decode(extra_data.extra_data_list, extra_data.extra_data_hash_list[0]))
+
+    assert extra_data.format == FormatList.EXTRA_DATA_FORMAT_LIST_NON_EMPTY.value
+    assert [item.item_index for item in items] == list(range(extra_data.items_count))
+    assert {item.item_type for item in items} == {ItemType.EXTRA_DATA_TYPE_EXITED_VALIDATORS}
+    decoded = {
+        (item.item_payload.module_id, operator_id): count
+        for item in items
+        for operator_id, count in zip(item.item_payload.node_operator_ids, item.item_payload.vals_counts)
+    }
+    assert decoded == exited_validators
+
+
+def test_extra_data_decode_checks_hashes_chain():
+    extra_data = ExtraDataService.collect(
+        _exited_validators(random.Random(7)), MAX_ITEMS_COUNT, MAX_NO_IN_PAYLOAD_COUNT
+    )
+    (first_hash, txs) = (extra_data.extra_data_hash_list[0], extra_data.extra_data_list)
+    assert len(txs) > 1
+
+    with pytest.raises(ValueError, match="hash"):
+        list(ExtraDataService.decode(txs[1:], first_hash))
+    with pytest.raises(ValueError, match="incomplete"):
+        list(ExtraDataService.decode(txs[:-1], first_hash))
+    with pytest.raises(ValueError, match="truncated"):
+        list(ExtraDataService.decode([txs[-1][:-1]]))
+
+
+def test_extra_data_empty():
+    extra_data = ExtraDataService.collect({}, MAX_ITEMS_COUNT, MAX_NO_IN_PAYLOAD_COUNT)
+
+    assert extra_data.format == FormatList.EXTRA_DATA_FORMAT_LIST_EMPTY.value
+    assert (extra_data.items_count, extra_data.extra_data_list) == (0, [])
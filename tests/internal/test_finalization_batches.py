@@ -0,0 +1,143 @@
+import random
+from itertools import accumulate
+
+from utils.finalization_batches import (
+    E27_PRECISION_BASE,
+    MAX_BATCHES_LENGTH,
+    WithdrawalRequests,
+    calculate_finalization_batches,
+)
+
+ETH = 10**18
+SHARE_RATE = 12 * E27_PRECISION_BASE // 10
+FIRST_ID = 100
+
+
+def _requests(items):
+    """(steth, shares, timestamp, report timestamp) of every request after the last finalized one"""
+    return WithdrawalRequests(
+        first_id=FIRST_ID,
+        cumulative_steth=[0, *accumulate(item[0] for item in items)],
+        cumulative_shares=[0, *accumulate(item[1] for item in items)],
+        timestamps=[0, *(item[2] for item in items)],
+        report_timestamps=[0, *(item[3] for item in items)],
+    )
+
+
+def _contract_batches(requests, max_share_rate, max_timestamp, eth_budget, max_requests_per_call=7):
+    """WithdrawalQueueBase.calculateFinalizationBatches() called until it's finished"""
+    (remaining, finished, batches) = (eth_budget, False, [])
+    queue_length = requests.first_id + len(requests.timestamps)
+
+    def request(id):
+        index = id - requests.first_id
+        return (
+            requests.cumulative_steth[index],
+            requests.cumulative_shares[index],
+            requests.timestamps[index],
+            requests.report_timestamps[index],
+        )
+
+    def calc_batch(prev, current):
+        (steth, shares) = (current[0] - prev[0], current[1] - prev[1])
+        return (steth * E27_PRECISION_BASE // shares, steth, shares)
+
+    while not finished and remaining:
+        if not batches:
+            current_id = requests.first_id + 1
+            prev = request(current_id - 1)
+            prev_share_rate = 0
+        else:
+            current_id = batches[-1] + 1
+            prev = request(batches[-1])
+            (prev_share_rate, _, _) = calc_batch(request(batches[-1] - 1), prev)
+
+        next_call_request_id = current_id + max_requests_per_call
+        while current_id < queue_length and current_id < next_call_request_id:
+            current = request(current_id)
+            if current[2] > max_timestamp:
+                break
+            (share_rate, eth_to_finalize, shares) = calc_batch(prev, current)
+            if share_rate > max_share_rate:
+                eth_to_finalize = shares * max_share_rate // E27_PRECISION_BASE
+            if eth_to_finalize > remaining:
+                break
+            remaining -= eth_to_finalize
+
+            if batches and (
+                prev[3] == current[3]
+                or prev_share_rate <= max_share_rate
+                and share_rate <= max_share_rate
+                or prev_share_rate > max_share_rate
+                and share_rate > max_share_rate
+            ):
+                batches[-1] = current_id
+            else:
+                if len(batches) == MAX_BATCHES_LENGTH:
+                    break
+                batches.append(current_id)
+
+            (prev_share_rate, prev) = (share_rate, current)
+            current_id += 1
+
+        finished = current_id == queue_length or current_id < next_call_request_id
+
+    return (remaining, batches)
+
+
+def test_finalization_batches_budget_cutoff():
+    requests = _requests([(ETH, ETH, 1, 1), (2 * ETH, 2 * ETH, 2, 1), (ETH, ETH, 3, 2)])
+
+    assert calculate_finalization_batches(requests, SHARE_RATE, 10, 3 * ETH + 1) == (1, [FIRST_ID + 2])
+    assert calculate_finalization_batches(requests, SHARE_RATE, 10, 3 * ETH - 1) == (2 * ETH - 1, [FIRST_ID + 1])
+    assert calculate_finalization_batches(requests, SHARE_RATE, 10, ETH - 1) == (ETH - 1, [])
+
+
+def test_finalization_batches_timestamp_cutoff():
+    requests = _requests([(ETH, ETH, 1, 1), (ETH, ETH, 5, 1), (ETH, ETH, 6, 2)])
+
+    assert calculate_finalization_batches(requests, SHARE_RATE, 5, 10 * ETH) == (8 * ETH, [FIRST_ID + 2])
+    assert calculate_finalization_batches(requests, SHARE_RATE, 0, 10 * ETH) == (10 * ETH, [])
+
+
+def test_finalization_batches_same_report_requests_share_batch():
+    # the rates alternate around the max share rate, only the requests of the same report are merged
+    above, below = (2 * ETH, ETH), (ETH, ETH)
+    items = [(*above, 1, 1), (*below, 1, 1), (*above, 1, 2), (*below, 1, 3)]
+    requests = _requests(items)
+
+    (_, batches) = calculate_finalization_batches(requests, SHARE_RATE, 10, 100 * ETH)
+
+    assert batches == [FIRST_ID + 2, FIRST_ID + 3, FIRST_ID + 4]
+
+
+def test_finalization_batches_cap():
+    # every request is on the other side of the max share rate than the previous one, each makes a batch
+    items = [((2 if index % 2 else 1) * ETH, ETH, 1, index) for index in range(MAX_BATCHES_LENGTH + 4)]
+    requests = _requests(items)
+
+    (remaining, batches) = calculate_finalization_batches(requests, SHARE_RATE, 10, 1000 * ETH)
+
+    assert batches == [FIRST_ID + 1 + index for index in range(MAX_BATCHES_LENGTH)]
+    assert (remaining, batches) == _contract_batches(requests, SHARE_RATE, 10, 1000 * ETH)
+
+
+def test_finalization_batches_match_contract_loop():
+    rng = random.Random(42)
+    for _ in range(500):
+        items = [
+            (
+                rng.randint(1, 5 * ETH),
+                rng.randint(1, 5 * ETH),
+                rng.randint(1, 50),
+                rng.randint(1, 6),
+            )
+            for _ in range(rng.randint(1, 60))
+        ]
+        items.sort(key=lambda item: (item[2], item[3]))
+        requests = _requests(items)
+        max_timestamp = rng.randint(0, 55)
+        eth_budget = rng.randint(1, 200 * ETH)
+
+        expected = _contract_batches(requests, SHARE_RATE, max_timestamp, eth_budget)
+        assert tuple(calculate_finalization_batches(requests, SHARE_RATE, max_timestamp, eth_budget)) == expected
@@ -1,8 +1,12 @@
 import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from os import linesep
 
 from utils.ipfs import (
     verify_ipfs_description,
+    lint_ipfs_description,
     REG_CID_DEFAULT,
     calculate_cid_hash,
     fetch_cid_status_from_ipfs,
@@ -10,6 +14,7 @@ from utils.ipfs import (
     make_lido_vote_cid,
     get_lido_vote_cid_from_str,
 )
+from utils.ipfs_client import CidStatusCache, IpfsClient
 
 
 def test_verify_ipfs_description_empty():
@@ -83,6 +88,20 @@ def test_verify_ipfs_description_ugly_cids():
     )
 
 
+def test_lint_ipfs_description_spans():
+    address = "0xdfe76d11b365f5e0023343A367f0b311701B3bc1"
+    cid = "bafybeibml5uieyxa5tufngvg7fgwbkwvlsuntwbxgtskoqynbt7wlchmfm"
+    text = f"to {address} and `{cid}`"
+    findings = lint_ipfs_description(text)
+
+    assert [(finding.kind, finding.value) for finding in findings] == [
+        ("unformatted_address", address),
+        ("wrong_checksum", address),
+    ]
+    start, end = findings[0].span
+    assert text[start:end] == address
+
+
 def test_find_cids():
     cid_list = [
         "QmRKs2ZfuwvmZA3QAWmCqrGUjV9pxtBUDP3wuc6iVGnjA2",
@@ -116,6 +135,64 @@ def test_fetch_cid_status_from_ipfs():
     assert status == 404 or status == 504 # depends on service
 
 
+class _GatewayStandIn(BaseHTTPRequestHandler):
+    requests = []
+    post_failures = 0
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        gateway, cid = self.path.strip("/").split("/")
+        if gateway == "slow":
+            time.sleep(2)
+        self.send_response(200 if gateway != "missing" and cid == "found" else 404)
+        self.end_headers()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        if _GatewayStandIn.post_failures:
+            _GatewayStandIn.post_failures -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b'{"cid": "uploaded"}')
+
+    def log_message(self, *args):
+        pass
+
+
+def test_ipfs_client_with_gateway_stand_in():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _GatewayStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    client = IpfsClient(
+        [f"{url}/slow/{{cid}}", f"{url}/missing/{{cid}}", f"{url}/fast/{{cid}}"],
+        cache=CidStatusCache(None, ttl=60),
+        retry_delay=0,
+    )
+    try:
+        started = time.time()
+        assert client.fetch_cid_status("found") == 200
+        assert time.time() - started < 1  # doesn't wait for the slow gateway
+
+        _GatewayStandIn.requests.clear()
+        assert client.fetch_cid_status("found") == 200
+        assert _GatewayStandIn.requests == []  # cached
+
+        _GatewayStandIn.requests.clear()
+        assert client.fetch_cid_status("absent") == 404
+        assert client.fetch_cid_status("absent") == 404
+        assert len(_GatewayStandIn.requests) == 6  # not cached
+
+        _GatewayStandIn.post_failures = 2
+        assert client.post(f"{url}/upload", form={"file": b"test string"}) == {"cid": "uploaded"}
+        assert _GatewayStandIn.post_failures == 0
+    finally:
+        client.close()
+        server.shutdown()
+
+
 def test_upload_vote_ipfs_description():
     result = upload_vote_ipfs_description("test string", True)
 
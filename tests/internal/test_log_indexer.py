@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+
+import pytest
+
+from utils.log_indexer import FINALITY_DEPTH, LogIndexer, LogsCheckpoint
+
+ADDRESS = "0x00000000000000000000000000000000000000aa"
+TOPIC = "0x" + "11" * 32
+
+
+class FakeProvider:
+    """get_logs of a chain with a log in every block, fails the requests as `errors` tells"""
+
+    def __init__(self, block_number, errors=None):
+        self.requests = []
+        self.errors = errors or (lambda from_block, to_block, attempt: None)
+        self.eth = SimpleNamespace(chain_id=1, block_number=block_number, get_logs=self.get_logs)
+
+    def get_logs(self, params):
+        (from_block, to_block) = (params["fromBlock"], params["toBlock"])
+        self.requests.append((from_block, to_block))
+        error = self.errors(from_block, to_block, self.requests.count((from_block, to_block)))
+        if error is not None:
+            raise error
+        return [_log(block) for block in range(from_block, to_block + 1)]
+
+
+def _log(block):
+    return {
+        "address": ADDRESS,
+        "blockHash": "0x" + block.to_bytes(32, "big").hex(),
+        "blockNumber": block,
+        "transactionHash": "0x" + block.to_bytes(32, "big").hex(),
+        "transactionIndex": 0,
+        "logIndex": 0,
+        "topics": [TOPIC],
+        "data": "0x",
+    }
+
+
+def _blocks(logs):
+    return [log["blockNumber"] for log in logs]
+
+
+def test_log_indexer_splits_window_with_too_many_results():
+    provider = FakeProvider(
+        1_000,
+        lambda from_block, to_block, attempt: (
+            ValueError({"code": -32005, "message": "query returned more than 10 results"})
+            if to_block - from_block >= 10
+            else None
+        ),
+    )
+    indexer = LogIndexer(provider, ADDRESS, [TOPIC], max_range=50, retry_delay=0)
+
+    assert _blocks(indexer.get_logs(0, 99)) == list(range(100))
+    served = sorted(window for window in provider.requests if window[1] - window[0] < 10)
+    assert [block for (from_block, to_block) in served for block in range(from_block, to_block + 1)] == list(range(100))
+
+
+def test_log_indexer_retries_rate_limited_window_without_splitting():
+    provider = FakeProvider(
+        1_000,
+        lambda from_block, to_block, attempt: (
+            ValueError("429 Client Error: Too Many Requests, limit exceeded") if attempt < 3 else None
+        ),
+    )
+    indexer = LogIndexer(provider, ADDRESS, [TOPIC], max_range=100, retry_delay=0)
+
+    assert _blocks(indexer.get_logs(0, 99)) == list(range(100))
+    assert provider.requests == [(0, 99)] * 3
+
+
+def test_log_indexer_raises_rate_limit_error_after_retries():
+    provider = FakeProvider(1_000, lambda from_block, to_block, attempt: ValueError("429 Too Many Requests"))
+    indexer = LogIndexer(provider, ADDRESS, [TOPIC], max_range=100, retries=2, retry_delay=0)
+
+    with pytest.raises(ValueError, match="429"):
+        indexer.get_logs(0, 99)
+    assert provider.requests == [(0, 99)] * 3
+
+
+def test_log_indexer_checkpoint_requests_only_new_blocks(tmp_path):
+    checkpoint = LogsCheckpoint(str(tmp_path / "logs.sqlite"))
+    provider = FakeProvider(200)
+    indexer = LogIndexer(provider, ADDRESS, [TOPIC], checkpoint=checkpoint, max_range=1_000)
+
+    assert _blocks(indexer.get_logs(10, 200)) == list(range(10, 201))
+    # the blocks close to the head are not stored
+    safe_block = 200 - FINALITY_DEPTH
+    assert provider.requests == [(10, safe_block), (safe_block + 1, 200)]
+
+    provider.requests.clear()
+    provider.eth.block_number = 300
+    assert _blocks(indexer.get_logs(10, 300)) == list(range(10, 301))
+    assert provider.requests == [(safe_block + 1, 300 - FINALITY_DEPTH), (300 - FINALITY_DEPTH + 1, 300)]
+
+
+def test_log_indexer_checkpoint_reset_for_earlier_start(tmp_path):
+    checkpoint = LogsCheckpoint(str(tmp_path / "logs.sqlite"))
+    provider = FakeProvider(200)
+    indexer = LogIndexer(provider, ADDRESS, [TOPIC], checkpoint=checkpoint, max_range=1_000)
+    indexer.get_logs(50, 200)
+
+    provider.requests.clear()
+    assert _blocks(indexer.get_logs(10, 200)) == list(range(10, 201))
+    assert provider.requests[0] == (10, 200 - FINALITY_DEPTH)
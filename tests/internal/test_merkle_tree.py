@@ -0,0 +1,69 @@
+import json
+import random
+
+from utils.test.merkle_tree import ICSTree, RewardsTree, StandardMerkleTree, StrikesTree
+
+
+def _tree_nodes(leaves):
+    """Nodes of the complete binary tree built one node at a time, the leaves are at the end in the reversed order"""
+    tree = [b""] * (2 * len(leaves) - 1)
+    for i, leaf in enumerate(leaves):
+        tree[len(tree) - 1 - i] = leaf
+    for i in range(len(tree) - 1 - len(leaves), -1, -1):
+        tree[i] = StandardMerkleTree.__hash_node__(tree[2 * i + 1], tree[2 * i + 2])
+    return tuple(tree)
+
+
+def test_merkle_tree_roots():
+    # the roots of the lido-oracle trees
+    rewards = RewardsTree.new([(0, 100), (1, 200), (2, 300)])
+    strikes = StrikesTree.new([(0, b"\x01" * 48, [1, 0, 2]), (1, b"\x02" * 48, [0])])
+    ics = ICSTree.new(["0x" + "11" * 20, "0x" + "22" * 20, "0x" + "33" * 20])
+
+    assert rewards.root.hex() == "0xd3118136924bc2b1db8be6494a1d91b7583b54493ae374b0be65cf9fbb7b1ed6"
+    assert strikes.root.hex() == "0x8758f02c415c4970cb63841c5ea4a4fc22bab772f3240c7d21309f7de7979dde"
+    assert ics.root.hex() == "0xae6afff7b7c4d883d5efd44afa0b98e80317697e8984b4c2de7c54b49c1c4dd4"
+
+
+def test_merkle_tree_nodes_and_proofs():
+    rng = random.Random(3)
+    for size in (1, 2, 3, 5, 8, 13, 100):
+        values = [(operator_id, rng.randint(0, 10**18)) for operator_id in range(size)]
+        tree = StandardMerkleTree(values, ("uint256", "uint256"))
+
+        assert tree.tree == _tree_nodes(sorted(tree.leaf(value) for value in values))
+        for entry in tree.values:
+            leaf = tree.leaf(entry["value"])
+            assert tree.find(leaf) == entry["treeIndex"]
+            assert tree.verify(tree.root, leaf, tree.get_proof(entry["treeIndex"]))
+
+            proof, flags = tree.get_multi_proof([entry["treeIndex"]])
+            assert tree.verify_multi_proof(tree.root, [leaf], list(proof), list(flags))
+
+        indices = [entry["treeIndex"] for entry in rng.sample(tree.values, min(size, 3))]
+        assert tree.get_multi_proof(indices) == tree.get_multi_proof(indices[::-1])
+
+
+def test_merkle_tree_duplicated_leaves_keep_lowest_index():
+    tree = StandardMerkleTree([(1,), (2,), (1,)], ("uint256",))
+    leaf = tree.leaf((1,))
+    indices = [index for index in range(len(tree)) if tree.node(index) == leaf]
+
+    assert len(indices) == 2
+    assert tree.find(leaf) == min(indices)
+    assert tree.values[0]["treeIndex"] == tree.values[2]["treeIndex"] == min(indices)
+
+
+def test_merkle_tree_encode_decode():
+    tree = RewardsTree.new([(operator_id, operator_id * 10**18) for operator_id in range(10)])
+    content = tree.encode()
+
+    decoded = RewardsTree.decode(content)
+    assert decoded.root == tree.root
+    assert decoded.encode() == content
+    assert decoded.tree.tree == tree.tree.tree
+
+    # the dump without the nodes is hashed again
+    dump = json.loads(content)
+    del dump["tree"]
+    assert RewardsTree.decode(json.dumps(dump).encode()).root == tree.root
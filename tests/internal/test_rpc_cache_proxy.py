@@ -0,0 +1,104 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.rpc_cache_proxy import RpcCacheProxy, RpcResponseCache, is_cacheable
+
+BLOCK_HASH = "0x" + "ab" * 32
+
+
+def test_is_cacheable():
+    assert is_cacheable("eth_chainId", [])
+    assert is_cacheable("eth_getStorageAt", ["0xaa", "0x0", "0x10"])
+    assert is_cacheable("eth_getCode", ["0xaa", {"blockHash": BLOCK_HASH}])
+    assert is_cacheable("eth_getBlockByNumber", ["0x10", False])
+
+    assert not is_cacheable("eth_getStorageAt", ["0xaa", "0x0", "latest"])
+    assert not is_cacheable("eth_getBalance", ["0xaa", "pending"])
+    assert not is_cacheable("eth_getBlockByNumber", ["finalized", False])
+    assert not is_cacheable("eth_getCode", ["0xaa"])
+    assert not is_cacheable("eth_call", [{"to": "0xaa"}, "0x10"])
+    assert not is_cacheable("eth_blockNumber", [])
+
+
+class _UpstreamStandIn(BaseHTTPRequestHandler):
+    """Answers every request with its method and params, an error for eth_getBalance"""
+
+    requests = []
+
+    def do_POST(self):
+        batch = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append([request["method"] for request in batch])
+        # the responses of a batch may come in any order
+        body = json.dumps([_response(request) for request in reversed(batch)]).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _response(request):
+    if request["method"] == "eth_chainId":
+        return {"jsonrpc": "2.0", "id": request["id"], "result": "0x1"}
+    if request["method"] == "eth_getBalance":
+        return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32000, "message": "missing trie node"}}
+    return {"jsonrpc": "2.0", "id": request["id"], "result": [request["method"], request["params"]]}
+
+
+@pytest.fixture
+def upstream():
+    _UpstreamStandIn.requests.clear()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _UpstreamStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def _request(id, method, *params):
+    return {"jsonrpc": "2.0", "id": id, "method": method, "params": list(params)}
+
+
+def test_rpc_cache_proxy_merges_cached_and_forwarded_batch(upstream, tmp_path):
+    proxy = RpcCacheProxy(upstream, RpcResponseCache(str(tmp_path / "responses.sqlite")), block_number=16)
+    proxy.handle(_request(1, "eth_getStorageAt", "0xaa", "0x0", "0x10"))
+    _UpstreamStandIn.requests.clear()
+
+    batch = [
+        _request(2, "eth_getCode", "0xaa", "latest"),
+        _request(3, "eth_getStorageAt", "0xaa", "0x0", "0x10"),
+        _request(4, "eth_blockNumber"),
+        _request(5, "eth_getBalance", "0xaa", "0x10"),
+        _request(6, "eth_getCode", "0xaa", {"blockHash": BLOCK_HASH}),
+    ]
+    responses = proxy.handle(batch)
+
+    # only the uncached requests reach the upstream, in a single batch
+    assert _UpstreamStandIn.requests == [["eth_getCode", "eth_getBalance", "eth_getCode"]]
+    assert [response["id"] for response in responses] == [2, 3, 4, 5, 6]
+    assert responses[0]["result"] == ["eth_getCode", ["0xaa", "latest"]]
+    assert responses[1]["result"] == ["eth_getStorageAt", ["0xaa", "0x0", "0x10"]]
+    assert responses[2]["result"] == "0x10"
+    assert "error" in responses[3]
+
+    _UpstreamStandIn.requests.clear()
+    responses = proxy.handle([_request(7, "eth_getBalance", "0xaa", "0x10"), batch[-1]])
+
+    # the errors are not cached, the block hash requests are
+    assert _UpstreamStandIn.requests == [["eth_getBalance"]]
+    assert responses[1] == {"jsonrpc": "2.0", "id": 6, "result": ["eth_getCode", ["0xaa", {"blockHash": BLOCK_HASH}]]}
+
+
+def test_rpc_cache_proxy_starts_without_upstream_once_chain_id_is_cached(upstream, tmp_path):
+    cache = RpcResponseCache(str(tmp_path / "responses.sqlite"))
+    RpcCacheProxy(upstream, cache)
+    _UpstreamStandIn.requests.clear()
+
+    proxy = RpcCacheProxy(upstream, cache)
+
+    assert proxy.chain_id == "0x1"
+    assert _UpstreamStandIn.requests == []
@@ -0,0 +1,105 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from web3 import HTTPProvider, Web3
+from web3.providers import BaseProvider
+
+from utils import storage_reader
+from utils.storage_reader import StorageReader
+from utils.test import rpc_observer as rpc_observer_module
+from utils.test.rpc_observer import RpcObserver
+
+ADDRESS = "0x00000000000000000000000000000000000000aa"
+
+
+class StubProvider(BaseProvider):
+    """Answers every request with 0x1, counts the requests reaching the node"""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def make_request(self, method, params):
+        self.requests.append(method)
+        return {"jsonrpc": "2.0", "id": len(self.requests), "result": "0x1"}
+
+
+class _NodeStandIn(BaseHTTPRequestHandler):
+    """Serves the JSON-RPC batches, the slot dumper returns the position as the value of every slot"""
+
+    headers_seen = []
+
+    def do_POST(self):
+        self.headers_seen.append(self.headers.get("Authorization"))
+        batch = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        body = json.dumps(
+            [{"jsonrpc": "2.0", "id": request["id"], "result": request["params"][0]["data"]} for request in batch]
+        )
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def w3(monkeypatch):
+    w3 = Web3(StubProvider())
+    monkeypatch.setattr(rpc_observer_module, "web3", w3)
+    monkeypatch.setattr(storage_reader, "web3", w3)
+    # the observers of the tests wrap the batches of the storage reader
+    monkeypatch.setattr(storage_reader, "post_batch", storage_reader.post_batch)
+    return w3
+
+
+def test_rpc_observer_sees_direct_and_middleware_requests(w3):
+    # the middlewares chain is built and cached around the original `make_request` before the install
+    assert w3.eth.block_number == 1
+
+    observed = []
+    observer = RpcObserver()
+    observer.subscribe(lambda method, params, seconds, frame: observed.append(method))
+
+    assert w3.eth.block_number == 1
+    w3.provider.make_request("evm_mine", [])
+
+    assert observed == ["eth_blockNumber", "evm_mine"]
+    assert w3.provider.requests == ["eth_blockNumber", "eth_blockNumber", "evm_mine"]
+
+
+def test_rpc_observer_wraps_provider_once_and_follows_reconnect(w3):
+    observed = []
+    observer = RpcObserver()
+    observer.subscribe(lambda method, params, seconds, frame: observed.append(method))
+    observer.install()
+    w3.provider.make_request("evm_snapshot", [])
+    assert observed == ["evm_snapshot"]
+
+    w3.provider = StubProvider()
+    observer.install()
+    w3.provider.make_request("evm_revert", ["0x1"])
+    assert observed == ["evm_snapshot", "evm_revert"]
+
+
+def test_rpc_observer_sees_storage_reader_batches(w3):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _NodeStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    w3.provider = HTTPProvider(
+        f"http://127.0.0.1:{server.server_address[1]}",
+        request_kwargs={"headers": {"Content-Type": "application/json", "Authorization": "Bearer token"}},
+    )
+    observed = []
+    RpcObserver().subscribe(lambda method, params, seconds, frame: observed.append(method))
+    try:
+        values = StorageReader().read([(ADDRESS, 1), (ADDRESS, 2)])
+    finally:
+        server.shutdown()
+
+    assert [int.from_bytes(value, "big") for value in values] == [1, 2]
+    # posted with the provider request kwargs
+    assert _NodeStandIn.headers_seen == ["Bearer token"]
+    assert observed == ["eth_call"]
@@ -0,0 +1,85 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from utils import selector_cache as selector_cache_module
+from utils.selector_cache import SelectorCache
+
+PROXY = "0x00000000000000000000000000000000000000aa"
+IMPLEMENTATION = "0x00000000000000000000000000000000000000bb"
+NEW_IMPLEMENTATION = "0x00000000000000000000000000000000000000cc"
+
+TRANSFER = {
+    "type": "function",
+    "name": "transfer",
+    "inputs": [{"name": "to", "type": "address"}, {"name": "amount", "type": "uint256"}],
+    "outputs": [{"name": "", "type": "bool"}],
+    "stateMutability": "nonpayable",
+}
+TRANSFER_SELECTOR = "0xa9059cbb"
+PAUSE = {"type": "function", "name": "pause", "inputs": [], "outputs": [], "stateMutability": "nonpayable"}
+PAUSE_SELECTOR = "0x8456cb59"
+
+
+class FakeNode:
+    """The EIP-1967 proxy state as the node returns it, counts the storage reads"""
+
+    def __init__(self):
+        self.implementation = IMPLEMENTATION
+        self.storage_reads = 0
+        self.chain_id = 1
+        self.eth = SimpleNamespace(get_storage_at=self.get_storage_at)
+
+    def get_storage_at(self, address, slot):
+        self.storage_reads += 1
+        return bytes.fromhex(self.implementation[2:]).rjust(32, b"\0")
+
+
+@pytest.fixture
+def node(monkeypatch):
+    node = FakeNode()
+    monkeypatch.setattr(selector_cache_module, "web3", node)
+    return node
+
+
+@pytest.fixture
+def cache(tmp_path):
+    interfaces = tmp_path / "interfaces"
+    interfaces.mkdir()
+    (interfaces / "Pausable.json").write_text(json.dumps([PAUSE]))
+    (tmp_path / "selectors").mkdir()
+    return SelectorCache(str(tmp_path / "selectors"), str(interfaces))
+
+
+def test_selector_cache_miss(node, cache):
+    assert cache.get(PROXY, TRANSFER_SELECTOR) is None
+    assert (cache.hits, cache.interface_hits, cache.misses) == (0, 0, 1)
+
+
+def test_selector_cache_hit_reads_implementation_once(node, cache):
+    cache.put(PROXY, [TRANSFER])
+
+    assert cache.get(PROXY, TRANSFER_SELECTOR) == TRANSFER
+    assert cache.get(PROXY, TRANSFER_SELECTOR) == TRANSFER
+    assert cache.get(PROXY, PAUSE_SELECTOR) == PAUSE
+    assert (cache.hits, cache.interface_hits, cache.misses) == (2, 1, 0)
+    assert node.storage_reads == 1
+
+    # the index is stored on disk, a new process finds it without the explorer
+    restarted = SelectorCache(cache.directory, cache.interfaces_directory)
+    assert restarted.get(PROXY, TRANSFER_SELECTOR) == TRANSFER
+    assert restarted.hits == 1
+
+
+def test_selector_cache_proxy_upgrade_invalidates_index(node, cache):
+    cache.put(PROXY, [TRANSFER])
+    assert cache.get(PROXY, TRANSFER_SELECTOR) == TRANSFER
+
+    node.implementation = NEW_IMPLEMENTATION
+    assert cache.get(PROXY, TRANSFER_SELECTOR) == TRANSFER
+
+    cache.forget_implementations()
+    assert cache.get(PROXY, TRANSFER_SELECTOR) is None
+    assert cache.misses == 1
+    assert node.storage_reads == 2
@@ -0,0 +1,27 @@
+from utils.test.timing_db import TimingDatabase, TimingRecord
+
+MODULE = "tests/acceptance/test_lido.py"
+
+
+def _run(db, durations):
+    db.add_run([TimingRecord(f"{MODULE}::{name}", "passed", duration) for name, duration in durations.items()])
+
+
+def test_module_durations_ignore_partial_runs(tmp_path):
+    db = TimingDatabase(str(tmp_path / "timings.sqlite"))
+    for _ in range(3):
+        _run(db, {"test_a": 10.0, "test_b": 20.0, "test_c": 30.0})
+    # `-k test_a` runs
+    for _ in range(3):
+        _run(db, {"test_a": 12.0})
+
+    assert db.module_durations() == {MODULE: 11.0 + 20.0 + 30.0}
+
+
+def test_module_durations_drop_tests_missing_from_recent_runs(tmp_path):
+    db = TimingDatabase(str(tmp_path / "timings.sqlite"))
+    _run(db, {"test_removed": 100.0, "test_a": 10.0})
+    _run(db, {"test_a": 10.0})
+    _run(db, {"test_a": 10.0})
+
+    assert db.module_durations(window=2) == {MODULE: 10.0}
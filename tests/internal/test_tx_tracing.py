@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+from eth_event import get_log_topic
+
+from utils import tx_tracing
+from utils.tx_tracing import TopicIndex
+
+INTERFACES_PATH = Path(__file__).parents[2] / "interfaces"
+UNKNOWN_EMITTER = "0x00000000000000000000000000000000000000aa"
+
+
+def _load_abi(name):
+    with open(INTERFACES_PATH / f"{name}.json") as abi_file:
+        return json.load(abi_file)
+
+
+def _target_validators_count_changed_log(node_operator_id, second, third):
+    abi = next(
+        item for item in _load_abi("NodeOperatorsRegistry") if item.get("name") == "TargetValidatorsCountChanged"
+    )
+    return {
+        "address": UNKNOWN_EMITTER,
+        "topics": [get_log_topic(abi), "0x" + node_operator_id.to_bytes(32, "big").hex()],
+        "data": "0x" + second.to_bytes(32, "big").hex() + third.to_bytes(32, "big").hex(),
+        "logIndex": 0,
+    }
+
+
+def test_topic_index_unknown_emitter_names_ambiguous_arguments_by_position(monkeypatch):
+    topic_index = TopicIndex({name: _load_abi(name) for name in ("CSModule", "NodeOperatorsRegistry")})
+    monkeypatch.setattr(tx_tracing.state, "_find_contract", lambda address: None)
+
+    # NodeOperatorsRegistry: (nodeOperatorId, targetValidatorsCount, targetLimitMode)
+    (event,) = topic_index.decode_logs([_target_validators_count_changed_log(7, 100, 1)])
+
+    assert event["name"] == "TargetValidatorsCountChanged"
+    assert [(data["name"], data["value"]) for data in event["data"]] == [
+        ("ARG0_VALUE", 7),
+        ("ARG1_VALUE", 100),
+        ("ARG2_VALUE", 1),
+    ]
+
+
+def test_topic_index_decodes_with_emitter_abi(monkeypatch):
+    topic_index = TopicIndex({name: _load_abi(name) for name in ("CSModule", "NodeOperatorsRegistry")})
+    emitter = SimpleNamespace(abi=_load_abi("NodeOperatorsRegistry"))
+    monkeypatch.setattr(tx_tracing.state, "_find_contract", lambda address: emitter)
+
+    (event,) = topic_index.decode_logs([_target_validators_count_changed_log(7, 100, 1)])
+
+    assert {data["name"]: data["value"] for data in event["data"]} == {
+        "nodeOperatorId": 7,
+        "targetValidatorsCount": 100,
+        "targetLimitMode": 1,
+    }
+
+
+def test_topic_index_decodes_proxy_registered_emitter_with_known_interface(monkeypatch):
+    # `interface.AppProxyUpgradeable(registry)` registers the address with the proxy ABI lacking the event
+    proxy = SimpleNamespace(abi=_load_abi("AppProxyUpgradeable"))
+    monkeypatch.setattr(tx_tracing.state, "_find_contract", lambda address: proxy)
+    topic_index = TopicIndex(
+        {name: _load_abi(name) for name in ("AppProxyUpgradeable", "CSModule", "NodeOperatorsRegistry")},
+        {UNKNOWN_EMITTER: "NodeOperatorsRegistry"},
+    )
+
+    (event,) = topic_index.decode_logs([_target_validators_count_changed_log(7, 100, 1)])
+
+    assert {data["name"]: data["value"] for data in event["data"]} == {
+        "nodeOperatorId": 7,
+        "targetValidatorsCount": 100,
+        "targetLimitMode": 1,
+    }
@@ -0,0 +1,33 @@
+import pytest
+
+from utils.config import contracts
+from utils.test.accounting_model import assert_matches_calculated_values, read_accounting_state, simulate_oracle_report
+from utils.test.helpers import ETH, eth_balance
+from utils.test.oracle_report_helpers import simulate_report_calculated_values
+
+
+@pytest.mark.parametrize("cl_diff", [-ETH(40), 0, ETH(10), ETH(300)])
+@pytest.mark.parametrize("report_vaults", [False, True])
+def test_accounting_model_matches_simulate_oracle_report(cl_diff, report_vaults):
+    (refSlot, _) = contracts.hash_consensus_for_accounting_oracle.getCurrentFrame()
+    state = read_accounting_state()
+
+    withdrawalVaultBalance = eth_balance(contracts.withdrawal_vault.address) if report_vaults else 0
+    elRewardsVaultBalance = eth_balance(contracts.execution_layer_rewards_vault.address) if report_vaults else 0
+
+    simulated = simulate_oracle_report(
+        state,
+        cl_validators=state.cl_validators,
+        cl_balance=state.cl_balance + cl_diff,
+        withdrawal_vault_balance=withdrawalVaultBalance,
+        el_rewards_vault_balance=elRewardsVaultBalance,
+    )
+    calculatedValues = simulate_report_calculated_values(
+        refSlot=refSlot,
+        beaconValidators=state.cl_validators,
+        postCLBalance=state.cl_balance + cl_diff,
+        withdrawalVaultBalance=withdrawalVaultBalance,
+        elRewardsVaultBalance=elRewardsVaultBalance,
+    )
+
+    assert_matches_calculated_values(simulated, calculatedValues)
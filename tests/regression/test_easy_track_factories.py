@@ -11,6 +11,7 @@ from eth_abi.abi import encode
 from configs.config_mainnet import *
 from utils.config import contracts, EASYTRACK_SIMPLE_DVT_TRUSTED_CALLER
 from utils.test.easy_track_helpers import _encode_calldata, create_and_enact_motion
+from utils.test.exit_bus_data import VALIDATOR_PUB_KEY_LENGTH, encode_exit_requests, pubkeys_to_bytes
 from utils.test.keys_helpers import random_pubkeys_batch, random_signatures_batch
 from utils.test.simple_dvt_helpers import (
     fill_simple_dvt_ops_keys,
@@ -138,26 +139,18 @@ class ValidatorInfo:
 
 
 def encode_exit_requests_easy_track(exit_requests: List[ExitRequestInput]) -> bytes:
-    struct_tuples = []
+    pubkeys_data = pubkeys_to_bytes([req.valPubkey for req in exit_requests])
 
-    for req in exit_requests:
-        # Convert public key to bytes
-        if req.valPubkey.startswith('0x'):
-            pubkey_hex = req.valPubkey[2:]
-        else:
-            pubkey_hex = req.valPubkey
-
-        pubkey_bytes = bytes.fromhex(pubkey_hex)
-        if len(pubkey_bytes) != 48:
-            raise ValueError(f'Invalid public key length: {len(pubkey_bytes)} bytes, expected 48')
-
-        struct_tuples.append((
+    struct_tuples = [
+        (
             req.moduleId,  # uint256
             req.nodeOpId,  # uint256
             req.valIndex,  # uint64
-            pubkey_bytes,  # bytes
-            req.valPubKeyIndex  # uint256
-        ))
+            pubkeys_data[i * VALIDATOR_PUB_KEY_LENGTH : (i + 1) * VALIDATOR_PUB_KEY_LENGTH],  # bytes
+            req.valPubKeyIndex,  # uint256
+        )
+        for i, req in enumerate(exit_requests)
+    ]
 
     return encode(
         ['(uint256,uint256,uint64,bytes,uint256)[]'],
@@ -166,38 +159,14 @@ def encode_exit_requests_easy_track(exit_requests: List[ExitRequestInput]) -> by
 
 
 def encode_exit_requests_oracle(exit_requests: List[ExitRequestInput]) -> bytes:
-    # Constants matching the original ejector format
-    MODULE_ID_LENGTH = 3  # 3 bytes
-    NODE_OPERATOR_ID_LENGTH = 5  # 5 bytes
-    VALIDATOR_INDEX_LENGTH = 8  # 8 bytes
-    VALIDATOR_PUB_KEY_LENGTH = 48  # 48 bytes
-
-    # Encode the inner data (matching original ejector format)
-    inner_data = b''
-
-    for request in exit_requests:
-        # Module ID (3 bytes) - matching original format
-        inner_data += request.moduleId.to_bytes(MODULE_ID_LENGTH, byteorder='big')
-
-        # Node Operator ID (5 bytes) - matching original format
-        inner_data += request.nodeOpId.to_bytes(NODE_OPERATOR_ID_LENGTH, byteorder='big')
-
-        # Validator Index (8 bytes)
-        inner_data += request.valIndex.to_bytes(VALIDATOR_INDEX_LENGTH, byteorder='big')
-
-        # Validator Public Key (48 bytes)
-        if request.valPubkey.startswith('0x'):
-            pubkey_hex = request.valPubkey[2:]
-        else:
-            pubkey_hex = request.valPubkey
-
-        pubkey_bytes = bytes.fromhex(pubkey_hex)
-        if len(pubkey_bytes) != VALIDATOR_PUB_KEY_LENGTH:
-            raise ValueError(
-                f'Invalid public key length: {len(pubkey_bytes)} bytes, expected {VALIDATOR_PUB_KEY_LENGTH}')
-        inner_data += pubkey_bytes
-
-    return inner_data
+    # the requests are submitted in the given order, the hashes are built from the same data
+    return encode_exit_requests(
+        [request.moduleId for request in exit_requests],
+        [request.nodeOpId for request in exit_requests],
+        [request.valIndex for request in exit_requests],
+        [request.valPubkey for request in exit_requests],
+        sort=False,
+    )
 
 
 def create_exit_requests(
@@ -6,6 +6,7 @@ from utils.test.extra_data import ExtraDataService
 from utils.test.oracle_report_helpers import (
     oracle_report,
 )
+from utils.test.oracle_scenarios import default_state_probes, run_oracle_reports
 
 from utils.test.helpers import ETH, round_to_gwei
 from utils.config import (
@@ -121,14 +122,19 @@ def test_negative_rebase_more_than_54_reports(oracle_report_sanity_checker):
     locator = contracts.lido_locator
     assert oracle_report_sanity_checker.address == locator.oracleReportSanityChecker()
 
-    reported_validators_values = exited_validators_count().values()
-    for _ in range(58):
-        reported_validators_values = [value + 3 for value in reported_validators_values]
-        oracle_report(
-            cl_diff=-ETH(400),
-            stakingModuleIdsWithNewlyExitedValidators=exited_validators_count().keys(),
-            numExitedValidatorsByStakingModule=reported_validators_values,
-        )
+    exited_validators = exited_validators_count()
+    steps = [
+        {
+            "cl_diff": -ETH(400),
+            "stakingModuleIdsWithNewlyExitedValidators": list(exited_validators.keys()),
+            "numExitedValidatorsByStakingModule": [value + 3 * step for value in exited_validators.values()],
+        }
+        for step in range(1, 59)
+    ]
+    reported_validators_values = steps[-1]["numExitedValidatorsByStakingModule"]
+
+    cl_balances = run_oracle_reports(steps, default_state_probes("cl_balance")).states["cl_balance"]
+    assert all(before - after == ETH(400) for before, after in zip(cl_balances, cl_balances[1:]))
 
     count = oracle_report_sanity_checker.getReportDataCount()
     assert count > 0
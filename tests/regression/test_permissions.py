@@ -5,7 +5,6 @@ Tests for permissions setup
 import pytest
 import os
 
-from tqdm import tqdm
 from web3 import Web3
 from brownie import interface, web3
 from brownie.network.event import _decode_logs
@@ -13,6 +12,7 @@ from brownie.network.state import TxHistory
 
 from configs.config_mainnet import CSM_COMMITTEE_MS, CURATED_MANAGE_SIGNING_KEYS_HOLDERS
 from utils.test.helpers import ZERO_BYTES32
+from utils.log_indexer import LogIndexer, make_logs_checkpoint
 from utils.permission_parameters import ArgumentValue, Op, Param
 from brownie.exceptions import EventLookupError
 from utils.config import (
@@ -801,26 +801,14 @@ def active_aragon_roles(protocol_permissions):
 
     event_signature_hash = remote_rpc_provider.keccak(text="SetPermission(address,address,bytes32,bool)").hex()
 
-    def fetch_events_in_batches(start_block, end_block, provider=local_rpc_provider, step=max_range):
-        """Fetch events in batches of `step` blocks with a progress bar."""
-        events = []
-        total_batches = (end_block - start_block) // step + 1
-        with tqdm(total=total_batches, desc="Fetching Events") as pbar:
-            for batch_start in range(start_block, end_block, step):
-                batch_end = min(batch_start + step - 1, end_block)
-
-                batch_events = provider.eth.get_logs({
-                    "address": contracts.acl.address,
-                    "fromBlock": batch_start,
-                    "toBlock": batch_end,
-                    "topics": [event_signature_hash],
-                })
-
-                events.extend(batch_events)
-                pbar.update(1)
-        return events
-
-    events_before_voting = fetch_events_in_batches(ACL_DEPLOY_BLOCK_NUMBER, remote_rpc_provider.eth.block_number, remote_rpc_provider)
+    remote_logs_indexer = LogIndexer(
+        remote_rpc_provider,
+        contracts.acl.address,
+        [event_signature_hash],
+        checkpoint=make_logs_checkpoint(),
+        max_range=max_range,
+    )
+    events_before_voting = remote_logs_indexer.get_logs(ACL_DEPLOY_BLOCK_NUMBER, remote_rpc_provider.eth.block_number)
 
     permission_events = _decode_logs(events_before_voting)["SetPermission"]._ordered
 
@@ -828,7 +816,10 @@ def active_aragon_roles(protocol_permissions):
     if len(history) > 0:
         vote_block = history[0].block_number
 
-        events_after_voting = fetch_events_in_batches(vote_block, remote_rpc_provider.eth.block_number)
+        local_logs_indexer = LogIndexer(
+            local_rpc_provider, contracts.acl.address, [event_signature_hash], max_range=max_range
+        )
+        events_after_voting = local_logs_indexer.get_logs(vote_block, remote_rpc_provider.eth.block_number)
 
         try:
             permission_events_after_voting = _decode_logs(events_after_voting)["SetPermission"]._ordered
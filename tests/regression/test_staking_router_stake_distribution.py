@@ -1,13 +1,12 @@
 from typing import Dict
 
 from utils.config import contracts
+from utils.deposits_allocation import TOTAL_BASIS_POINTS, get_deposits_allocation
 from utils.test.csm_helpers import csm_add_node_operator, fill_csm_operators_with_keys
 from utils.test.deposits_helpers import fill_deposit_buffer
 from utils.test.simple_dvt_helpers import fill_simple_dvt_ops_vetted_keys
 from utils.test.staking_router_helpers import StakingModuleStatus
 
-TOTAL_BASIS_POINTS = 10000
-
 
 class Module:
     def __init__(
@@ -20,7 +19,6 @@ class Module:
         self.active_keys = 0
         self.depositable_keys = depositable_keys
         self.allocated_keys = 0
-        self.allocation_limit = 0
         self.module_fee = module_fee
         self.treasury_fee = treasury_fee
         self.deposited_keys = deposited_keys
@@ -68,39 +66,20 @@ def prep_modules_info(modules: Dict[int, Module]):
 
 def calc_allocation(modules: Dict[int, Module], keys_to_allocate: int, ignore_depositable: bool = False):
     total_active_keys = prep_modules_info(modules)
-    # simulate target share distribution
-    # https://github.com/lidofinance/lido-dao/blob/331ecec7fe3c8d57841fd73ccca7fb1cc9bc174e/contracts/0.8.9/StakingRouter.sol#L1266-L1268
-
     target_total_active_keys = total_active_keys + keys_to_allocate
 
-    for module in modules.values():
-        target_active_keys = module.target_share * target_total_active_keys // TOTAL_BASIS_POINTS
-        module.allocation_limit = (
-            target_active_keys
-            if ignore_depositable
-            else min(target_active_keys, module.active_keys + module.depositable_keys)
-        )
-        module.allocated_keys = 0
-
-    # simulate min first strategy
-    # https://github.com/lidofinance/lido-dao/blob/331ecec7fe3c8d57841fd73ccca7fb1cc9bc174e/contracts/0.8.9/StakingRouter.sol#L1274
-
-    for _ in range(keys_to_allocate):
-        # find the module with the lowest active_keys
-        min_active_keys = modules[1].active_keys
-        min_active_keys_module = modules[1]
-
-        for module in modules.values():
-            if module.active_keys < min_active_keys and module.active_keys < module.allocation_limit:
-                min_active_keys = module.active_keys
-                min_active_keys_module = module
+    total_allocated_keys, active_keys = get_deposits_allocation(
+        [module.target_share for module in modules.values()],
+        [module.active_keys for module in modules.values()],
+        [module.depositable_keys for module in modules.values()],
+        keys_to_allocate,
+        ignore_depositable,
+    )
 
-        # allocate one key to the module if possible
-        if min_active_keys_module.active_keys < min_active_keys_module.allocation_limit:
-            min_active_keys_module.active_keys += 1
-            min_active_keys_module.allocated_keys += 1
+    for module, module_active_keys in zip(modules.values(), active_keys):
+        module.allocated_keys = module_active_keys - module.active_keys
+        module.active_keys = module_active_keys
 
-    total_allocated_keys = sum([module.allocated_keys for module in modules.values()])
     return total_allocated_keys, target_total_active_keys
 
 
@@ -0,0 +1,46 @@
+"""
+Opt-in RPC profiling of the test run, enabled by the RPC_PROFILE env variable:
+
+    RPC_PROFILE=1 brownie test tests/regression/test_accounting.py --network mfh-1
+    flamegraph.pl .cache/rpc_profile/session.folded > rpc_profile.svg
+
+Every xdist worker writes its own report named by the worker id.
+"""
+
+import os
+
+import pytest
+
+from utils.cache import get_cache_directory
+from utils.test.rpc_profiler import RpcProfiler
+
+RPC_PROFILE = bool(os.getenv("RPC_PROFILE"))
+
+
+class RpcProfilePlugin:
+    def __init__(self, config):
+        self.config = config
+        self.profiler = RpcProfiler()
+        self.reports = ()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        self.profiler.install()
+        self.profiler.test = item.nodeid
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        self.profiler.test = "<session>"
+
+    def pytest_sessionfinish(self, session):
+        if not self.profiler.by_method:
+            return
+        name = self.config.workerinput["workerid"] if hasattr(self.config, "workerinput") else "session"
+        self.reports = self.profiler.write_report(get_cache_directory("rpc_profile"), name)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.reports:
+            return
+        terminalreporter.section("RPC profile")
+        for line in self.profiler.summary():
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"Reports: {', '.join(self.reports)}")
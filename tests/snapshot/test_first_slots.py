@@ -2,7 +2,7 @@ from contextlib import contextmanager
 from typing import Any, Callable, Sequence, TypedDict
 
 import pytest
-from brownie import Contract, chain, web3, accounts
+from brownie import chain, web3, accounts
 from hexbytes import HexBytes
 from pytest_check import check
 from typing_extensions import Protocol
@@ -13,7 +13,7 @@ from utils.config import contracts
 from utils.test.governance_helpers import execute_vote_and_process_dg_proposals
 from utils.test.snapshot_helpers import _chain_snapshot
 
-from .utils import get_slot
+from .utils import get_slots, get_slots_as_lists
 
 SLOTS_COUNT_TO_CHECK = 16
 MAX_ARRAY_SIZE = 2 ** 5
@@ -53,64 +53,49 @@ def skip_slots() -> Sequence[tuple[str, int]]:
 
 @pytest.fixture(scope="module")
 def do_snapshot(skip_slots: Sequence[tuple[str, int]]) -> SnapshotFn:
-    def _get_slots(contract: Contract, block: int) -> dict:
-        res = {}
-
-        for slot in range(0, SLOTS_COUNT_TO_CHECK):
-            if (contract.address, slot) in skip_slots:
-                continue
+    def _snap():
+        block = chain.height
 
-            slot_in_hex = HexBytes(slot).hex()
-            # try plain 32 bits value first
-            slot_value = get_slot(
-                Web3.to_checksum_address(contract.address),
-                pos=slot,
-                block=block,
+        slots = [
+            (Web3.to_checksum_address(contract.address), slot)
+            for contract in (
+                contracts.lido,
+                contracts.node_operators_registry,
+                contracts.deposit_security_module,
+                contracts.execution_layer_rewards_vault,
+                contracts.withdrawal_vault,
+                contracts.oracle_daemon_config,
+                contracts.burner,
+                contracts.relay_allowed_list,
+                contracts.ldo_token,
+                contracts.token_manager,
+                contracts.finance,
+                contracts.acl,
+                contracts.agent,
+                contracts.kernel,
+                contracts.easy_track,
+                contracts.wsteth,
+                contracts.csm,
+                contracts.cs_accounting,
+                contracts.cs_fee_distributor,
+                contracts.cs_fee_oracle,
+                contracts.csm_hash_consensus,
+                contracts.cs_verifier,
             )
-            res[f"{contract.address}_slot_{slot_in_hex}"] = slot_value
-
-            # if the slot stores relatively small integer, try to read as an array
-            int_value = Web3.to_int(slot_value)
-            if 0 < int_value < MAX_ARRAY_SIZE:
-                slot_value_as_list = get_slot(
-                    Web3.to_checksum_address(contract.address),
-                    pos=slot,
-                    as_list=True,
-                    block=block,
-                )
-                res[f"{contract.address}_slot_{slot_in_hex}_as_list"] = slot_value_as_list
+            for slot in range(0, SLOTS_COUNT_TO_CHECK)
+            if (contract.address, slot) not in skip_slots
+        ]
+        # try plain 32 bits values first
+        values = get_slots(slots, block=block)
 
-        return res
-
-    def _snap():
-        block = chain.height
         res = {}
+        for (address, slot), slot_value in zip(slots, values):
+            res[f"{address}_slot_{HexBytes(slot).hex()}"] = slot_value
 
-        for contract in (
-            contracts.lido,
-            contracts.node_operators_registry,
-            contracts.deposit_security_module,
-            contracts.execution_layer_rewards_vault,
-            contracts.withdrawal_vault,
-            contracts.oracle_daemon_config,
-            contracts.burner,
-            contracts.relay_allowed_list,
-            contracts.ldo_token,
-            contracts.token_manager,
-            contracts.finance,
-            contracts.acl,
-            contracts.agent,
-            contracts.kernel,
-            contracts.easy_track,
-            contracts.wsteth,
-            contracts.csm,
-            contracts.cs_accounting,
-            contracts.cs_fee_distributor,
-            contracts.cs_fee_oracle,
-            contracts.csm_hash_consensus,
-            contracts.cs_verifier,
-        ):
-            res |= _get_slots(contract, block)
+        # if the slot stores relatively small integer, try to read as an array
+        array_slots = [slot for slot, slot_value in zip(slots, values) if 0 < Web3.to_int(slot_value) < MAX_ARRAY_SIZE]
+        for (address, slot), slot_value_as_list in zip(array_slots, get_slots_as_lists(array_slots, block=block)):
+            res[f"{address}_slot_{HexBytes(slot).hex()}_as_list"] = slot_value_as_list
 
         return res
 
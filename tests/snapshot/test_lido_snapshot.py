@@ -2,7 +2,6 @@
 from functools import partial as _call
 from typing import Any, Callable, Sequence, TypedDict
 
-import brownie
 import pytest
 from brownie import ZERO_ADDRESS, chain, web3, accounts
 from brownie.network.account import Account
@@ -13,7 +12,7 @@ from tests.conftest import Helpers
 from utils.config import contracts, LDO_TOKEN, VOTING, AGENT, INITIAL_MAX_EXTERNAL_RATIO_BP
 from utils.evm_script import EMPTY_CALLSCRIPT
 from utils.test.governance_helpers import execute_vote_and_process_dg_proposals
-from utils.test.snapshot_helpers import _chain_snapshot
+from utils.test.snapshot_helpers import SnapshotSpec, _chain_snapshot
 
 from .utils import get_slot
 
@@ -274,60 +273,59 @@ def do_snapshot(
         block = chain.height
         res = {}
 
-        with brownie.multicall(block_identifier=block):
-            res |= {
-                "block_number": chain.height,
-                "address": lido.address,
-                # AppProxyUpgradeable
-                "isDepositable": interface.AppProxyUpgradeable(lido.address).isDepositable(),
-                # ERC20
-                "name": lido.name(),
-                "symbol": lido.symbol(),
-                "decimals": lido.decimals(),
-                "totalSupply": lido.totalSupply(),
-                "balanceOf(eth_whale)": lido.balanceOf(eth_whale),
-                "balanceOf(steth_whale)": lido.balanceOf(steth_whale),
-                "balanceOf(stranger)": lido.balanceOf(stranger),
-                "allowance(steth_whale,stranger)": lido.allowance(steth_whale, stranger),
-                "allowance(stranger,steth_whale)": lido.allowance(stranger, steth_whale),
-                # Lido
-                "sharesOf(eth_whale)": lido.sharesOf(eth_whale),
-                "sharesOf(steth_whale)": lido.sharesOf(steth_whale),
-                "sharesOf(stranger)": lido.sharesOf(stranger),
-                "getBeaconStat": lido.getBeaconStat(),
-                "getBufferedEther": lido.getBufferedEther(),
-                "getTotalPooledEther": lido.getTotalPooledEther(),
-                "getPooledEthByShares(100)": lido.getPooledEthByShares(100),
-                "getCurrentStakeLimit": lido.getCurrentStakeLimit(),
-                "getFeeDistribution": lido.getFeeDistribution(),
-                "getFee": lido.getFee(),
-                "getStakeLimitFullInfo": lido.getStakeLimitFullInfo(),
-                "getTotalELRewardsCollected": lido.getTotalELRewardsCollected(),
-                "getTotalShares": lido.getTotalShares(),
-                "getSharesByPooledEth(1 ETH)": lido.getSharesByPooledEth(_1ETH),
-                "getTreasury": lido.getTreasury(),
-                "getWithdrawalCredentials": lido.getWithdrawalCredentials(),
-                "isStakingPaused": lido.isStakingPaused(),
-                "isPetrified": lido.isPetrified(),
-                "isStopped": lido.isStopped(),
-                "allowRecoverability(LDO)": lido.allowRecoverability(LDO_TOKEN),
-                "allowRecoverability(StETH)": lido.allowRecoverability(lido.address),
-                "allowRecoverability(SOME_CONTRACT)": lido.allowRecoverability(some_contract),
-                # constants
-                "PAUSE_ROLE": lido.PAUSE_ROLE(),
-                "RESUME_ROLE": lido.RESUME_ROLE(),
-                "STAKING_CONTROL_ROLE": lido.STAKING_CONTROL_ROLE(),
-                "STAKING_PAUSE_ROLE": lido.STAKING_PAUSE_ROLE(),
-                # AragonApp
-                "canPerform()": lido.canPerform(VOTING, lido.PAUSE_ROLE(), []),
-                "getRecoveryVault": lido.getRecoveryVault(),
-                "kernel": lido.kernel(),
-                "appId": lido.appId(),
-                "getEVMScriptExecutor(nil)": lido.getEVMScriptExecutor(EMPTY_CALLSCRIPT),
-                "getEVMScriptRegistry": lido.getEVMScriptRegistry(),
-                "getInitializationBlock": lido.getInitializationBlock(),
-                "hasInitialized": lido.hasInitialized(),
-            }
+        spec = (
+            SnapshotSpec()
+            # AppProxyUpgradeable
+            .add("isDepositable", interface.AppProxyUpgradeable(lido.address).isDepositable)
+            # ERC20
+            .add("name", lido.name)
+            .add("symbol", lido.symbol)
+            .add("decimals", lido.decimals)
+            .add("totalSupply", lido.totalSupply)
+            .add("balanceOf(eth_whale)", lido.balanceOf, eth_whale)
+            .add("balanceOf(steth_whale)", lido.balanceOf, steth_whale)
+            .add("balanceOf(stranger)", lido.balanceOf, stranger)
+            .add("allowance(steth_whale,stranger)", lido.allowance, steth_whale, stranger)
+            .add("allowance(stranger,steth_whale)", lido.allowance, stranger, steth_whale)
+            # Lido
+            .add("sharesOf(eth_whale)", lido.sharesOf, eth_whale)
+            .add("sharesOf(steth_whale)", lido.sharesOf, steth_whale)
+            .add("sharesOf(stranger)", lido.sharesOf, stranger)
+            .add("getBeaconStat", lido.getBeaconStat)
+            .add("getBufferedEther", lido.getBufferedEther)
+            .add("getTotalPooledEther", lido.getTotalPooledEther)
+            .add("getPooledEthByShares(100)", lido.getPooledEthByShares, 100)
+            .add("getCurrentStakeLimit", lido.getCurrentStakeLimit)
+            .add("getFeeDistribution", lido.getFeeDistribution)
+            .add("getFee", lido.getFee)
+            .add("getStakeLimitFullInfo", lido.getStakeLimitFullInfo)
+            .add("getTotalELRewardsCollected", lido.getTotalELRewardsCollected)
+            .add("getTotalShares", lido.getTotalShares)
+            .add("getSharesByPooledEth(1 ETH)", lido.getSharesByPooledEth, _1ETH)
+            .add("getTreasury", lido.getTreasury)
+            .add("getWithdrawalCredentials", lido.getWithdrawalCredentials)
+            .add("isStakingPaused", lido.isStakingPaused)
+            .add("isPetrified", lido.isPetrified)
+            .add("isStopped", lido.isStopped)
+            .add("allowRecoverability(LDO)", lido.allowRecoverability, LDO_TOKEN)
+            .add("allowRecoverability(StETH)", lido.allowRecoverability, lido.address)
+            .add("allowRecoverability(SOME_CONTRACT)", lido.allowRecoverability, some_contract)
+            # constants
+            .add("PAUSE_ROLE", lido.PAUSE_ROLE)
+            .add("RESUME_ROLE", lido.RESUME_ROLE)
+            .add("STAKING_CONTROL_ROLE", lido.STAKING_CONTROL_ROLE)
+            .add("STAKING_PAUSE_ROLE", lido.STAKING_PAUSE_ROLE)
+            # AragonApp
+            .add("canPerform()", lido.canPerform, VOTING, lido.PAUSE_ROLE(), [])
+            .add("getRecoveryVault", lido.getRecoveryVault)
+            .add("kernel", lido.kernel)
+            .add("appId", lido.appId)
+            .add("getEVMScriptExecutor(nil)", lido.getEVMScriptExecutor, EMPTY_CALLSCRIPT)
+            .add("getEVMScriptRegistry", lido.getEVMScriptRegistry)
+            .add("getInitializationBlock", lido.getInitializationBlock)
+            .add("hasInitialized", lido.hasInitialized)
+        )
+        res |= {"block_number": block, "address": lido.address} | spec.take(block=block)
 
         for v1_slot in (
             # Lido.sol
@@ -3,13 +3,13 @@ import pytest
 from web3 import Web3
 from datetime import datetime
 from typing import Any, Dict, Callable
-from brownie import ZERO_ADDRESS, Wei, convert, chain, multicall
+from brownie import ZERO_ADDRESS, Wei, convert, chain
 from brownie.convert.datatypes import ReturnValue
 from tests.snapshot.utils import get_slot
 
 from utils.config import contracts, DEPOSIT_SECURITY_MODULE
 from utils.mainnet_fork import chain_snapshot
-from utils.test.snapshot_helpers import dict_zip
+from utils.test.snapshot_helpers import SnapshotSpec, dict_zip
 from utils.test.governance_helpers import execute_vote_and_process_dg_proposals
 
 PUBKEY_LENGTH = 48
@@ -171,18 +171,29 @@ def run_scenario(actions: Dict[str, Callable], snapshooter: Callable[[], Dict[st
 def make_snapshot(node_operators_registry) -> Dict[str, Any]:
     random.seed(RANDOM_SEED)
     block = chain.height
-    node_operators_count = node_operators_registry.getNodeOperatorsCount()
-    snapshot = {}
-    # with multicall(block_identifier=block):
-    snapshot |= {
-        "keys_op_index": node_operators_registry.getKeysOpIndex(),
-        "signing_keys": {},
-        "node_operators": {},
+    node_operators_count = node_operators_registry.getNodeOperatorsCount(block_identifier=block)
+    node_operators_indexes = range(node_operators_count)
+
+    spec = (
+        SnapshotSpec()
+        .add("keys_op_index", node_operators_registry.getKeysOpIndex)
+        .add("rewards_distribution", node_operators_registry.getRewardsDistribution, Wei("1 ether"))
+        .add("active_node_operators_count", node_operators_registry.getActiveNodeOperatorsCount)
+    )
+    for id in node_operators_indexes:
+        spec.add(("node_operators", id), node_operators_registry.getNodeOperator, id, True)
+        spec.add(("total_signing_keys_count", id), node_operators_registry.getTotalSigningKeyCount, id)
+        spec.add(("unused_signing_keys_count", id), node_operators_registry.getUnusedSigningKeyCount, id)
+    values = spec.take(block=block)
+
+    snapshot = {
+        "keys_op_index": values["keys_op_index"],
         "node_operators_count": node_operators_count,
-        "rewards_distribution": node_operators_registry.getRewardsDistribution(Wei("1 ether")),
-        "total_signing_keys_count": {},
-        "unused_signing_keys_count": {},
-        "active_node_operators_count": node_operators_registry.getActiveNodeOperatorsCount(),
+        "rewards_distribution": values["rewards_distribution"],
+        "active_node_operators_count": values["active_node_operators_count"],
+        "node_operators": {id: values[("node_operators", id)].dict() for id in node_operators_indexes},
+        "total_signing_keys_count": [values[("total_signing_keys_count", id)] for id in node_operators_indexes],
+        "unused_signing_keys_count": [values[("unused_signing_keys_count", id)] for id in node_operators_indexes],
     }
 
     for v1_slot in (
@@ -197,36 +208,21 @@ def make_snapshot(node_operators_registry) -> Dict[str, Any]:
     ):
         snapshot[v1_slot] = get_slot(node_operators_registry.address, name=v1_slot)
 
-    with multicall(block_identifier=block):
-        node_operators_indexes = range(node_operators_count)
-
-        snapshot["node_operators"] = [
-            node_operators_registry.getNodeOperator(id, True) for id in node_operators_indexes
-        ]
-
-        snapshot["total_signing_keys_count"] = [
-            node_operators_registry.getTotalSigningKeyCount(id) for id in node_operators_indexes
-        ]
-        snapshot["unused_signing_keys_count"] = [
-            node_operators_registry.getUnusedSigningKeyCount(id) for id in node_operators_indexes
-        ]
-
-        signing_keys_count = [snapshot["node_operators"][id]["totalAddedValidators"] for id in node_operators_indexes]
+    signing_keys_count = [snapshot["node_operators"][id]["totalAddedValidators"] for id in node_operators_indexes]
+    signing_key_indices = [
+        random.sample(range(0, signing_keys_count[id]), min(10, signing_keys_count[id]))
+        for id in node_operators_indexes
+    ]
 
-        signing_key_indices = [
-            random.sample(range(0, signing_keys_count[id]), min(10, signing_keys_count[id]))
-            for id in node_operators_indexes
-        ]
+    keys_spec = SnapshotSpec()
+    for id in node_operators_indexes:
+        for index in signing_key_indices[id]:
+            keys_spec.add((id, index), node_operators_registry.getSigningKey, id, index)
+    keys = keys_spec.take(block=block)
 
-        for id in node_operators_indexes:
-            snapshot["signing_keys"][id] = [
-                node_operators_registry.getSigningKey(id, index) for index in signing_key_indices[id]
-            ]
-            snapshot["signing_keys"][id] = [key.dict() for key in snapshot["signing_keys"][id]]
-
-        snapshot["node_operators"] = dict(
-            zip(node_operators_indexes, [nop.dict() for nop in snapshot["node_operators"]])
-        )
+    snapshot["signing_keys"] = {
+        id: [keys[(id, index)].dict() for index in signing_key_indices[id]] for id in node_operators_indexes
+    }
     return snapshot
 
 
@@ -2,10 +2,17 @@ from typing import Dict
 
 import pytest
 
-from brownie import accounts, chain, MockCallTarget, multicall
+from brownie import accounts, chain, MockCallTarget
 from web3 import Web3
 
-from utils.test.snapshot_helpers import ValueChanged, dict_zip, dict_diff, assert_no_diffs, assert_expected_diffs
+from utils.test.snapshot_helpers import (
+    ValueChanged,
+    SnapshotSpec,
+    dict_zip,
+    dict_diff,
+    assert_no_diffs,
+    assert_expected_diffs,
+)
 
 from utils.voting import create_vote, bake_vote_items
 from utils.config import (
@@ -27,40 +34,41 @@ def call_target():
 
 
 def snapshot(voting, vote_id):
-    block = chain.height
-    length = voting.votesLength()
-    vote = voting.getVote(vote_id)
-    result = {}
-
-    with multicall(block_identifier=block):
-        result |= {
-            "address": voting.address,
-            "voteTime": voting.voteTime(),
-            "CREATE_VOTES_ROLE": voting.CREATE_VOTES_ROLE(),
-            "MODIFY_SUPPORT_ROLE": voting.MODIFY_SUPPORT_ROLE(),
-            "MODIFY_QUORUM_ROLE": voting.MODIFY_QUORUM_ROLE(),
-            "UNSAFELY_MODIFY_VOTE_TIME_ROLE": voting.UNSAFELY_MODIFY_VOTE_TIME_ROLE(),
-            "PCT_BASE": voting.PCT_BASE(),
-            "minAcceptQuorumPct": voting.minAcceptQuorumPct(),
-            "supportRequiredPct": voting.supportRequiredPct(),
-            "votesLength": length,
-            "objectionPhaseTime": voting.objectionPhaseTime(),
-            "token": voting.token(),
-            "vote_open": vote[0],
-            "vote_executed": vote[1],
-            "vote_supportRequired": vote[4],
-            "vote_minAcceptQuorum": vote[5],
-            "vote_yea": vote[6],
-            "vote_nay": vote[7],
-            "vote_votingPower": vote[8],
-            "vote_script": vote[9],
-            "vote_canExecute": voting.canExecute(vote_id),
-            "vote_voter1_state": voting.getVoterState(vote_id, LDO_VOTE_EXECUTORS_FOR_TESTS[0]),
-            "vote_voter2_state": voting.getVoterState(vote_id, LDO_VOTE_EXECUTORS_FOR_TESTS[1]),
-            "vote_voter3_state": voting.getVoterState(vote_id, LDO_VOTE_EXECUTORS_FOR_TESTS[2]),
-        }
-
-    return result
+    spec = SnapshotSpec()
+    for method in (
+        "voteTime",
+        "CREATE_VOTES_ROLE",
+        "MODIFY_SUPPORT_ROLE",
+        "MODIFY_QUORUM_ROLE",
+        "UNSAFELY_MODIFY_VOTE_TIME_ROLE",
+        "PCT_BASE",
+        "minAcceptQuorumPct",
+        "supportRequiredPct",
+        "votesLength",
+        "objectionPhaseTime",
+        "token",
+    ):
+        spec.add(method, getattr(voting, method))
+    spec.add("vote", voting.getVote, vote_id)
+    spec.add("vote_canExecute", voting.canExecute, vote_id)
+    for indx, voter in enumerate(LDO_VOTE_EXECUTORS_FOR_TESTS[:3]):
+        spec.add(f"vote_voter{indx + 1}_state", voting.getVoterState, vote_id, voter)
+
+    result = spec.take(block=chain.height)
+    vote = result.pop("vote")
+
+    return {
+        "address": voting.address,
+        **result,
+        "vote_open": vote[0],
+        "vote_executed": vote[1],
+        "vote_supportRequired": vote[4],
+        "vote_minAcceptQuorum": vote[5],
+        "vote_yea": vote[6],
+        "vote_nay": vote[7],
+        "vote_votingPower": vote[8],
+        "vote_script": vote[9],
+    }
 
 
 def steps(voting, call_target, vote_time) -> Dict[str, Dict[str, ValueChanged]]:
@@ -1,10 +1,11 @@
-from typing import Literal, overload
+from typing import Literal, Sequence, overload
 
-from brownie import web3
 from eth_typing.evm import ChecksumAddress
 from hexbytes import HexBytes
 from web3 import Web3
 
+from utils.storage_reader import get_storage_reader
+
 
 @overload
 def get_slot(
@@ -56,36 +57,16 @@ def get_slot(
         idx = Web3.to_int(Web3.keccak(text=name))
 
     if not as_list:
-        return web3.eth.get_storage_at(
-            address,
-            idx,
-            block_identifier=block,
-        )
-
-    length = Web3.to_int(
-        web3.eth.get_storage_at(
-            address,
-            idx,
-            block_identifier=block,
-        )
-    )
-    if not length:
-        return []
-
-    res = []
-
-    buf = Web3.to_bytes(idx)
-    while len(buf) < 32:
-        buf = b"\x00" + buf
-
-    p = Web3.to_int(Web3.keccak(buf))
-    for i in range(length):
-        res.append(
-            web3.eth.get_storage_at(
-                address,
-                p + i,
-                block_identifier=block,
-            )
-        )
-
-    return res
+        return get_storage_reader().read([(address, idx)], block)[0]
+
+    return get_storage_reader().read_arrays([(address, idx)], block)[0]
+
+
+def get_slots(slots: Sequence[tuple[ChecksumAddress, int]], block: int | None = None) -> list[HexBytes]:
+    """Get the values of many (address, position) storage slots in a few requests."""
+    return get_storage_reader().read(slots, block)
+
+
+def get_slots_as_lists(slots: Sequence[tuple[ChecksumAddress, int]], block: int | None = None) -> list[list[HexBytes]]:
+    """Get the elements of many arrays stored at the (address, position) slots in a few requests."""
+    return get_storage_reader().read_arrays(slots, block)
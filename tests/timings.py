@@ -0,0 +1,116 @@
+"""
+Records the wall time, fixture setup times, RPC calls count and gas used of every test into the timing database,
+see utils/test/timing_db.py. With xdist the values are measured on the workers and passed to the controller
+in the report user properties, the controller writes the whole run at once.
+"""
+
+import os
+import subprocess
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import pytest
+from brownie import history
+
+from utils.test.rpc_observer import rpc_observer
+from utils.test.timing_db import TimingDatabase, TimingRecord
+
+FIXTURE_PROPERTY_PREFIX = "fixture:"
+
+
+class RpcCallCounter:
+    def __init__(self):
+        self.calls = 0
+
+    def install(self) -> None:
+        rpc_observer.subscribe(self.count)
+
+    def count(self, method, params, seconds, frame) -> None:
+        self.calls += 1
+
+
+class TimingsPlugin:
+    def __init__(self, config):
+        self.config = config
+        self.started_at = time.time()
+        self.rpc_counter = RpcCallCounter()
+        self.rpc_calls_before = 0
+        self.gas_used = 0
+        self.durations: Dict[str, float] = defaultdict(float)
+        self.outcomes: Dict[str, str] = {}
+        self.properties: Dict[str, List] = {}
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        start = time.perf_counter()
+        yield
+        item = getattr(request, "_pyfuncitem", None)
+        if item is not None:
+            item.user_properties.append((FIXTURE_PROPERTY_PREFIX + fixturedef.argname, time.perf_counter() - start))
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        self.rpc_counter.install()
+        self.rpc_calls_before = self.rpc_counter.calls
+        self.gas_used = 0
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        self.rpc_counter.install()
+        transactions_before = len(history)
+        yield
+        # the transactions of the test body, before the isolation fixtures revert them
+        self.gas_used = sum(tx.gas_used or 0 for tx in history[transactions_before:])
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        if call.when == "teardown":
+            item.user_properties.append(("rpc_calls", self.rpc_counter.calls - self.rpc_calls_before))
+            item.user_properties.append(("gas_used", self.gas_used))
+        yield
+
+    def pytest_runtest_logreport(self, report):
+        self.durations[report.nodeid] += report.duration
+        if report.when == "call" or report.outcome != "passed":
+            self.outcomes.setdefault(report.nodeid, report.outcome)
+        if report.when == "teardown":
+            self.properties[report.nodeid] = list(report.user_properties)
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(self.config, "workerinput") or not self.durations:
+            return
+
+        records = []
+        for nodeid, duration in self.durations.items():
+            properties = self.properties.get(nodeid, [])
+            values = dict(properties)
+            records.append(
+                TimingRecord(
+                    nodeid=nodeid,
+                    outcome=self.outcomes.get(nodeid, "passed"),
+                    duration=duration,
+                    rpc_calls=values.get("rpc_calls", 0),
+                    gas_used=values.get("gas_used", 0),
+                    fixtures={
+                        name[len(FIXTURE_PROPERTY_PREFIX) :]: value
+                        for name, value in properties
+                        if name.startswith(FIXTURE_PROPERTY_PREFIX)
+                    },
+                )
+            )
+        TimingDatabase().add_run(records, run_label(), self.started_at)
+
+
+def run_label() -> str:
+    """The label the run is shown with in the timing reports, the votes under test and the commit by default"""
+    label = os.getenv("TEST_RUN_LABEL")
+    if label is not None:
+        return label
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+    return " ".join(part for part in (os.getenv("OMNIBUS_VOTE_IDS"), os.getenv("DG_PROPOSAL_IDS"), commit) if part)
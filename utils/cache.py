@@ -0,0 +1,14 @@
+import os
+
+
+def get_cache_directory(*parts: str) -> str:
+    """
+    Returns a path inside the local cache directory, creating it if needed.
+
+    The cache lives in `.cache/` at the repository root by default and can be relocated
+    with the CACHE_DIRECTORY env variable (e.g. to share it between CI runs).
+    """
+    root = os.getenv("CACHE_DIRECTORY", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache"))
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -1,33 +1,29 @@
-from eth_utils import keccak, to_bytes, ValidationError
+from functools import lru_cache
+
+from eth_utils import keccak, to_bytes
+
+# Hash nibbles the address letter is upper-cased for
+UPPER_CASE_NIBBLES = frozenset("89abcdef")
 
 
 # https://eips.ethereum.org/EIPS/eip-55
 def checksum_encode(addr):  # Takes a 20-byte binary address as input
-    hex_addr = addr.hex()
-    checksummed_buffer = ""
+    return _checksum_hex(addr.hex())
+
 
+@lru_cache(maxsize=4096)
+def _checksum_hex(hex_addr: str) -> str:
     # Treat the hex address as ascii/utf-8 for keccak256 hashing
     hashed_address = keccak(text=hex_addr).hex()
 
-    # Iterate over each character in the hex address
-    for nibble_index, character in enumerate(hex_addr):
-
-        if character in "0123456789":
-            # We can't upper-case the decimal digits
-            checksummed_buffer += character
-        elif character in "abcdef":
-            # Check if the corresponding hex digit (nibble) in the hash is 8 or higher
-            hashed_address_nibble = int(hashed_address[nibble_index], 16)
-            if hashed_address_nibble > 7:
-                checksummed_buffer += character.upper()
-            else:
-                checksummed_buffer += character
-        else:
-            raise ValidationError(f"Unrecognized hex character {character!r} at position {nibble_index}")
-
-    return "0x" + checksummed_buffer
+    # The decimal digits can't be upper-cased, so only the letters depend on the hash nibbles
+    return "0x" + "".join(
+        character.upper() if nibble in UPPER_CASE_NIBBLES else character
+        for character, nibble in zip(hex_addr, hashed_address)
+    )
 
 
+@lru_cache(maxsize=4096)
 def checksum_verify(address: str) -> bool:
     addr_bytes = to_bytes(hexstr=address)
     checksum_encoded = ""
@@ -0,0 +1,45 @@
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+
+class ColumnTable:
+    """
+    Rows of the same shape stored by columns, the rows are addressed by their index.
+
+    The columns `types` gives an unsigned integer ABI type of up to 64 bits (e.g. the outputs the rows
+    are decoded with) are `array("Q")`, the others are lists, so a check over all the rows is a single pass
+    over the columns, e.g. `all(map(operator.le, table["totalExitedValidators"], table["totalDepositedValidators"]))`.
+    """
+
+    def __init__(self, rows: Sequence[Dict[str, Any]], types: Optional[Dict[str, str]] = None):
+        self.size = len(rows)
+        self.columns: Dict[str, Sequence] = {}
+        if rows:
+            types = types or {}
+            self.columns = {name: _make_column([row[name] for row in rows], types.get(name)) for name in rows[0]}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, name: str) -> Sequence:
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def row(self, index: int) -> Dict[str, Any]:
+        return {name: column[index] for name, column in self.columns.items()}
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        return (self.row(index) for index in range(self.size))
+
+    def ids_where(self, mask: Sequence[bool]) -> List[int]:
+        """Indexes of the rows the mask is set for, handy for the assertion messages"""
+        return [index for index, value in enumerate(mask) if value]
+
+
+def _make_column(values: List[Any], abi_type: Optional[str]) -> Sequence:
+    # the column type depends on the declared type only, so the same field is always of the same type
+    if abi_type is not None and abi_type.startswith("uint") and abi_type[4:].isdigit() and int(abi_type[4:]) <= 64:
+        return array("Q", map(int, values))
+    return values
@@ -0,0 +1,92 @@
+from typing import Iterable, List, NamedTuple, Sequence, Tuple
+
+TOTAL_BASIS_POINTS = 10000
+
+
+class AllocationScenario(NamedTuple):
+    """Staking modules state the deposits allocation is simulated for, the lists are in the modules order"""
+
+    target_shares: Sequence[int]
+    active_keys: Sequence[int]
+    depositable_keys: Sequence[int]
+    keys_to_allocate: int
+    ignore_depositable: bool = False
+
+
+def get_water_level(buckets: Sequence[int], capacities: Sequence[int], allocation_size: int) -> int:
+    """
+    Returns the highest level the buckets can be filled up to with `allocation_size` keys.
+
+    Every bucket below its capacity grows one key per level, so the level is found
+    by a sweep over the sorted bucket starts and capacities instead of key by key.
+    """
+    events = sorted(
+        [(bucket, 1) for bucket, capacity in zip(buckets, capacities) if bucket < capacity]
+        + [(capacity, -1) for bucket, capacity in zip(buckets, capacities) if bucket < capacity]
+    )
+    if not events:
+        return 0
+
+    level, slope, filled = events[0][0], 0, 0
+    for point, slope_change in events:
+        if slope and filled + slope * (point - level) >= allocation_size:
+            return level + (allocation_size - filled) // slope
+        filled += slope * (point - level)
+        level, slope = point, slope + slope_change
+    return level
+
+
+def allocate_min_first(
+    buckets: Sequence[int], capacities: Sequence[int], allocation_size: int
+) -> Tuple[int, List[int]]:
+    """
+    Local version of the MinFirstAllocationStrategy.allocate() used by StakingRouter.
+
+    Every key goes to the bucket with the lowest fill among the ones below the capacity,
+    the lowest index first on ties. Returns the allocated keys count and the new buckets.
+    https://github.com/lidofinance/core/blob/master/contracts/common/lib/MinFirstAllocationStrategy.sol
+    """
+    level = get_water_level(buckets, capacities, allocation_size)
+    allocated = [min(max(bucket, level), max(bucket, capacity)) for bucket, capacity in zip(buckets, capacities)]
+
+    # the keys left are not enough to lift all the buckets at the level by one more key
+    remainder = allocation_size - sum(new - old for new, old in zip(allocated, buckets))
+    for index, (bucket, capacity) in enumerate(zip(buckets, capacities)):
+        if remainder <= 0:
+            break
+        if bucket <= level < capacity:
+            allocated[index] += 1
+            remainder -= 1
+
+    return sum(allocated) - sum(buckets), allocated
+
+
+def get_deposits_allocation(
+    target_shares: Sequence[int],
+    active_keys: Sequence[int],
+    depositable_keys: Sequence[int],
+    keys_to_allocate: int,
+    ignore_depositable: bool = False,
+) -> Tuple[int, List[int]]:
+    """
+    Local version of StakingRouter.getDepositsAllocation().
+
+    Returns the allocated keys count and the modules active keys after the allocation.
+    With `ignore_depositable` the modules are limited by the target share only.
+    https://github.com/lidofinance/core/blob/master/contracts/0.8.9/StakingRouter.sol
+    """
+    target_total_active_keys = sum(active_keys) + keys_to_allocate
+    capacities = [
+        (
+            target_share * target_total_active_keys // TOTAL_BASIS_POINTS
+            if ignore_depositable
+            else min(target_share * target_total_active_keys // TOTAL_BASIS_POINTS, active + depositable)
+        )
+        for target_share, active, depositable in zip(target_shares, active_keys, depositable_keys)
+    ]
+    return allocate_min_first(active_keys, capacities, keys_to_allocate)
+
+
+def get_deposits_allocations(scenarios: Iterable[AllocationScenario]) -> List[Tuple[int, List[int]]]:
+    """Evaluates the deposits allocation for every scenario"""
+    return [get_deposits_allocation(*scenario) for scenario in scenarios]
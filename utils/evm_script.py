@@ -1,12 +1,16 @@
 import logging
 import os
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from typing import List, Union, Optional, Callable, Any
+from typing import List, Union, Optional, Callable, Any, Dict, Iterable, Tuple
 
 import eth_abi
 from brownie import Contract, convert
+from brownie.convert.normalize import format_input
+from brownie.convert.utils import build_function_selector, get_type_strings
 from brownie.utils import color
+from hexbytes import HexBytes
 from eth_typing.evm import HexAddress
 from web3 import Web3
 
@@ -22,8 +26,35 @@ from avotes_parser.core.ABI.utilities.exceptions import (
     ABIEtherscanNetworkError,
 )
 
+from utils.selector_cache import make_selector_cache
+
 EMPTY_CALLSCRIPT = "0x00000001"
 ETHERSCAN_TOKEN = os.getenv("ETHERSCAN_TOKEN", "TGXU5WGVTVYRDDV2MY71R5JYB7147M13FC")
+INTERFACES_DIRECTORY = os.getenv(
+    "INTERFACES_DIRECTORY", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "interfaces")
+)
+
+# DualGovernance.submitProposal(ExternalCall[],string)
+DG_SUBMIT_PROPOSAL_SELECTOR = "0x53e51f8b"
+# Etherscan free tier allows 5 requests per second, keep the pool below it
+DECODE_MAX_WORKERS = int(os.getenv("DECODE_MAX_WORKERS", "4"))
+
+# Shared between all decode calls of the process, print `selector_cache.stats()` to see the hit rate.
+selector_cache = make_selector_cache(INTERFACES_DIRECTORY)
+
+
+class ResolvedAbis(dict):
+    """
+    (checksummed address, method id) -> ABI fragment, None if the method can't be resolved
+    or the error the lookup has failed with, it's raised when the call is decoded.
+
+    The calls decoded while resolving the nested scripts are kept in `decoded_calls`
+    for `decode_evm_script()` to take them instead of decoding once again.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.decoded_calls: Dict[Tuple[str, str, str], Call] = {}
 
 
 def create_executor_id(id) -> str:
@@ -46,11 +77,7 @@ def encode_call_script(actions, spec_id=1) -> str:
 
 @lru_cache
 def get_abi_cache(api_key: str, net: str):
-    return get_cached_combined(
-        api_key,
-        net,
-        os.getenv("INTERFACES_DIRECTORY", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "interfaces")),
-    )
+    return get_cached_combined(api_key, net, INTERFACES_DIRECTORY)
 
 
 def _is_encoded_script(data: FuncInput) -> bool:
@@ -63,8 +90,14 @@ def decode_evm_script(
     specific_net: str = "mainnet",
     repeat_is_error: bool = True,
     is_encoded_script: Optional[Callable[[FuncInput], bool]] = None,
+    resolved_abis: Optional[ResolvedAbis] = None,
 ) -> List[Union[str, Call, EncodedCall]]:
-    """Decode EVM script to human-readable format."""
+    """
+    Decode EVM script to human-readable format.
+
+    ABIs of all the calls in the script tree are resolved in one concurrent batch
+    by `resolve_script_abis()` unless already resolved ones are passed in `resolved_abis`.
+    """
     if verbose:
         # Switch-on debug messages from evmscript-parser package.
         logging.basicConfig(format="%(levelname)s:%(message)s", level=logging.DEBUG)
@@ -82,11 +115,14 @@ def decode_evm_script(
     # NOTE: The line below is not used in the current version; it is retained for fallback to the previous decoder version (see NOTE below).
     abi_storage = get_abi_cache(ETHERSCAN_TOKEN, specific_net)
 
+    if resolved_abis is None:
+        resolved_abis = resolve_calls_abis(parsed.calls, is_encoded_script)
+
     calls = []
     called_contracts = defaultdict(lambda: defaultdict(dict))
     for ind, call in enumerate(parsed.calls):
         try:
-            call_info = decode_encoded_call(call)
+            call_info = _take_decoded_call(call, resolved_abis)
 
             # NOTE: If the decode_encoded_call(call) method fails, uncomment the line below to fall back to the previous version:
             #
@@ -102,6 +138,7 @@ def decode_evm_script(
                         specific_net=specific_net,
                         repeat_is_error=repeat_is_error,
                         is_encoded_script=is_encoded_script,
+                        resolved_abis=resolved_abis,
                     )
 
         except (ABIEtherscanNetworkError, ABIEtherscanStatusCode, ABILocalNotFound) as err:
@@ -114,10 +151,10 @@ def decode_evm_script(
             message = (
                 f"!!! REPEATED SCRIPTS !!!:\n"
                 f"Previous is {jnd + 1}/{total}:\n"
-                f"{calls_info_pretty_print(prev_call_info)}\n"
+                f"{calls_info_pretty_print(prev_call_info, resolved_abis)}\n"
                 f"-----------------------------------------\n"
                 f"Current is {ind + 1}/{total}\n"
-                f"{calls_info_pretty_print(call_info)}"
+                f"{calls_info_pretty_print(call_info, resolved_abis)}"
             )
 
             if repeat_is_error:
@@ -138,23 +175,119 @@ def decode_evm_script(
     return calls
 
 
-def calls_info_pretty_print(call: Union[str, Call, EncodedCall]) -> str:
+def resolve_script_abis(script: str, is_encoded_script: Optional[Callable[[FuncInput], bool]] = None) -> ResolvedAbis:
+    """Resolve ABIs of every call in the EVM script including the nested scripts and DG proposals."""
+    try:
+        parsed = parse_script(script)
+    except ParseStructureError:
+        return ResolvedAbis()
+    return resolve_calls_abis(parsed.calls, is_encoded_script or _is_encoded_script)
+
+
+def resolve_calls_abis(
+    calls: List[EncodedCall],
+    is_encoded_script: Callable[[FuncInput], bool],
+    max_workers: int = DECODE_MAX_WORKERS,
+) -> ResolvedAbis:
+    """
+    Resolve ABIs of the calls tree level by level.
+
+    Unique (address, method id) pairs of each nesting level are resolved concurrently,
+    so the number of serial lookups depends on the tree depth only, not on the calls count.
+    A call which fails to decode is skipped here, `decode_evm_script()` reports it in place.
+    The proxy implementations are read once per resolution.
+    """
+    selector_cache.forget_implementations()
+    resolved_abis = ResolvedAbis()
+    level = list(calls)
+    while level:
+        pairs = {_abi_key(call) for call in level} - resolved_abis.keys()
+        resolved_abis.update(resolve_method_abis(pairs, max_workers))
+
+        next_level = []
+        for call in level:
+            try:
+                call_info = decode_encoded_call(call, resolved_abis)
+            except Exception:
+                continue
+            if call_info is not None:
+                resolved_abis.decoded_calls[_call_key(call)] = call_info
+                next_level.extend(_nested_encoded_calls(call_info, is_encoded_script))
+        level = next_level
+
+    return resolved_abis
+
+
+def resolve_method_abis(pairs: Iterable[Tuple[str, str]], max_workers: int = DECODE_MAX_WORKERS) -> ResolvedAbis:
+    """Look up ABI fragments for (address, method id) pairs using a bounded thread pool."""
+    pairs = sorted(set(pairs))
+    if not pairs:
+        return ResolvedAbis()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return ResolvedAbis(zip(pairs, executor.map(lambda pair: _get_method_abi_or_error(*pair), pairs)))
+
+
+def _get_method_abi_or_error(address: str, method_id: str) -> Union[dict, None, Exception]:
+    try:
+        return get_method_abi(address, method_id)
+    except Exception as err:
+        return err
+
+
+def _take_decoded_call(encoded_call: EncodedCall, resolved_abis: Optional[ResolvedAbis]) -> Optional[Call]:
+    """The call decoded by `resolve_calls_abis()` if any, every decoded call is taken once as it's modified later"""
+    decoded_calls = getattr(resolved_abis, "decoded_calls", {})
+    call_info = decoded_calls.pop(_call_key(encoded_call), None)
+    if call_info is None:
+        call_info = decode_encoded_call(encoded_call, resolved_abis)
+    return call_info
+
+
+def _abi_key(encoded_call: EncodedCall) -> Tuple[str, str]:
+    return convert.to_address(encoded_call.address), encoded_call.method_id
+
+
+def _call_key(encoded_call: EncodedCall) -> Tuple[str, str, str]:
+    return (*_abi_key(encoded_call), encoded_call.encoded_call_data)
+
+
+def _nested_encoded_calls(call_info: Call, is_encoded_script: Callable[[FuncInput], bool]) -> List[EncodedCall]:
+    nested_calls = []
+    for inp in filter(is_encoded_script, call_info.inputs):
+        try:
+            nested_calls.extend(parse_script(inp.value).calls)
+        except ParseStructureError:
+            # Malformed script is reported by decode_evm_script() itself
+            continue
+    if call_info.function_signature == DG_SUBMIT_PROPOSAL_SELECTOR:
+        nested_calls.extend(dg_proposal_encoded_calls(call_info))
+    return nested_calls
+
+
+def dg_proposal_encoded_calls(call: Call) -> List[EncodedCall]:
+    """Convert ExternalCall[] argument of the DualGovernance.submitProposal call to EncodedCall list."""
+    return [
+        EncodedCall(
+            address=nested_call[0][2:],
+            method_id=nested_call[2][:4].hex(),
+            encoded_call_data=nested_call[2][4:].hex(),
+            call_data_length=len(nested_call[2]),
+        )
+        for nested_call in call.inputs[0].value
+    ]
+
+
+def calls_info_pretty_print(call: Union[str, Call, EncodedCall], resolved_abis: Optional[ResolvedAbis] = None) -> str:
     """Format printing for Call instance."""
     result = color.highlight(repr(call))
 
     # NOTE: Enhanced handling of nested DualGovernance proposals.
     # If the call targets DualGovernance.submitProposal(ExternalCall[],string) (selector 0x53e51f8b),
     # attempt to decode each ExternalCall and append a human-readable list.
-    if call.function_signature == "0x53e51f8b":
+    if call.function_signature == DG_SUBMIT_PROPOSAL_SELECTOR:
         result += f"{color('cyan')}Nested calls within this DG proposal:{color()}\n"
-        for i, nested_call in enumerate(call.inputs[0].value):
-            encoded_call = EncodedCall(
-                address=nested_call[0][2:],
-                method_id=nested_call[2][:4].hex(),
-                encoded_call_data=nested_call[2][4:].hex(),
-                call_data_length=len(nested_call[2]),
-            )
-            result += f"  {i+1}. {color.highlight(repr(decode_encoded_call(encoded_call)))}\n"
+        for i, encoded_call in enumerate(dg_proposal_encoded_calls(call)):
+            result += f"  {i+1}. {color.highlight(repr(decode_encoded_call(encoded_call, resolved_abis)))}\n"
 
     return result
 
@@ -168,9 +301,9 @@ def encode_error(error: str, values=None) -> str:
     return encoded_error
 
 
-def decode_encoded_call(encoded_call: EncodedCall) -> Optional[Call]:
+def decode_encoded_call(encoded_call: EncodedCall, resolved_abis: Optional[ResolvedAbis] = None) -> Optional[Call]:
     """
-    Decodes an encoded contract call using Brownie's Contract API.
+    Decodes an encoded contract call using the local selector cache and Brownie's Contract API.
 
     This function replaces AVotesParser.decode_function_call() and converts the provided
     EncodedCall into a Call object or returns None if the decoding wasn't successfull.
@@ -179,55 +312,92 @@ def decode_encoded_call(encoded_call: EncodedCall) -> Optional[Call]:
     Parameters:
         encoded_call (EncodedCall): An object containing the target contract address, method id,
                                     and encoded call data and encoded call data length.
+        resolved_abis (ResolvedAbis): Optional ABIs resolved beforehand by `resolve_calls_abis()`,
+                                      the method ABI is looked up by `get_method_abi()` if it's missing.
 
     Returns:
         Call: A Call object with decoded call details if successful, otherwise None if the method
               call cannot be decoded.
     """
-    contract = Contract(encoded_call.address)
-
-    # If the method selector is not found in the locally stored contracts, fetch the full ABI from Etherscan.
-    if encoded_call.method_id not in contract.selectors:
-        # For proxy contracts, Brownie automatically retrieves the implementation ABI.
-        contract = Contract.from_explorer(encoded_call.address)
-
-    # If the method selector is still not found, the call may target the proxy contract directly rather than its implementation.
-    if encoded_call.method_id not in contract.selectors:
-        # Explicitly fetch the ABI for the proxy contract itself by setting `as_proxy_for` to the proxy's address.
-        # NOTE: Normalization via `convert.to_address()` is required; without it, the internal check in `from_explorer()` may fail,
-        #   resulting in the implementation's ABI being downloaded instead.
-        contract = Contract.from_explorer(encoded_call.address, as_proxy_for=convert.to_address(encoded_call.address))
-
-    # If the method selector is still not found, the contract is likely not verified.
-    if encoded_call.method_id not in contract.selectors:
+    key = _abi_key(encoded_call)
+    if resolved_abis is not None and key in resolved_abis:
+        method_abi = resolved_abis[key]
+        if isinstance(method_abi, Exception):
+            raise method_abi
+    else:
+        method_abi = get_method_abi(*key)
+
+    # If the method selector is not found, the contract is likely not verified.
+    if method_abi is None:
         return None
 
-    method_name = contract.selectors[encoded_call.method_id]
-    contract_method = getattr(contract, method_name)
-
-    method_abi = contract_method.abi
-
-    calldata_with_selector = encoded_call.method_id + encoded_call.encoded_call_data[2:]
-    decoded_calldata = contract_method.decode_input(calldata_with_selector)
+    types_list = get_type_strings(method_abi["inputs"])
+    decoded_calldata = format_input(method_abi, eth_abi.decode(types_list, HexBytes(encoded_call.encoded_call_data)))
 
     inputs = [get_func_input(method_abi["inputs"][idx], arg) for idx, arg in enumerate(decoded_calldata)]
 
+    state_mutability = method_abi.get("stateMutability", "nonpayable")
     properties = {
         "constant": "unknown",  # Typically False even for pure methods, but not guaranteed.
-        "payable": method_abi["stateMutability"] == "payable",
-        "stateMutability": method_abi["stateMutability"],
+        "payable": state_mutability == "payable",
+        "stateMutability": state_mutability,
         "type": "function",
     }
 
     return Call(
-        contract.address,
+        key[0],
         encoded_call.method_id,
-        method_name,
+        method_abi["name"],
         inputs,
         properties,
         method_abi["outputs"],
     )
 
 
+def get_method_abi(address: str, method_id: str) -> Optional[dict]:
+    """
+    Returns the ABI fragment of the method called on `address`.
+
+    The fragment is taken from `selector_cache` first, Etherscan is queried only on a cache miss
+    and the fetched ABI is stored to the cache so the next decoding of the same contract runs offline.
+    """
+    method_abi = selector_cache.get(address, method_id)
+    if method_abi is not None:
+        return method_abi
+
+    contract = fetch_contract_with_selector(address, method_id)
+    if contract is None:
+        return None
+
+    selector_cache.put(address, contract.abi)
+    return next(
+        fragment
+        for fragment in contract.abi
+        if fragment.get("type") == "function" and build_function_selector(fragment) == method_id
+    )
+
+
+def fetch_contract_with_selector(address: str, method_id: str) -> Optional[Contract]:
+    """Returns the Brownie contract at `address` which ABI has `method_id`, fetching it from Etherscan if needed."""
+    contract = Contract(address)
+
+    # If the method selector is not found in the locally stored contracts, fetch the full ABI from Etherscan.
+    if method_id not in contract.selectors:
+        # For proxy contracts, Brownie automatically retrieves the implementation ABI.
+        contract = Contract.from_explorer(address)
+
+    # If the method selector is still not found, the call may target the proxy contract directly rather than its implementation.
+    if method_id not in contract.selectors:
+        # Explicitly fetch the ABI for the proxy contract itself by setting `as_proxy_for` to the proxy's address.
+        # NOTE: Normalization via `convert.to_address()` is required; without it, the internal check in `from_explorer()` may fail,
+        #   resulting in the implementation's ABI being downloaded instead.
+        contract = Contract.from_explorer(address, as_proxy_for=convert.to_address(address))
+
+    if method_id not in contract.selectors:
+        return None
+
+    return contract
+
+
 def get_func_input(input_abi: dict, value: Any) -> FuncInput:
     return FuncInput(input_abi["name"], input_abi.get("internalType", input_abi.get("type")), value)
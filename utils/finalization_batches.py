@@ -0,0 +1,106 @@
+from bisect import bisect_right
+from itertools import accumulate
+from typing import List, NamedTuple, Optional, Sequence
+
+from brownie import web3
+from web3 import Web3
+
+from utils.storage_reader import get_storage_reader
+
+E27_PRECISION_BASE = 10**27
+MAX_BATCHES_LENGTH = 36
+# WithdrawalQueueBase.QUEUE_POSITION, the mapping(uint256 => WithdrawalRequest) of the requests
+QUEUE_POSITION = Web3.to_int(Web3.keccak(text="lido.WithdrawalQueue.queue"))
+UINT40_MASK = 2**40 - 1
+UINT128_MASK = 2**128 - 1
+
+
+class WithdrawalRequests(NamedTuple):
+    """
+    WithdrawalQueue requests from the last finalized one (the batches start point) to the last one,
+    stored by columns, the index 0 is the last finalized request.
+    """
+
+    first_id: int
+    cumulative_steth: Sequence[int]
+    cumulative_shares: Sequence[int]
+    timestamps: Sequence[int]
+    report_timestamps: Sequence[int]
+
+
+class FinalizationBatches(NamedTuple):
+    remaining_eth_budget: int
+    batches: List[int]
+
+
+def read_withdrawal_requests(withdrawal_queue, block: Optional[int] = None) -> WithdrawalRequests:
+    """Reads the unfinalized requests with the last finalized one from the queue storage in a few batched calls"""
+    if block is None:
+        block = web3.eth.block_number
+    first_id = withdrawal_queue.getLastFinalizedRequestId(block_identifier=block)
+    last_id = withdrawal_queue.getLastRequestId(block_identifier=block)
+
+    # struct WithdrawalRequest {
+    #     uint128 cumulativeStETH; uint128 cumulativeShares;
+    #     address owner; uint40 timestamp; bool claimed; uint40 reportTimestamp;
+    # }
+    slots = []
+    for id in range(first_id, last_id + 1):
+        position = _request_position(id)
+        slots += [(withdrawal_queue.address, position), (withdrawal_queue.address, position + 1)]
+    values = [Web3.to_int(value) for value in get_storage_reader().read(slots, block)]
+    amounts, info = values[0::2], values[1::2]
+
+    return WithdrawalRequests(
+        first_id=first_id,
+        cumulative_steth=[value & UINT128_MASK for value in amounts],
+        cumulative_shares=[value >> 128 for value in amounts],
+        timestamps=[(value >> 160) & UINT40_MASK for value in info],
+        report_timestamps=[(value >> 208) & UINT40_MASK for value in info],
+    )
+
+
+def calculate_finalization_batches(
+    requests: WithdrawalRequests, max_share_rate: int, max_timestamp: int, eth_budget: int
+) -> FinalizationBatches:
+    """
+    Local version of the WithdrawalQueue.calculateFinalizationBatches() called until it's finished.
+
+    The request is finalized at its own share rate if it's not above `max_share_rate` and discounted
+    to it otherwise. The requests are taken while they are older than `max_timestamp` and the prefix sum
+    of their ether fits the budget. The neighbours stay in the same batch if they are on the same side
+    of `max_share_rate` or were placed during the same report, up to MAX_BATCHES_LENGTH batches.
+    https://github.com/lidofinance/core/blob/master/contracts/0.8.9/WithdrawalQueueBase.sol
+    """
+    steth = [end - start for start, end in zip(requests.cumulative_steth, requests.cumulative_steth[1:])]
+    shares = [end - start for start, end in zip(requests.cumulative_shares, requests.cumulative_shares[1:])]
+    share_rates = [amount * E27_PRECISION_BASE // count for amount, count in zip(steth, shares)]
+    discounted = [share_rate > max_share_rate for share_rate in share_rates]
+    eth_to_finalize = [
+        count * max_share_rate // E27_PRECISION_BASE if is_discounted else amount
+        for amount, count, is_discounted in zip(steth, shares, discounted)
+    ]
+    eth_spent = list(accumulate(eth_to_finalize))
+
+    timestamps = requests.timestamps[1:]
+    limit = next((index for index, timestamp in enumerate(timestamps) if timestamp > max_timestamp), len(timestamps))
+    limit = min(limit, bisect_right(eth_spent, eth_budget))
+
+    batches: List[int] = []
+    for index in range(limit):
+        if index and (
+            requests.report_timestamps[index] == requests.report_timestamps[index + 1]
+            or discounted[index - 1] == discounted[index]
+        ):
+            batches[-1] = requests.first_id + index + 1
+            continue
+        if len(batches) == MAX_BATCHES_LENGTH:
+            # the contract takes the budget for the request before it gives up on the new batch
+            return FinalizationBatches(eth_budget - eth_spent[index], batches)
+        batches.append(requests.first_id + index + 1)
+
+    return FinalizationBatches(eth_budget - (eth_spent[limit - 1] if limit else 0), batches)
+
+
+def _request_position(id: int) -> int:
+    return Web3.to_int(Web3.keccak(id.to_bytes(32, "big") + QUEUE_POSITION.to_bytes(32, "big")))
@@ -1,9 +1,5 @@
-import aiohttp
-import asyncio
-import io
 import re
-import requests
-from typing import Tuple, TypedDict
+from typing import NamedTuple, Tuple, TypedDict
 from os import linesep
 import json
 
@@ -11,6 +7,7 @@ from ipfs_cid import cid_sha256_hash
 
 from utils.config import get_pinata_cloud_token, get_infura_io_keys, get_web3_storage_token
 from utils.checksummed_address import checksum_verify
+from utils.ipfs_client import get_ipfs_client
 
 #  https://github.com/multiformats/multibase/blob/master/multibase.csv
 #  IPFS has two CID formats v0 and v1, v1 supports different encodings, defaults are:
@@ -51,53 +48,44 @@ class IPFSUploadResult(TypedDict):
 
 # alternative for upload_str_to_web3_storage
 def _upload_str_to_infura_io(text: str) -> str:
-    text_bytes = text.encode("utf-8")
-    text_file = io.BytesIO(text_bytes)
-    files = {"file": text_file}
     (projectId, projectSecret) = get_infura_io_keys()
 
     endpoint = "https://ipfs.infura.io:5001"
 
-    response = requests.post(endpoint + "/api/v0/add?cid-version=1", files=files, auth=(projectId, projectSecret))
-    response.raise_for_status()
-    response_json = response.json()
+    response_json = get_ipfs_client().post(
+        endpoint + "/api/v0/add?cid-version=1", form={"file": text.encode("utf-8")}, auth=(projectId, projectSecret)
+    )
 
     return response_json.get("Hash")
 
 
 # alternative for upload_str_to_web3_storage
 def _upload_str_to_pinata_cloud(text: str) -> str:
-    text_bytes = text.encode("utf-8")
-    text_file = io.BytesIO(text_bytes)
-    files = {"file": text_file}
     pinata_cloud_token = get_pinata_cloud_token()
 
     endpoint = "https://api.pinata.cloud"
 
     pinata_options = {"cidVersion": 1, "wrapWithDirectory": False}
-    payload = {"pinataOptions": json.dumps(pinata_options, separators=(",", ":"))}
+    form = {
+        "pinataOptions": json.dumps(pinata_options, separators=(",", ":")),
+        "file": text.encode("utf-8"),
+    }
 
     headers = {"accept": "application/json", "authorization": f"Bearer {pinata_cloud_token}"}
 
-    response = requests.post(endpoint + "/pinning/pinFileToIPFS", data=payload, files=files, headers=headers)
-    response.raise_for_status()
-    response_json = response.json()
+    response_json = get_ipfs_client().post(endpoint + "/pinning/pinFileToIPFS", form=form, headers=headers)
 
     return response_json.get("IpfsHash")
 
 
 # upload text to web3.storage ipfs
 def _upload_str_to_web3_storage(text: str) -> str:
-    text_bytes = text.encode("utf-8")
-    text_file = io.BytesIO(text_bytes)
     web3_storage_token = get_web3_storage_token()
 
     endpoint = "https://api.web3.storage/upload"
     headers = {"Authorization": f"Bearer {web3_storage_token}", "Content-Type": "application/x-directory"}
 
-    response = requests.post(endpoint, headers=headers, data=text_file)
-    response.raise_for_status()
-    response_json = response.json()
+    response_json = get_ipfs_client().post(endpoint, data=text.encode("utf-8"), headers=headers)
 
     return response_json.get("cid")
 
@@ -121,36 +109,40 @@ def calculate_cid_hash(text: str) -> str:
     return cid_sha256_hash(data)
 
 
-# fetching url status
-async def _fetch_status(session, url: str) -> int:
-    async with session.get(url) as response:
-        return response.status
-
-
 def get_url_by_cid(cid: str) -> str:
     if cid and re.search(rf"^{REG_VOTE_CID}$", cid):
         return f"https://{cid}.ipfs.w3s.link"
     return ""
 
 
-# fetch cid from different api concurrency
-async def _fetch_cid_status_from_ipfs_async(cid: str) -> int:
-    if not cid:
-        return 404
+class DescriptionFinding(NamedTuple):
+    kind: str  # one of DESCRIPTION_FINDING_KINDS
+    value: str
+    span: Tuple[int, int]
 
-    request_urls = [
-        get_url_by_cid(cid),  # faster for uploaded files
-    ]
 
-    async with aiohttp.ClientSession() as session:
-        tasks = [asyncio.create_task(_fetch_status(session, url)) for url in request_urls]
-        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+DESCRIPTION_FINDING_KINDS = ("unformatted_address", "wrong_checksum", "unformatted_cid")
+DESCRIPTION_TOKENS = re.compile(rf"(?P<address>{REG_ETH_ADDRESS})|(?P<cid>{REG_CID_DEFAULT})")
 
-        for task in pending:
-            task.cancel()
 
-        for task in done:
-            return task.result()
+def lint_ipfs_description(text: str) -> list[DescriptionFinding]:
+    """
+    Scans the description once for the addresses and CIDs, returns the addresses and CIDs
+    not wrapped into the inline code block and the addresses with the wrong checksum, in the text order.
+    """
+    findings: list[DescriptionFinding] = []
+    for match in DESCRIPTION_TOKENS.finditer(text):
+        start, end = match.span()
+        formatted = text[start - 1 : start] == "`" and text[end : end + 1] == "`"
+        if match.group("address") is not None:
+            address = match.group("address")
+            if not formatted:
+                findings.append(DescriptionFinding("unformatted_address", address, (start, end)))
+            if not checksum_verify(address):
+                findings.append(DescriptionFinding("wrong_checksum", address, (start, end)))
+        elif not formatted:
+            findings.append(DescriptionFinding("unformatted_cid", match.group("cid"), (start, end)))
+    return findings
 
 
 def verify_ipfs_description(text: str) -> list[Tuple[str, str]]:
@@ -167,10 +159,11 @@ def verify_ipfs_description(text: str) -> list[Tuple[str, str]]:
             )
         )
 
-    ugly_address_raw_groups = re.findall(rf"([^`]{REG_ETH_ADDRESS}|{REG_ETH_ADDRESS}[^`])", f" {text} ")
+    values: dict[str, list[str]] = {kind: [] for kind in DESCRIPTION_FINDING_KINDS}
+    for finding in lint_ipfs_description(text):
+        values[finding.kind].append(finding.value)
 
-    if ugly_address_raw_groups:
-        address_raw = list(map(lambda x: x[1] or x[2], ugly_address_raw_groups))
+    if values["unformatted_address"]:
         messages.append(
             (
                 "warning",
@@ -178,28 +171,22 @@ def verify_ipfs_description(text: str) -> list[Tuple[str, str]]:
                     "You have wallet addresses in description which has no Markdown style. "
                     "You could use inline code block to make it looks better. "
                     "You need to add '`' before and after the address. Here is the list of addresses:\n"
-                    f"{linesep.join(address_raw)}"
+                    f"{linesep.join(values['unformatted_address'])}"
                 ),
             )
         )
-    all_address_raw_groups = re.findall(rf"{REG_ETH_ADDRESS}", f" {text} ")
-
-    if all_address_raw_groups:
-        wrong_address_raw = list(filter(lambda address: not checksum_verify(address), all_address_raw_groups))
-        if wrong_address_raw:
-            messages.append(
+    if values["wrong_checksum"]:
+        messages.append(
+            (
+                "error",
                 (
-                    "error",
-                    (
-                        "You have wallet addresses in description which has wrong hash sum. "
-                        "Here is the list of addresses:\n"
-                        f"{linesep.join(wrong_address_raw)}"
-                    ),
-                )
+                    "You have wallet addresses in description which has wrong hash sum. "
+                    "Here is the list of addresses:\n"
+                    f"{linesep.join(values['wrong_checksum'])}"
+                ),
             )
-    ugly_cid_raw_groups = re.findall(rf"([^`]{REG_CID_DEFAULT}|{REG_CID_DEFAULT}[^`])", f" {text} ")
-    if ugly_cid_raw_groups:
-        cid_raw = list(map(lambda x: x[1] or x[2], ugly_cid_raw_groups))
+        )
+    if values["unformatted_cid"]:
         messages.append(
             (
                 "warning",
@@ -207,15 +194,18 @@ def verify_ipfs_description(text: str) -> list[Tuple[str, str]]:
                     "You have CIDs in description which has no Markdown style. "
                     "You could use inline code block to make it looks better. "
                     "You need to add '`' before and after CID. Here is the list of CID:\n"
-                    f"{linesep.join(cid_raw)}"
+                    f"{linesep.join(values['unformatted_cid'])}"
                 ),
             )
         )
     return messages
 
 
-def fetch_cid_status_from_ipfs(cid: str):
-    return asyncio.run(_fetch_cid_status_from_ipfs_async(cid))
+# probes the cid on all the IPFS_GATEWAYS at once, the found cids are cached for IPFS_CID_STATUS_TTL
+def fetch_cid_status_from_ipfs(cid: str) -> int:
+    if not cid:
+        return 404
+    return get_ipfs_client().fetch_cid_status(cid)
 
 
 def calculate_vote_ipfs_description(text: str) -> IPFSUploadResult:
@@ -252,6 +242,7 @@ def upload_vote_ipfs_description(text: str, force_upload=False) -> IPFSUploadRes
         uploaded_cid = _upload_str_to_ipfs(text)
         if calculated_cid == uploaded_cid:
             # uploaded has same CID
+            get_ipfs_client().cache.set(calculated_cid, 200)
             return IPFSUploadResult(cid=calculated_cid, messages=messages, text=text)
 
         messages.append(
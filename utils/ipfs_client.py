@@ -0,0 +1,178 @@
+"""
+IPFS gateways and pinning services client.
+
+All the requests go through a single aiohttp session running on a background event loop,
+so the connections are reused between the calls. The CID availability is probed on all
+the gateways at once and the CIDs found are cached locally for IPFS_CID_STATUS_TTL seconds.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import aiohttp
+
+from utils.cache import get_cache_directory
+
+# Gateway URL templates, the first 2xx response wins
+IPFS_GATEWAYS = [
+    gateway.strip()
+    for gateway in os.getenv(
+        "IPFS_GATEWAYS", "https://{cid}.ipfs.w3s.link,https://ipfs.io/ipfs/{cid},https://{cid}.ipfs.dweb.link"
+    ).split(",")
+    if gateway.strip()
+]
+IPFS_CID_STATUS_TTL = int(os.getenv("IPFS_CID_STATUS_TTL", 600))
+IPFS_REQUEST_TIMEOUT = int(os.getenv("IPFS_REQUEST_TIMEOUT", 30))
+IPFS_UPLOAD_RETRIES = int(os.getenv("IPFS_UPLOAD_RETRIES", 3))
+
+# Status returned if no gateway has responded
+GATEWAY_TIMEOUT_STATUS = 504
+RETRIABLE_STATUSES = (429, 500, 502, 503, 504)
+
+
+class CidStatusCache:
+    """CID to the gateway 2xx status map with the expiration, stored in a JSON file"""
+
+    def __init__(self, path: Optional[str], ttl: int = IPFS_CID_STATUS_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.statuses: Dict[str, Tuple[int, float]] = {}
+        if path and os.path.exists(path):
+            with open(path) as file:
+                self.statuses = {cid: tuple(value) for cid, value in json.load(file).items()}
+
+    def get(self, cid: str) -> Optional[int]:
+        status, checked_at = self.statuses.get(cid, (None, 0))
+        if status is None or time.time() - checked_at > self.ttl:
+            return None
+        return status
+
+    def set(self, cid: str, status: int) -> None:
+        with self.lock:
+            now = time.time()
+            self.statuses = {
+                cached_cid: value for cached_cid, value in self.statuses.items() if now - value[1] <= self.ttl
+            }
+            self.statuses[cid] = (status, now)
+            if self.path:
+                with open(self.path, "w") as file:
+                    json.dump(self.statuses, file)
+
+
+class IpfsClient:
+    def __init__(
+        self,
+        gateways: List[str] = IPFS_GATEWAYS,
+        cache: Optional[CidStatusCache] = None,
+        timeout: int = IPFS_REQUEST_TIMEOUT,
+        retries: int = IPFS_UPLOAD_RETRIES,
+        retry_delay: float = 1,
+    ):
+        self.gateways = gateways
+        self.cache = cache if cache is not None else CidStatusCache(None)
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def fetch_cid_status(self, cid: str, use_cache: bool = True) -> int:
+        """
+        The first 2xx status of the gateways, or the first error status if the CID is found nowhere.
+        Only the 2xx statuses are cached, a CID missing now may be pinned or the gateways may be back soon.
+        """
+        status = self.cache.get(cid) if use_cache else None
+        if status is None:
+            status = self._run(self._race_gateways(cid))
+            if 200 <= status < 300:
+                self.cache.set(cid, status)
+        return status
+
+    def post(
+        self,
+        url: str,
+        form: Optional[Dict[str, Union[str, bytes]]] = None,
+        data: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        auth: Optional[Tuple[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Posts the raw `data` or the multipart `form` (the bytes values are sent as files) and returns
+        the JSON response, the connection errors and the 429/5xx responses are retried with a backoff.
+        """
+        return self._run(self._post(url, form, data, headers, auth))
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._run(self._session.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    async def _gateway_status(self, url: str) -> int:
+        async with self._get_session().get(url) as response:
+            return response.status
+
+    async def _race_gateways(self, cid: str) -> int:
+        tasks = [asyncio.create_task(self._gateway_status(gateway.format(cid=cid))) for gateway in self.gateways]
+        first_status = None
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    status = await next_done
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    continue
+                if 200 <= status < 300:
+                    return status
+                if first_status is None:
+                    first_status = status
+        finally:
+            for task in tasks:
+                task.cancel()
+        return GATEWAY_TIMEOUT_STATUS if first_status is None else first_status
+
+    async def _post(self, url, form, data, headers, auth) -> Dict[str, Any]:
+        basic_auth = aiohttp.BasicAuth(*auth) if auth else None
+        for attempt in range(self.retries + 1):
+            body: Any = data
+            if form is not None:
+                # the form can't be sent twice, so it is built for every attempt
+                body = aiohttp.FormData()
+                for name, value in form.items():
+                    if isinstance(value, bytes):
+                        body.add_field(name, value, filename=name)
+                    else:
+                        body.add_field(name, value)
+            try:
+                async with self._get_session().post(url, data=body, headers=headers, auth=basic_auth) as response:
+                    if response.status not in RETRIABLE_STATUSES or attempt == self.retries:
+                        response.raise_for_status()
+                        return await response.json(content_type=None)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == self.retries:
+                    raise
+            await asyncio.sleep(self.retry_delay * 2**attempt)
+
+
+_ipfs_client: Optional[IpfsClient] = None
+
+
+def get_ipfs_client() -> IpfsClient:
+    global _ipfs_client
+    if _ipfs_client is None:
+        _ipfs_client = IpfsClient(cache=CidStatusCache(os.path.join(get_cache_directory("ipfs"), "cid_status.json")))
+    return _ipfs_client
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from eth_utils import to_checksum_address
+from hexbytes import HexBytes
+from tqdm import tqdm
+from web3 import Web3
+
+from utils.cache import get_cache_directory
+
+# Substrings of the errors the providers return when a get_logs window holds too many entries
+TOO_MANY_RESULTS_ERRORS = (
+    "query returned more than",
+    "range is too large",
+    "response size",
+)
+# Substrings of the errors the providers return when the requests are throttled
+RATE_LIMIT_ERRORS = (
+    "429",
+    "too many requests",
+    "rate limit",
+    "limit exceeded",
+)
+LOGS_REQUEST_RETRIES = int(os.getenv("LOGS_REQUEST_RETRIES", 5))
+# Blocks closer to the head than this are never stored in the checkpoint
+FINALITY_DEPTH = 64
+
+
+class LogsCheckpoint:
+    """
+    SQLite storage of the fetched logs.
+
+    Logs are stored per filter key together with the block range they cover,
+    so the next scan only needs the blocks after `last_block`.
+    """
+
+    def __init__(self, path: str):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints (key TEXT PRIMARY KEY, first_block INTEGER, last_block INTEGER)"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS logs ("
+            "key TEXT, block_number INTEGER, log_index INTEGER, log TEXT, PRIMARY KEY (key, block_number, log_index))"
+        )
+        self.connection.commit()
+
+    def load(self, key: str, from_block: int) -> Tuple[List[Dict], Optional[int]]:
+        row = self.connection.execute(
+            "SELECT first_block, last_block FROM checkpoints WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[0] > from_block:
+            self.reset(key)
+            return [], None
+
+        rows = self.connection.execute(
+            "SELECT log FROM logs WHERE key = ? AND block_number >= ? ORDER BY block_number, log_index",
+            (key, from_block),
+        )
+        return [json.loads(log) for (log,) in rows], row[1]
+
+    def save(self, key: str, first_block: int, last_block: int, logs: List[Dict]) -> None:
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO logs VALUES (?, ?, ?, ?)",
+                [(key, log["blockNumber"], log["logIndex"], json.dumps(log)) for log in logs],
+            )
+            self.connection.execute(
+                "INSERT INTO checkpoints VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET last_block = excluded.last_block",
+                (key, first_block, last_block),
+            )
+
+    def reset(self, key: str) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM checkpoints WHERE key = ?", (key,))
+            self.connection.execute("DELETE FROM logs WHERE key = ?", (key,))
+
+
+class LogIndexer:
+    """
+    Fetches the logs matching the filter concurrently in `max_range` block windows.
+
+    A window the provider refuses to serve because of the results limit is split in halves
+    until it fits, a throttled request is retried with a backoff. With a checkpoint the logs
+    of the finalized blocks are stored locally and only the blocks after the last checkpoint
+    are requested from the provider.
+    """
+
+    def __init__(
+        self,
+        provider: Web3,
+        address: str,
+        topics: List[Optional[str]],
+        checkpoint: Optional[LogsCheckpoint] = None,
+        max_range: int = 100_000,
+        max_workers: int = 8,
+        retries: int = LOGS_REQUEST_RETRIES,
+        retry_delay: float = 1.0,
+    ):
+        self.provider = provider
+        self.address = to_checksum_address(address)
+        self.topics = topics
+        self.checkpoint = checkpoint
+        self.max_range = max_range
+        self.max_workers = max_workers
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+    @property
+    def key(self) -> str:
+        return hashlib.sha256(json.dumps([self.provider.eth.chain_id, self.address, self.topics]).encode()).hexdigest()
+
+    def get_logs(self, from_block: int, to_block: int) -> List[Dict]:
+        if self.checkpoint is None:
+            return self._fetch(from_block, to_block)
+
+        key = self.key
+        stored_logs, last_block = self.checkpoint.load(key, from_block)
+        start_block = from_block if last_block is None else last_block + 1
+
+        safe_block = min(to_block, self.provider.eth.block_number - FINALITY_DEPTH)
+        new_logs = self._fetch(start_block, safe_block) if start_block <= safe_block else []
+        if start_block <= safe_block:
+            self.checkpoint.save(key, from_block, safe_block, new_logs)
+
+        tail_logs = self._fetch(max(start_block, safe_block + 1), to_block)
+        return [log for log in stored_logs if log["blockNumber"] <= to_block] + new_logs + tail_logs
+
+    def _fetch(self, from_block: int, to_block: int) -> List[Dict]:
+        windows = [
+            (window_start, min(window_start + self.max_range - 1, to_block))
+            for window_start in range(from_block, to_block + 1, self.max_range)
+        ]
+        if not windows:
+            return []
+
+        logs = []
+        with tqdm(total=len(windows), desc="Fetching Events") as pbar:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # map() keeps the windows order, so the logs stay sorted by block
+                for window_logs in executor.map(lambda window: self._fetch_window(*window), windows):
+                    logs.extend(window_logs)
+                    pbar.update(1)
+        return logs
+
+    def _fetch_window(self, from_block: int, to_block: int) -> List[Dict]:
+        for attempt in range(self.retries + 1):
+            try:
+                logs = self.provider.eth.get_logs(
+                    {"address": self.address, "fromBlock": from_block, "toBlock": to_block, "topics": self.topics}
+                )
+                return [_to_plain_log(log) for log in logs]
+            except Exception as err:
+                if _is_error_of(err, RATE_LIMIT_ERRORS) and attempt < self.retries:
+                    time.sleep(self.retry_delay * 2**attempt)
+                    continue
+                if from_block == to_block or not _is_error_of(err, TOO_MANY_RESULTS_ERRORS):
+                    raise
+                middle_block = (from_block + to_block) // 2
+                return self._fetch_window(from_block, middle_block) + self._fetch_window(middle_block + 1, to_block)
+
+
+def _is_error_of(err: Exception, markers: Tuple[str, ...]) -> bool:
+    message = str(err).lower()
+    return any(marker in message for marker in markers)
+
+
+def _to_plain_log(log) -> Dict:
+    return {
+        "address": to_checksum_address(log["address"]),
+        "blockHash": HexBytes(log["blockHash"]).hex(),
+        "blockNumber": log["blockNumber"],
+        "transactionHash": HexBytes(log["transactionHash"]).hex(),
+        "transactionIndex": log["transactionIndex"],
+        "logIndex": log["logIndex"],
+        "topics": [HexBytes(topic).hex() for topic in log["topics"]],
+        "data": HexBytes(log["data"]).hex(),
+    }
+
+
+def make_logs_checkpoint(name: str = "logs") -> LogsCheckpoint:
+    return LogsCheckpoint(os.path.join(get_cache_directory("log_indexer"), f"{name}.sqlite"))
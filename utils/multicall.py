@@ -0,0 +1,100 @@
+import os
+from dataclasses import dataclass, field
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, Union
+
+import eth_abi
+from brownie import web3
+from hexbytes import HexBytes
+
+# Multicall3 is deployed at the same address on almost every network
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+# aggregate3((address target, bool allowFailure, bytes callData)[]) returns ((bool success, bytes returnData)[])
+AGGREGATE3_SELECTOR = "0x82ad56cb"
+AGGREGATE3_INPUT_TYPES = ["(address,bool,bytes)[]"]
+AGGREGATE3_OUTPUT_TYPES = ["(bool,bytes)[]"]
+
+# Chunk limits keep a single eth_call below the node gas cap and the request size limits of the providers
+MULTICALL_MAX_CALLS = int(os.getenv("MULTICALL_MAX_CALLS", 500))
+MULTICALL_MAX_CALLDATA_BYTES = int(os.getenv("MULTICALL_MAX_CALLDATA_BYTES", 64 * 1024))
+
+
+@dataclass(frozen=True)
+class MulticallItem:
+    """
+    A single view call to be packed into the aggregate call.
+
+    `method` is a brownie contract method, e.g. `contracts.lido.getTotalShares`.
+    A failed item is returned as `None` unless `allow_failure` is unset,
+    in which case the whole aggregate call reverts.
+    """
+
+    method: Any
+    args: Tuple = ()
+    allow_failure: bool = True
+    calldata: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "calldata", self.function.encode_input(*self.args))
+
+    @property
+    def function(self):
+        # OverloadedMethod picks the function by the arguments count
+        if hasattr(self.method, "_get_fn_from_args"):
+            return self.method._get_fn_from_args(self.args)
+        return self.method
+
+    @property
+    def target(self) -> str:
+        return self.method._address
+
+    @property
+    def size(self) -> int:
+        # 20 bytes address, 32 bytes flag word and the padded calldata with its offset and length words
+        return 20 + 32 + 64 + (len(HexBytes(self.calldata)) + 31) // 32 * 32
+
+    def decode(self, success: bool, return_data: bytes) -> Any:
+        # an empty successful result means there is no code at the target
+        if not success or not return_data:
+            return None
+        return self.function.decode_output(HexBytes(return_data).hex())
+
+
+def chunk_items(
+    items: Sequence[MulticallItem],
+    max_calls: int = MULTICALL_MAX_CALLS,
+    max_calldata_bytes: int = MULTICALL_MAX_CALLDATA_BYTES,
+) -> Iterator[Sequence[MulticallItem]]:
+    start, size = 0, 0
+    for index, item in enumerate(items):
+        if index > start and (index - start >= max_calls or size + item.size > max_calldata_bytes):
+            yield items[start:index]
+            start, size = index, 0
+        size += item.size
+    if start < len(items):
+        yield items[start:]
+
+
+def aggregate(
+    items: Sequence[MulticallItem],
+    block_identifier: Optional[Union[int, str]] = None,
+    max_calls: int = MULTICALL_MAX_CALLS,
+    max_calldata_bytes: int = MULTICALL_MAX_CALLDATA_BYTES,
+) -> List[Any]:
+    """
+    Runs the view calls via Multicall3 `aggregate3` and returns the decoded results in the items order.
+
+    All the chunks are executed at the same block, the latest one if `block_identifier` is not given.
+    """
+    if not items:
+        return []
+    if block_identifier is None:
+        block_identifier = web3.eth.block_number
+
+    results = []
+    for chunk in chunk_items(items, max_calls, max_calldata_bytes):
+        calls = [(item.target, item.allow_failure, HexBytes(item.calldata)) for item in chunk]
+        data = AGGREGATE3_SELECTOR + eth_abi.encode(AGGREGATE3_INPUT_TYPES, [calls]).hex()
+        output = web3.eth.call({"to": MULTICALL3_ADDRESS, "data": data}, block_identifier)
+        (returned,) = eth_abi.decode(AGGREGATE3_OUTPUT_TYPES, HexBytes(output))
+        results.extend(item.decode(success, return_data) for item, (success, return_data) in zip(chunk, returned))
+    return results
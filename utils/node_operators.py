@@ -2,6 +2,7 @@ from typing import Tuple
 from utils.evm_script import encode_call_script
 
 from utils.config import contracts
+from utils.node_operators_reader import read_node_operators
 
 
 def encode_set_node_operator_staking_limit(id, limit, registry):
@@ -35,7 +36,8 @@ def encode_set_node_operator_reward_address(id, rewardAddress, registry):
 
 
 def get_node_operators(registry):
-    return [{**registry.getNodeOperator(i, True), **{'index': i}} for i in range(registry.getNodeOperatorsCount())]
+    operators = read_node_operators(registry, summaries=False).operators
+    return [{**operator, **{'index': i}} for i, operator in enumerate(operators.rows())]
 
 
 def _encode_add_operator(address, name, registry):
@@ -0,0 +1,45 @@
+from typing import Dict, NamedTuple, Optional
+
+from brownie import web3
+
+from utils.column_table import ColumnTable
+from utils.multicall import MulticallItem, aggregate
+
+
+class NodeOperatorsState(NamedTuple):
+    block: int
+    operators: ColumnTable
+    summaries: ColumnTable
+
+
+def read_node_operators(registry, block: Optional[int] = None, summaries: bool = True) -> NodeOperatorsState:
+    """
+    Reads all the node operators of the NodeOperatorsRegistry (curated module, SimpleDVT)
+    or CSModule at the same block with a few Multicall3 calls.
+
+    `operators` are the `getNodeOperator` results, `summaries` are the `getNodeOperatorSummary` ones.
+    """
+    if block is None:
+        block = web3.eth.block_number
+    count = registry.getNodeOperatorsCount(block_identifier=block)
+
+    # NodeOperatorsRegistry.getNodeOperator(id, fullInfo), CSModule.getNodeOperator(id)
+    full_info = (True,) if len(registry.getNodeOperator.abi["inputs"]) == 2 else ()
+    items = [MulticallItem(registry.getNodeOperator, (id, *full_info), allow_failure=False) for id in range(count)]
+    if summaries:
+        items += [MulticallItem(registry.getNodeOperatorSummary, (id,), allow_failure=False) for id in range(count)]
+
+    results = [result.dict() for result in aggregate(items, block)]
+    return NodeOperatorsState(
+        block,
+        ColumnTable(results[:count], _output_types(registry.getNodeOperator)),
+        ColumnTable(results[count:], _output_types(registry.getNodeOperatorSummary) if summaries else None),
+    )
+
+
+def _output_types(method) -> Dict[str, str]:
+    outputs = method.abi["outputs"]
+    # CSModule.getNodeOperator returns a single struct
+    if len(outputs) == 1 and outputs[0]["type"] == "tuple":
+        outputs = outputs[0]["components"]
+    return {output["name"]: output["type"] for output in outputs}
@@ -0,0 +1,239 @@
+"""
+Caching JSON-RPC proxy between a local fork node and the upstream node.
+
+The responses that can't change once the block is fixed are stored on disk and served
+without the upstream on the next runs. Usage:
+
+    python -m utils.rpc_cache_proxy --upstream $ETH_RPC_URL --port 8549 --block-number 22000000
+    npx hardhat node --fork http://127.0.0.1:8549
+
+With `--block-number` the proxy answers `eth_blockNumber` with the given value,
+so the forks started against it are pinned to the same block and reuse the cache.
+`--block-step` pins them to the latest upstream block rounded down to the step instead.
+
+A command given after `--` is run with ETH_RPC_URL pointed at the proxy, which stops when the command exits:
+
+    python -m utils.rpc_cache_proxy --upstream $ETH_RPC_URL --block-step 7200 -- brownie test --network mfh-1
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from utils.cache import get_cache_directory
+
+# Methods with the results fixed by the block param, mapped to the position of the param
+BLOCK_PARAM_POSITIONS = {
+    "eth_getStorageAt": 2,
+    "eth_getCode": 1,
+    "eth_getBalance": 1,
+    "eth_getTransactionCount": 1,
+    "eth_getBlockByNumber": 0,
+}
+DEFAULT_PORT = int(os.getenv("RPC_CACHE_PORT", 8549))
+
+
+class RpcResponseCache:
+    """
+    SQLite storage of the JSON-RPC results keyed by the request method and params,
+    the chain ids of the upstreams are stored along with them.
+    """
+
+    def __init__(self, path: str):
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, result TEXT)")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS chain_ids (upstream TEXT PRIMARY KEY, chain_id TEXT)")
+        self.connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(chain_id: str, method: str, params: List) -> str:
+        return hashlib.sha256(json.dumps([chain_id, method, params], sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self.lock:
+            row = self.connection.execute("SELECT result FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key: str, result: Any) -> None:
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO responses VALUES (?, ?)", (key, json.dumps(result)))
+
+    def get_chain_id(self, upstream: str) -> Optional[str]:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT chain_id FROM chain_ids WHERE upstream = ?", (_upstream_key(upstream),)
+            ).fetchone()
+            return None if row is None else row[0]
+
+    def put_chain_id(self, upstream: str, chain_id: str) -> None:
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO chain_ids VALUES (?, ?)", (_upstream_key(upstream), chain_id)
+            )
+
+
+def _upstream_key(upstream: str) -> str:
+    # the upstream URLs usually hold the API keys, so only their hashes are stored
+    return hashlib.sha256(upstream.encode()).hexdigest()
+
+
+def is_cacheable(method: str, params: List) -> bool:
+    if method == "eth_chainId":
+        return True
+    position = BLOCK_PARAM_POSITIONS.get(method)
+    if position is None or len(params) <= position:
+        return False
+
+    block = params[position]
+    # a block hash object (EIP-1898) or a block number, but not a tag
+    return isinstance(block, dict) or (isinstance(block, str) and block.startswith("0x"))
+
+
+class RpcCacheProxy:
+    def __init__(self, upstream: str, cache: RpcResponseCache, block_number: Optional[int] = None):
+        self.upstream = upstream
+        self.cache = cache
+        self.block_number = block_number
+        self.sessions = threading.local()
+        # the upstream is asked only the first time, so the proxy starts offline with a warm cache
+        self.chain_id = cache.get_chain_id(upstream)
+        if self.chain_id is None:
+            request = {"jsonrpc": "2.0", "id": 0, "method": "eth_chainId", "params": []}
+            self.chain_id = self._forward([request])[0]["result"]
+            cache.put_chain_id(upstream, self.chain_id)
+
+    def upstream_block_number(self) -> int:
+        request = {"jsonrpc": "2.0", "id": 0, "method": "eth_blockNumber", "params": []}
+        return int(self._forward([request])[0]["result"], 16)
+
+    def handle(self, payload: Any) -> Any:
+        requests_batch = payload if isinstance(payload, list) else [payload]
+
+        responses: Dict[int, Dict] = {}
+        to_forward = []
+        for position, request in enumerate(requests_batch):
+            response = self._local_response(request)
+            if response is None:
+                to_forward.append((position, request))
+            else:
+                responses[position] = response
+
+        if to_forward:
+            forwarded = self._forward([request for _, request in to_forward])
+            forwarded_by_id = {response.get("id"): response for response in forwarded}
+            for position, request in to_forward:
+                response = forwarded_by_id[request.get("id")]
+                responses[position] = response
+                if "error" not in response and is_cacheable(request["method"], request.get("params", [])):
+                    self.cache.put(self._key(request), response["result"])
+
+        result = [responses[position] for position in range(len(requests_batch))]
+        return result if isinstance(payload, list) else result[0]
+
+    def _local_response(self, request: Dict) -> Optional[Dict]:
+        method, params = request.get("method"), request.get("params", [])
+        if method == "eth_blockNumber" and self.block_number is not None:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "result": hex(self.block_number)}
+        if not is_cacheable(method, params):
+            return None
+
+        result = self.cache.get(self._key(request))
+        if result is None:
+            return None
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+    def _key(self, request: Dict) -> str:
+        return self.cache.key(self.chain_id, request["method"], request.get("params", []))
+
+    def _forward(self, batch: List[Dict]) -> List[Dict]:
+        session = getattr(self.sessions, "session", None)
+        if session is None:
+            session = self.sessions.session = requests.Session()
+
+        response = session.post(self.upstream, json=batch, timeout=120)
+        response.raise_for_status()
+        body = response.json()
+        # some providers answer a batch with a single error object
+        if not isinstance(body, list):
+            body = [session.post(self.upstream, json=request, timeout=120).json() for request in batch]
+        return body
+
+
+def make_handler(proxy: RpcCacheProxy):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                body = json.dumps(proxy.handle(payload)).encode()
+                self.send_response(200)
+            except Exception as err:
+                body = json.dumps({"jsonrpc": "2.0", "id": None, "error": {"code": -32603, "message": str(err)}})
+                body = body.encode()
+                self.send_response(500)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def make_rpc_response_cache(name: str = "responses") -> RpcResponseCache:
+    return RpcResponseCache(os.path.join(get_cache_directory("rpc_cache"), f"{name}.sqlite"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Caching JSON-RPC proxy for the fork nodes")
+    parser.add_argument("--upstream", default=os.getenv("ETH_RPC_URL"), help="upstream node URL")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--block-number", type=int, default=None, help="block number to answer eth_blockNumber with")
+    parser.add_argument("--block-step", type=int, default=None, help="pin to the latest block rounded down to the step")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="command to run with ETH_RPC_URL set to the proxy")
+    args = parser.parse_args()
+    if not args.upstream:
+        parser.error("upstream node URL is not set")
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+
+    cache = make_rpc_response_cache()
+    proxy = RpcCacheProxy(args.upstream, cache, args.block_number)
+    if proxy.block_number is None and args.block_step:
+        proxy.block_number = proxy.upstream_block_number() // args.block_step * args.block_step
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(proxy))
+    url = f"http://127.0.0.1:{args.port}"
+    pinned = f" at block {proxy.block_number}" if proxy.block_number is not None else ""
+    print(f"Serving the cached {args.upstream} on {url}{pinned}")
+    returncode = 0
+    try:
+        if command:
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            returncode = subprocess.run(command, env={**os.environ, "ETH_RPC_URL": url}).returncode
+        else:
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Cache hits: {cache.hits}, misses: {cache.misses}")
+    sys.exit(returncode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import glob
+import hashlib
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from brownie import web3
+from brownie.convert.utils import build_function_selector
+from eth_utils import to_checksum_address
+
+from utils.cache import get_cache_directory
+
+# bytes32(uint256(keccak256("eip1967.proxy.implementation")) - 1)
+EIP1967_IMPLEMENTATION_SLOT = "0x360894a13ba1a3210667c828492db98dca3e2076cc3735a920a3ca505d382bbc"
+# implementation() of the Aragon AppProxy contracts
+IMPLEMENTATION_SELECTOR = "0x5c60da1b"
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+def get_implementation_address(address: str) -> str:
+    """
+    Returns the implementation the proxy at `address` currently points to or the zero address.
+
+    Both the EIP-1967 implementation slot (OssifiableProxy, OZ proxies) and the
+    Aragon `implementation()` getter are checked.
+    """
+    slot_value = web3.eth.get_storage_at(address, EIP1967_IMPLEMENTATION_SLOT)
+    if int.from_bytes(slot_value, "big") != 0:
+        return to_checksum_address(slot_value[-20:])
+
+    try:
+        result = web3.eth.call({"to": address, "data": IMPLEMENTATION_SELECTOR})
+    except Exception:
+        return ZERO_ADDRESS
+
+    if len(result) != 32 or int.from_bytes(result[:12], "big") != 0:
+        return ZERO_ADDRESS
+    return to_checksum_address(result[-20:])
+
+
+class SelectorCache:
+    """
+    On-disk selector -> ABI fragment index used to decode calls without explorer round trips.
+
+    Every index is keyed by (chain id, address, implementation address) and stored in the file
+    named by the hash of that key, so an upgraded proxy automatically gets a fresh index while
+    the old one is left untouched. The implementation is read once per (chain id, address) until
+    `forget_implementations()`, which every script decoding calls first, so a proxy upgraded by
+    an enacted vote is seen by the next decoding. Missing selectors are looked up in the local
+    `interfaces` ABIs before reporting a miss.
+
+    The cache is safe to share between the threads resolving ABIs concurrently.
+    """
+
+    def __init__(self, directory: str, interfaces_directory: str):
+        self.directory = directory
+        self.interfaces_directory = interfaces_directory
+        self.hits = 0
+        self.interface_hits = 0
+        self.misses = 0
+        self._indexes: Dict[Tuple[int, str, str], Dict[str, dict]] = {}
+        self._implementations: Dict[Tuple[int, str], str] = {}
+        self._interfaces_index: Optional[Dict[str, List[dict]]] = None
+        self._lock = threading.Lock()
+
+    def get(self, address: str, selector: str) -> Optional[dict]:
+        key = self._key(address)
+        with self._lock:
+            index = self._load_index(key)
+
+            if selector in index:
+                self.hits += 1
+                return index[selector]
+
+            fragment = self._find_in_interfaces(selector)
+            if fragment is not None:
+                self.interface_hits += 1
+                index[selector] = fragment
+                self._save_index(key, index)
+                return fragment
+
+            self.misses += 1
+            return None
+
+    def put(self, address: str, abi: List[dict]) -> None:
+        key = self._key(address)
+        with self._lock:
+            index = self._load_index(key)
+            index.update(
+                {build_function_selector(fragment): fragment for fragment in abi if fragment.get("type") == "function"}
+            )
+            self._save_index(key, index)
+
+    def forget_implementations(self) -> None:
+        with self._lock:
+            self._implementations.clear()
+
+    def stats(self) -> str:
+        return f"selector cache: {self.hits} hits, {self.interface_hits} interface hits, {self.misses} misses"
+
+    def _key(self, address: str) -> Tuple[int, str, str]:
+        address = to_checksum_address(address)
+        chain_id = web3.chain_id
+        implementation_key = (chain_id, address)
+        if implementation_key not in self._implementations:
+            self._implementations[implementation_key] = get_implementation_address(address)
+        return chain_id, address, self._implementations[implementation_key]
+
+    def _path(self, key: Tuple[int, str, str]) -> str:
+        digest = hashlib.sha256(":".join(map(str, key)).encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def _load_index(self, key: Tuple[int, str, str]) -> Dict[str, dict]:
+        if key not in self._indexes:
+            path = self._path(key)
+            index = {}
+            if os.path.exists(path):
+                with open(path) as fp:
+                    index = json.load(fp)["selectors"]
+            self._indexes[key] = index
+        return self._indexes[key]
+
+    def _save_index(self, key: Tuple[int, str, str], index: Dict[str, dict]) -> None:
+        chain_id, address, implementation = key
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump(
+                {"chainId": chain_id, "address": address, "implementation": implementation, "selectors": index},
+                fp,
+                sort_keys=True,
+            )
+        os.replace(tmp_path, path)
+
+    def _find_in_interfaces(self, selector: str) -> Optional[dict]:
+        if self._interfaces_index is None:
+            self._interfaces_index = self._build_interfaces_index()
+
+        fragments = self._interfaces_index.get(selector, [])
+        # Several interfaces may declare the same function with different argument names,
+        # such a selector is left to the explorer to resolve.
+        return fragments[0] if len(fragments) == 1 else None
+
+    def _build_interfaces_index(self) -> Dict[str, List[dict]]:
+        index = defaultdict(list)
+        for path in sorted(glob.glob(os.path.join(self.interfaces_directory, "**", "*.json"), recursive=True)):
+            with open(path) as fp:
+                abi = json.load(fp)
+            if not isinstance(abi, list):
+                continue
+            for fragment in abi:
+                if fragment.get("type") != "function":
+                    continue
+                selector = build_function_selector(fragment)
+                if all(_arguments(fragment) != _arguments(known) for known in index[selector]):
+                    index[selector].append(fragment)
+        return index
+
+
+def _arguments(fragment: dict) -> List[Tuple[str, str]]:
+    return [(arg.get("name", ""), arg.get("internalType", arg["type"])) for arg in fragment["inputs"]]
+
+
+def make_selector_cache(interfaces_directory: str) -> SelectorCache:
+    return SelectorCache(get_cache_directory("selectors"), interfaces_directory)
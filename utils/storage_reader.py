@@ -0,0 +1,161 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from brownie import web3
+from eth_utils import to_checksum_address
+from hexbytes import HexBytes
+from web3 import Web3
+from web3._utils.request import make_post_request
+
+# Runtime code returning SLOAD of every 32 bytes word of the calldata:
+#   i = 0; while (i < calldatasize) { mstore(i, sload(calldataload(i))); i += 32 } return(0, calldatasize)
+SLOT_DUMPER_CODE = "0x60005b368110600d57366000f35b8035548152602001600256"
+# Max slots read by a single dumper eth_call
+STORAGE_DUMP_MAX_SLOTS = int(os.getenv("STORAGE_DUMP_MAX_SLOTS", 1024))
+# Max requests packed into a single JSON-RPC batch
+STORAGE_BATCH_SIZE = int(os.getenv("STORAGE_BATCH_SIZE", 100))
+
+Slot = Tuple[str, int]
+
+
+class StorageReader:
+    """
+    Reads many storage slots in a few JSON-RPC round trips.
+
+    The slots of every contract are dumped by a single `eth_call` with the contract code
+    replaced by `SLOT_DUMPER_CODE` via the state override, and the calls for all the contracts
+    are sent as one JSON-RPC batch. If the node does not support the state override,
+    the slots are read by `eth_getStorageAt` requests packed into batches.
+
+    The batches are posted to the HTTP provider endpoint with the provider request kwargs (headers, auth,
+    timeout) and session, the other providers get the requests one by one with `make_request`.
+    """
+
+    def __init__(self, batch_size: int = STORAGE_BATCH_SIZE):
+        # the node the state override support is known for
+        self.endpoint_uri = getattr(web3.provider, "endpoint_uri", None)
+        self.batch_size = batch_size
+        # None until the first dumper call tells whether the node supports the state override
+        self.state_override: Optional[bool] = None
+
+    def read(self, slots: Sequence[Slot], block: Optional[int] = None) -> List[HexBytes]:
+        """Returns the values of the (address, position) slots in the same order"""
+        if not slots:
+            return []
+        slots = [(to_checksum_address(address), position) for address, position in slots]
+
+        if self.state_override is not False:
+            try:
+                values = self._read_with_dumper(slots, block)
+                self.state_override = True
+                return values
+            except ValueError:
+                if self.state_override:
+                    raise
+                self.state_override = False
+
+        return self._read_with_get_storage_at(slots, block)
+
+    def read_arrays(self, arrays: Sequence[Slot], block: Optional[int] = None) -> List[List[HexBytes]]:
+        """Returns the elements of the dynamic arrays of 32 bytes values stored at the (address, position) slots"""
+        lengths = [Web3.to_int(length) for length in self.read(arrays, block)]
+        elements = self.read(
+            [
+                (address, array_data_position(position) + index)
+                for (address, position), length in zip(arrays, lengths)
+                for index in range(length)
+            ],
+            block,
+        )
+
+        result, offset = [], 0
+        for length in lengths:
+            result.append(elements[offset : offset + length])
+            offset += length
+        return result
+
+    def _read_with_dumper(self, slots: Sequence[Slot], block: Optional[int]) -> List[HexBytes]:
+        positions_by_address: Dict[str, List[int]] = {}
+        for address, position in slots:
+            positions_by_address.setdefault(address, []).append(position)
+
+        calls, keys = [], []
+        for address, positions in positions_by_address.items():
+            for start in range(0, len(positions), STORAGE_DUMP_MAX_SLOTS):
+                chunk = positions[start : start + STORAGE_DUMP_MAX_SLOTS]
+                data = "0x" + b"".join(position.to_bytes(32, "big") for position in chunk).hex()
+                calls.append(
+                    (
+                        "eth_call",
+                        [{"to": address, "data": data}, _block_param(block), {address: {"code": SLOT_DUMPER_CODE}}],
+                    )
+                )
+                keys.append([(address, position) for position in chunk])
+
+        values: Dict[Slot, HexBytes] = {}
+        for chunk_keys, result in zip(keys, self._batch(calls)):
+            output = HexBytes(result)
+            if len(output) != 32 * len(chunk_keys):
+                raise ValueError(f"Unexpected slot dumper output length {len(output)}")
+            for index, key in enumerate(chunk_keys):
+                values[key] = HexBytes(output[32 * index : 32 * (index + 1)])
+
+        return [values[slot] for slot in slots]
+
+    def _read_with_get_storage_at(self, slots: Sequence[Slot], block: Optional[int]) -> List[HexBytes]:
+        results = self._batch(
+            [("eth_getStorageAt", [address, hex(position), _block_param(block)]) for address, position in slots]
+        )
+        return [HexBytes(HexBytes(result).rjust(32, b"\x00")) for result in results]
+
+    def _batch(self, calls: Sequence[Tuple[str, list]]) -> List[Any]:
+        provider = web3.provider
+        if getattr(provider, "endpoint_uri", None) is None or not hasattr(provider, "get_request_kwargs"):
+            return [_unwrap(provider.make_request(method, params)) for method, params in calls]
+
+        results = []
+        for start in range(0, len(calls), self.batch_size):
+            chunk = calls[start : start + self.batch_size]
+            payload = [
+                {"jsonrpc": "2.0", "id": index, "method": method, "params": params}
+                for index, (method, params) in enumerate(chunk)
+            ]
+            body = post_batch(provider, payload)
+            if not isinstance(body, list):
+                # the node does not serve batches, send the requests one by one
+                results.extend(_unwrap(provider.make_request(method, params)) for method, params in chunk)
+                continue
+            responses = {item["id"]: item for item in body}
+            results.extend(_unwrap(responses[index]) for index in range(len(chunk)))
+        return results
+
+
+def post_batch(provider, payload: List[Dict]) -> Any:
+    """Posts the JSON-RPC batch the same way the HTTP provider posts its requests"""
+    return json.loads(make_post_request(provider.endpoint_uri, json.dumps(payload), **provider.get_request_kwargs()))
+
+
+def array_data_position(position: int) -> int:
+    """Position of the first element of the dynamic array stored at the slot"""
+    return Web3.to_int(Web3.keccak(position.to_bytes(32, "big")))
+
+
+def _block_param(block: Optional[int]) -> str:
+    return "latest" if block is None else hex(block)
+
+
+def _unwrap(response: Dict) -> Any:
+    if "error" in response:
+        raise ValueError(response["error"])
+    return response["result"]
+
+
+_storage_reader: Optional[StorageReader] = None
+
+
+def get_storage_reader() -> StorageReader:
+    global _storage_reader
+    if _storage_reader is None or _storage_reader.endpoint_uri != getattr(web3.provider, "endpoint_uri", None):
+        _storage_reader = StorageReader()
+    return _storage_reader
@@ -0,0 +1,256 @@
+import os
+from typing import Any, NamedTuple, Optional, Sequence
+
+from brownie import web3
+
+from utils.config import contracts
+from utils.finalization_batches import E27_PRECISION_BASE, WithdrawalRequests, read_withdrawal_requests
+from utils.multicall import MulticallItem, aggregate
+
+# Compare every locally simulated report used by the helpers with the contract simulation
+ACCOUNTING_MODEL_CROSS_CHECK = bool(os.getenv("ACCOUNTING_MODEL_CROSS_CHECK"))
+
+DEPOSIT_SIZE = 32 * 10**18
+SHARE_RATE_PRECISION = 10**27
+# PositiveTokenRebaseLimiter constants
+LIMITER_PRECISION_BASE = 10**9
+UNLIMITED_REBASE = 2**64 - 1
+
+
+class AccountingState(NamedTuple):
+    """Pre-report protocol state the report is simulated on"""
+
+    cl_validators: int
+    cl_balance: int
+    total_pooled_ether: int
+    total_shares: int
+    external_shares: int
+    external_ether: int
+    bad_debt_to_internalize: int
+    max_positive_token_rebase: int
+    total_fee: int
+    fee_precision_points: int
+    cover_shares_to_burn: int
+    non_cover_shares_to_burn: int
+    withdrawal_queue_paused: bool
+    # unfinalized withdrawal requests, needed only to simulate the finalization batches
+    withdrawal_requests: Optional[WithdrawalRequests] = None
+
+
+class SimulatedReport(NamedTuple):
+    """The same values as the Accounting.simulateOracleReport() CalculatedValues, except the fee distribution"""
+
+    withdrawalsVaultTransfer: int
+    elRewardsVaultTransfer: int
+    etherToFinalizeWQ: int
+    sharesToFinalizeWQ: int
+    sharesToBurnForWithdrawals: int
+    totalSharesToBurn: int
+    sharesToMintAsFees: int
+    principalClBalance: int
+    preTotalShares: int
+    preTotalPooledEther: int
+    postInternalShares: int
+    postInternalEther: int
+    postTotalShares: int
+    postTotalPooledEther: int
+
+    @property
+    def share_rate(self) -> int:
+        return self.postTotalPooledEther * SHARE_RATE_PRECISION // self.postTotalShares
+
+
+def read_accounting_state(block: Optional[int] = None, withdrawal_requests: bool = False) -> AccountingState:
+    """Reads the Lido, Burner, WithdrawalQueue, VaultHub and the fee state with a single multicall"""
+    if block is None:
+        block = web3.eth.block_number
+    (
+        beacon_stat,
+        total_pooled_ether,
+        total_shares,
+        external_shares,
+        external_ether,
+        bad_debt_to_internalize,
+        max_positive_token_rebase,
+        rewards_distribution,
+        shares_requested_to_burn,
+        withdrawal_queue_paused,
+    ) = aggregate(
+        [
+            MulticallItem(method, allow_failure=False)
+            for method in (
+                contracts.lido.getBeaconStat,
+                contracts.lido.getTotalPooledEther,
+                contracts.lido.getTotalShares,
+                contracts.lido.getExternalShares,
+                contracts.lido.getExternalEther,
+                contracts.vault_hub.badDebtToInternalize,
+                contracts.oracle_report_sanity_checker.getMaxPositiveTokenRebase,
+                contracts.staking_router.getStakingRewardsDistribution,
+                contracts.burner.getSharesRequestedToBurn,
+                contracts.withdrawal_queue.isPaused,
+            )
+        ],
+        block,
+    )
+
+    return AccountingState(
+        cl_validators=beacon_stat["beaconValidators"],
+        cl_balance=beacon_stat["beaconBalance"],
+        total_pooled_ether=total_pooled_ether,
+        total_shares=total_shares,
+        external_shares=external_shares,
+        external_ether=external_ether,
+        bad_debt_to_internalize=bad_debt_to_internalize,
+        max_positive_token_rebase=max_positive_token_rebase,
+        total_fee=rewards_distribution["totalFee"],
+        fee_precision_points=rewards_distribution["precisionPoints"],
+        cover_shares_to_burn=shares_requested_to_burn[0],
+        non_cover_shares_to_burn=shares_requested_to_burn[1],
+        withdrawal_queue_paused=withdrawal_queue_paused,
+        withdrawal_requests=(
+            read_withdrawal_requests(contracts.withdrawal_queue, block) if withdrawal_requests else None
+        ),
+    )
+
+
+class TokenRebaseLimiter:
+    """PositiveTokenRebaseLimiter used by OracleReportSanityChecker.smoothenTokenRebase()"""
+
+    def __init__(self, rebase_limit: int, pre_total_pooled_ether: int, pre_total_shares: int):
+        if pre_total_pooled_ether == 0:
+            rebase_limit = UNLIMITED_REBASE
+        self.rebase_limit = rebase_limit
+        self.pre_total_pooled_ether = self.current_total_pooled_ether = pre_total_pooled_ether
+        self.pre_total_shares = pre_total_shares
+        self.max_total_pooled_ether = (
+            2**256 - 1
+            if rebase_limit == UNLIMITED_REBASE
+            else pre_total_pooled_ether + rebase_limit * pre_total_pooled_ether // LIMITER_PRECISION_BASE
+        )
+
+    def decrease_ether(self, amount: int) -> None:
+        if self.rebase_limit == UNLIMITED_REBASE:
+            return
+        if amount > self.current_total_pooled_ether:
+            raise ValueError("NegativeTotalPooledEther")
+        self.current_total_pooled_ether -= amount
+
+    def increase_ether(self, amount: int) -> int:
+        if self.rebase_limit == UNLIMITED_REBASE:
+            return amount
+        previous = self.current_total_pooled_ether
+        self.current_total_pooled_ether = min(previous + amount, self.max_total_pooled_ether)
+        return self.current_total_pooled_ether - previous
+
+    def shares_to_burn_limit(self) -> int:
+        if self.rebase_limit == UNLIMITED_REBASE:
+            return self.pre_total_shares
+        if self.current_total_pooled_ether >= self.max_total_pooled_ether:
+            return 0
+        rebase_limit_plus_1 = self.rebase_limit + LIMITER_PRECISION_BASE
+        pooled_ether_rate = self.current_total_pooled_ether * LIMITER_PRECISION_BASE // self.pre_total_pooled_ether
+        return self.pre_total_shares * (rebase_limit_plus_1 - pooled_ether_rate) // rebase_limit_plus_1
+
+
+def prefinalize(requests: WithdrawalRequests, batches: Sequence[int], max_share_rate: int):
+    """WithdrawalQueue.prefinalize(): the ether to lock and the shares to burn to finalize the batches"""
+    ether_to_lock, shares_to_burn, previous = 0, 0, 0
+    for batch_end in batches:
+        index = batch_end - requests.first_id
+        if index <= previous or index >= len(requests.cumulative_steth):
+            raise ValueError(f"InvalidRequestId({batch_end})")
+        steth = requests.cumulative_steth[index] - requests.cumulative_steth[previous]
+        shares = requests.cumulative_shares[index] - requests.cumulative_shares[previous]
+        if steth * E27_PRECISION_BASE // shares > max_share_rate:
+            ether_to_lock += shares * max_share_rate // E27_PRECISION_BASE
+        else:
+            ether_to_lock += steth
+        shares_to_burn += shares
+        previous = index
+    return ether_to_lock, shares_to_burn
+
+
+def simulate_oracle_report(
+    state: AccountingState,
+    *,
+    cl_validators: int,
+    cl_balance: int,
+    withdrawal_vault_balance: int,
+    el_rewards_vault_balance: int,
+    shares_requested_to_burn: int = 0,
+    withdrawal_finalization_batches: Sequence[int] = (),
+    simulated_share_rate: int = 0,
+) -> SimulatedReport:
+    """
+    Local version of Accounting.simulateOracleReport(), no calls to the node.
+
+    The vaults transfers and the shares to burn are limited by the max positive token rebase
+    on the internal ether and shares, the fees are minted only on the positive CL rebase.
+    https://github.com/lidofinance/core/blob/master/contracts/0.8.25/Accounting.sol
+    """
+    ether_to_finalize, shares_to_finalize = 0, 0
+    if withdrawal_finalization_batches and not state.withdrawal_queue_paused:
+        if state.withdrawal_requests is None:
+            raise ValueError("The state is read without the withdrawal requests")
+        (ether_to_finalize, shares_to_finalize) = prefinalize(
+            state.withdrawal_requests, withdrawal_finalization_batches, simulated_share_rate
+        )
+
+    principal_cl_balance = state.cl_balance + (cl_validators - state.cl_validators) * DEPOSIT_SIZE
+    pre_internal_ether = state.total_pooled_ether - state.external_ether
+    pre_internal_shares = state.total_shares - state.external_shares
+
+    # OracleReportSanityChecker.smoothenTokenRebase()
+    limiter = TokenRebaseLimiter(state.max_positive_token_rebase, pre_internal_ether, pre_internal_shares)
+    if cl_balance < principal_cl_balance:
+        limiter.decrease_ether(principal_cl_balance - cl_balance)
+    else:
+        limiter.increase_ether(cl_balance - principal_cl_balance)
+    withdrawals = limiter.increase_ether(withdrawal_vault_balance)
+    el_rewards = limiter.increase_ether(el_rewards_vault_balance)
+    shares_to_burn_for_withdrawals = min(limiter.shares_to_burn_limit(), shares_requested_to_burn)
+    limiter.decrease_ether(ether_to_finalize)
+    total_shares_to_burn = min(limiter.shares_to_burn_limit(), shares_to_finalize + shares_requested_to_burn)
+
+    internal_shares_before_fees = pre_internal_shares - total_shares_to_burn
+    post_internal_ether = (
+        pre_internal_ether + cl_balance + withdrawals - principal_cl_balance + el_rewards - ether_to_finalize
+    )
+
+    shares_to_mint_as_fees = 0
+    if cl_balance + withdrawals > principal_cl_balance:
+        total_rewards = cl_balance + withdrawals - principal_cl_balance + el_rewards
+        fee_ether = total_rewards * state.total_fee // state.fee_precision_points
+        shares_to_mint_as_fees = fee_ether * internal_shares_before_fees // (post_internal_ether - fee_ether)
+
+    post_internal_shares = internal_shares_before_fees + shares_to_mint_as_fees + state.bad_debt_to_internalize
+    post_external_shares = state.external_shares - state.bad_debt_to_internalize
+    post_total_shares = post_internal_shares + post_external_shares
+
+    return SimulatedReport(
+        withdrawalsVaultTransfer=withdrawals,
+        elRewardsVaultTransfer=el_rewards,
+        etherToFinalizeWQ=ether_to_finalize,
+        sharesToFinalizeWQ=shares_to_finalize,
+        sharesToBurnForWithdrawals=shares_to_burn_for_withdrawals,
+        totalSharesToBurn=total_shares_to_burn,
+        sharesToMintAsFees=shares_to_mint_as_fees,
+        principalClBalance=principal_cl_balance,
+        preTotalShares=state.total_shares,
+        preTotalPooledEther=state.total_pooled_ether,
+        postInternalShares=post_internal_shares,
+        postInternalEther=post_internal_ether,
+        postTotalShares=post_total_shares,
+        postTotalPooledEther=post_internal_ether + post_external_shares * post_internal_ether // post_internal_shares,
+    )
+
+
+def assert_matches_calculated_values(simulated: SimulatedReport, calculated_values: Any) -> None:
+    """Checks the local simulation against the Accounting.simulateOracleReport() result"""
+    mismatched = {
+        name: (value, calculated_values[name])
+        for name, value in simulated._asdict().items()
+        if value != calculated_values[name]
+    }
+    assert not mismatched, f"Local accounting model differs from the contract (local, contract): {mismatched}"
@@ -0,0 +1,157 @@
+import os
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from brownie import chain, web3
+
+from utils.multicall import MulticallItem, aggregate
+from utils.test.transaction_queue import TransactionQueue
+
+FRAME_CONFIG_SET_TOPIC = web3.keccak(text="FrameConfigSet(uint256,uint256)").hex()
+
+# Gas limit of a member report submission, the one reaching the consensus also passes the report to the oracle
+CONSENSUS_REPORT_GAS = int(os.getenv("CONSENSUS_REPORT_GAS", 500_000))
+
+
+class ConsensusConfig(NamedTuple):
+    """HashConsensus settings the oracle helpers need for every report"""
+
+    chain_config: Any  # (slotsPerEpoch, secondsPerSlot, genesisTime)
+    frame_config: Any  # (initialEpoch, epochsPerFrame, fastLaneLengthSlots)
+
+
+_consensus_configs: Dict[str, ConsensusConfig] = {}
+
+
+def get_consensus_config(consensus_contract) -> ConsensusConfig:
+    """
+    Reads the chain and frame configs of the HashConsensus once per session. The fast lane members
+    are not cached, the contract rotates them every frame.
+    """
+    if consensus_contract.address not in _consensus_configs:
+        (chain_config, frame_config) = aggregate(
+            [
+                MulticallItem(consensus_contract.getChainConfig, allow_failure=False),
+                MulticallItem(consensus_contract.getFrameConfig, allow_failure=False),
+            ]
+        )
+        _consensus_configs[consensus_contract.address] = ConsensusConfig(chain_config, frame_config)
+    return _consensus_configs[consensus_contract.address]
+
+
+def reset_consensus_config(consensus_contract: Optional[Any] = None) -> None:
+    """Drops the cached config of the HashConsensus, or of all of them, e.g. after the frame config is changed"""
+    if consensus_contract is None:
+        _consensus_configs.clear()
+    else:
+        _consensus_configs.pop(consensus_contract.address, None)
+
+
+def submit_consensus_reports(consensus_contract, slot, report, version, silent=False) -> str:
+    """
+    Sends the report of every fast lane member to the HashConsensus (AO, VEBO or CSM one) without waiting
+    for the receipts, mines them at once and checks the consensus is reached. Returns the first member.
+    """
+    (members, *_) = consensus_contract.getFastLaneMembers()
+    queue = TransactionQueue()
+    for member in members:
+        if not silent:
+            print(f"Member ${member} submitting report to hashConsensus")
+        queue.add(consensus_contract.submitReport, (slot, report, version), member, CONSENSUS_REPORT_GAS)
+
+    queue.send()
+    (_, hash_, _) = consensus_contract.getConsensusState()
+    assert hash_ == report.hex(), "HashConsensus points to unexpected report"
+    return members[0]
+
+
+class FrameClock:
+    """
+    HashConsensus frames computed locally the same way the contract does. The current time is the later
+    of `chain.time()` and the latest block timestamp, hardhat moves every block at least a second forward
+    so the blocks may run ahead of the brownie clock.
+
+    The chain config is immutable, the frame config is read again only if the contract
+    has emitted FrameConfigSet since the last check or the checked block is gone, i.e.
+    the chain was reverted below it or reverted and mined again up to the same height.
+    """
+
+    def __init__(self, consensus_contract):
+        self.consensus_contract = consensus_contract
+        (self.slots_per_epoch, self.seconds_per_slot, self.genesis_time) = get_consensus_config(
+            consensus_contract
+        ).chain_config
+        self._read_frame_config(web3.eth.block_number)
+
+    def slot_timestamp(self, slot: int) -> int:
+        return self.genesis_time + slot * self.seconds_per_slot
+
+    def frame_index_at(self, timestamp: int) -> int:
+        """Index of the frame at the timestamp, the frames before the initial epoch are negative"""
+        epoch = (timestamp - self.genesis_time) // self.seconds_per_slot // self.slots_per_epoch
+        return (epoch - self.initial_epoch) // self.epochs_per_frame
+
+    def frame(self, index: int) -> Tuple[int, int]:
+        """(refSlot, reportProcessingDeadlineSlot) of the frame, as `getCurrentFrame` returns them"""
+        start_slot = (self.initial_epoch + index * self.epochs_per_frame) * self.slots_per_epoch
+        return (start_slot - 1, start_slot + self.epochs_per_frame * self.slots_per_epoch - 1)
+
+    def current_frame(self) -> Tuple[int, int]:
+        self.refresh()
+        return self.frame(self.frame_index_at(self.now()))
+
+    def wait_next_frame(self) -> Tuple[int, int]:
+        """
+        Mines a single block at the first slot of the frame following the current one
+        (or the first frame if the initial epoch is yet to arrive) and returns that frame.
+        """
+        self.refresh()
+        index = max(self.frame_index_at(self.now()), 0) + 1
+        (ref_slot, deadline_slot) = self.frame(index)
+        chain.mine(timestamp=self.slot_timestamp(ref_slot + 1))
+        (current_ref_slot, _) = self.consensus_contract.getCurrentFrame()
+        assert current_ref_slot == ref_slot, "should be next frame"
+        return (ref_slot, deadline_slot)
+
+    def now(self) -> int:
+        return max(chain.time(), web3.eth.get_block("latest")["timestamp"])
+
+    def refresh(self) -> None:
+        block = web3.eth.block_number
+        if block < self.checked_block or _block_hash(self.checked_block) != self.checked_block_hash:
+            self._read_frame_config(block, reset=True)
+        elif block > self.checked_block:
+            logs = web3.eth.get_logs(
+                {
+                    "address": self.consensus_contract.address,
+                    "topics": [FRAME_CONFIG_SET_TOPIC],
+                    "fromBlock": self.checked_block + 1,
+                    "toBlock": block,
+                }
+            )
+            if logs:
+                self._read_frame_config(block, reset=True)
+            else:
+                self._set_checked_block(block)
+
+    def _read_frame_config(self, block: int, reset: bool = False) -> None:
+        if reset:
+            reset_consensus_config(self.consensus_contract)
+        (self.initial_epoch, self.epochs_per_frame, _) = get_consensus_config(self.consensus_contract).frame_config
+        self._set_checked_block(block)
+
+    def _set_checked_block(self, block: int) -> None:
+        self.checked_block = block
+        self.checked_block_hash = _block_hash(block)
+
+
+def _block_hash(block: int) -> bytes:
+    return web3.eth.get_block(block)["hash"]
+
+
+_frame_clocks: Dict[str, FrameClock] = {}
+
+
+def get_frame_clock(consensus_contract) -> FrameClock:
+    if consensus_contract.address not in _frame_clocks:
+        _frame_clocks[consensus_contract.address] = FrameClock(consensus_contract)
+    return _frame_clocks[consensus_contract.address]
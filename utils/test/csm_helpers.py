@@ -6,6 +6,8 @@ from utils.test.helpers import ETH
 from utils.test.keys_helpers import random_pubkeys_batch, random_signatures_batch
 from utils.config import contracts, CSM_COMMITTEE_MS, EASYTRACK_CS_SET_VETTED_GATE_TREE_FACTORY
 from utils.test.merkle_tree import ICSTree
+from utils.node_operators_reader import read_node_operators
+from utils.test.keys_upload import upload_csm_keys
 
 
 
@@ -66,32 +68,23 @@ def csm_add_ics_node_operator(csm, vetted_gate, accounting, node_operator, proof
 
 
 def csm_upload_keys(csm, accounting, no_id, keys_count=5):
-    manager_address = csm.getNodeOperator(no_id)["managerAddress"]
-    set_balance_in_wei(manager_address, accounting.getRequiredBondForNextKeys(no_id, keys_count) + ETH(1))
-
-    keys_batch = 100
-    remaining_keys = keys_count
-    while remaining_keys > 0:
-        keys_batch = min(keys_batch, remaining_keys)
-        pubkeys_batch = random_pubkeys_batch(keys_batch)
-        signatures_batch = random_signatures_batch(keys_batch)
-        value = accounting.getRequiredBondForNextKeys(no_id, keys_count)
-        address = csm.getNodeOperator(no_id)["managerAddress"]
-        csm.addValidatorKeysETH(address, no_id, keys_batch, pubkeys_batch, signatures_batch, {
-            "from": address,
-            "value": value
-        })
-        remaining_keys -= keys_batch
+    upload_csm_keys(csm, accounting, {no_id: keys_count})
 
 
 def fill_csm_operators_with_keys(target_operators_count, keys_count):
-    csm_node_operators_before = contracts.csm.getNodeOperatorsCount()
+    operators = read_node_operators(contracts.csm, summaries=False).operators
+    csm_node_operators_before = len(operators)
     added_operators_count = 0
-    for no_id in range(0, min(csm_node_operators_before, target_operators_count)):
-        depositable_keys = contracts.csm.getNodeOperator(no_id)["depositableValidatorsCount"]
-        if depositable_keys < keys_count:
-            csm_upload_keys(contracts.csm, contracts.cs_accounting, no_id, keys_count - depositable_keys)
-            assert contracts.csm.getNodeOperator(no_id)["depositableValidatorsCount"] == keys_count
+    depositable = operators["depositableValidatorsCount"] if operators else []
+    missing_keys = {
+        no_id: keys_count - depositable[no_id]
+        for no_id in range(0, min(csm_node_operators_before, target_operators_count))
+        if depositable[no_id] < keys_count
+    }
+    if missing_keys:
+        upload_csm_keys(contracts.csm, contracts.cs_accounting, missing_keys)
+        depositable_after = read_node_operators(contracts.csm, summaries=False).operators["depositableValidatorsCount"]
+        assert all(depositable_after[no_id] == keys_count for no_id in missing_keys)
     while csm_node_operators_before + added_operators_count < target_operators_count:
         node_operator = f"0xbb{str(added_operators_count).zfill(38)}"
         csm_add_node_operator(contracts.csm, contracts.cs_permissionless_gate, contracts.cs_accounting, node_operator,
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Tuple, NewType
+from typing import Iterator, NamedTuple, Sequence, Tuple, NewType, Union
 
 StakingModuleId = NewType('StakingModuleId', int)
 NodeOperatorId = NewType('NodeOperatorId', int)
@@ -16,6 +16,15 @@ MODULE_ID_LENGTH = 3
 NODE_OPERATOR_ID_LENGTH = 5
 VALIDATOR_INDEX_LENGTH = 8
 VALIDATOR_PUB_KEY_LENGTH = 48
+EXIT_REQUEST_HEADER_LENGTH = MODULE_ID_LENGTH + NODE_OPERATOR_ID_LENGTH + VALIDATOR_INDEX_LENGTH
+EXIT_REQUEST_LENGTH = EXIT_REQUEST_HEADER_LENGTH + VALIDATOR_PUB_KEY_LENGTH
+
+
+class ExitRequestRecord(NamedTuple):
+    module_id: int
+    node_operator_id: int
+    validator_index: int
+    pubkey: memoryview
 
 
 def encode_data(
@@ -29,26 +38,93 @@ def encode_data(
     |  moduleId  |  nodeOpId  |  validatorIndex  | validatorPubkey |
     """
 
-    if sort:
-        validators = sort_validators_to_eject(validators_to_eject)
-    else:
-        validators = validators_to_eject
-
-    result = b""
-
-    for (module_id, op_id), validator in validators:
-        result += module_id.to_bytes(MODULE_ID_LENGTH, "big")
-        result += op_id.to_bytes(NODE_OPERATOR_ID_LENGTH, "big")
-        result += int(validator.index).to_bytes(VALIDATOR_INDEX_LENGTH, "big")
+    result = encode_exit_requests(
+        [module_id for (module_id, _), _ in validators_to_eject],
+        [op_id for (_, op_id), _ in validators_to_eject],
+        [int(validator.index) for _, validator in validators_to_eject],
+        [validator.pubkey for _, validator in validators_to_eject],
+        sort=sort,
+    )
 
-        pubkey_bytes = bytes.fromhex(str(validator.pubkey)[2:])
+    return result, DATA_FORMAT_LIST
 
-        if len(pubkey_bytes) != VALIDATOR_PUB_KEY_LENGTH:
-            raise ValueError(f'Unexpected size of validator pub key. Pub key size: {len(validator.pubkey)}')
 
-        result += pubkey_bytes
+def encode_exit_requests(
+    module_ids: Sequence[int],
+    node_operator_ids: Sequence[int],
+    validator_indices: Sequence[int],
+    pubkeys: Sequence[Union[str, bytes]],
+    sort: bool = True,
+) -> bytes:
+    """
+    Encodes the exit requests given as the parallel columns into the Exit Bus data format.
 
-    return result, DATA_FORMAT_LIST
+    The module id, node operator id and validator index form the 16 bytes record header,
+    so the records are sorted by the header value and written at the fixed offsets.
+    """
+    count = len(module_ids)
+    if not count == len(node_operator_ids) == len(validator_indices) == len(pubkeys):
+        raise ValueError("Exit requests columns have different lengths")
+
+    headers = [
+        _exit_request_header(module_id, op_id, int(validator_index))
+        for module_id, op_id, validator_index in zip(module_ids, node_operator_ids, validator_indices)
+    ]
+    pubkeys_data = memoryview(pubkeys_to_bytes(pubkeys))
+    order = sorted(range(count), key=headers.__getitem__) if sort else range(count)
+
+    result = bytearray(count * EXIT_REQUEST_LENGTH)
+    for position, i in enumerate(order):
+        offset = position * EXIT_REQUEST_LENGTH
+        result[offset : offset + EXIT_REQUEST_HEADER_LENGTH] = headers[i].to_bytes(EXIT_REQUEST_HEADER_LENGTH, "big")
+        result[offset + EXIT_REQUEST_HEADER_LENGTH : offset + EXIT_REQUEST_LENGTH] = pubkeys_data[
+            i * VALIDATOR_PUB_KEY_LENGTH : (i + 1) * VALIDATOR_PUB_KEY_LENGTH
+        ]
+
+    return bytes(result)
+
+
+def decode_exit_requests(data: bytes) -> Iterator[ExitRequestRecord]:
+    """Yields the records of the Exit Bus data, the pubkeys are the slices of the data"""
+    if len(data) % EXIT_REQUEST_LENGTH:
+        raise ValueError(f"Unexpected exit requests data length: {len(data)}")
+
+    view = memoryview(data)
+    for offset in range(0, len(view), EXIT_REQUEST_LENGTH):
+        header = int.from_bytes(view[offset : offset + EXIT_REQUEST_HEADER_LENGTH], "big")
+        yield ExitRequestRecord(
+            module_id=header >> 8 * (NODE_OPERATOR_ID_LENGTH + VALIDATOR_INDEX_LENGTH),
+            node_operator_id=(header >> 8 * VALIDATOR_INDEX_LENGTH) % 2 ** (8 * NODE_OPERATOR_ID_LENGTH),
+            validator_index=header % 2 ** (8 * VALIDATOR_INDEX_LENGTH),
+            pubkey=view[offset + EXIT_REQUEST_HEADER_LENGTH : offset + EXIT_REQUEST_LENGTH],
+        )
+
+
+def pubkeys_to_bytes(pubkeys: Sequence[Union[str, bytes]]) -> bytes:
+    """Converts the validators pubkeys given as the hex strings or bytes into one contiguous bytes string"""
+    hex_pubkeys = [
+        bytes(pubkey).hex() if isinstance(pubkey, bytes) else pubkey.removeprefix("0x") for pubkey in pubkeys
+    ]
+    for pubkey in hex_pubkeys:
+        if len(pubkey) != 2 * VALIDATOR_PUB_KEY_LENGTH:
+            raise ValueError(f"Unexpected size of validator pub key. Pub key size: {len(pubkey) // 2}")
+    return bytes.fromhex("".join(hex_pubkeys))
+
+
+def _exit_request_header(module_id: int, op_id: int, validator_index: int) -> int:
+    for value, length in (
+        (module_id, MODULE_ID_LENGTH),
+        (op_id, NODE_OPERATOR_ID_LENGTH),
+        (validator_index, VALIDATOR_INDEX_LENGTH),
+    ):
+        if not 0 <= value < 2 ** (8 * length):
+            raise OverflowError(f"Value {value} does not fit into {length} bytes")
+
+    return (
+        (module_id << 8 * (NODE_OPERATOR_ID_LENGTH + VALIDATOR_INDEX_LENGTH))
+        | (op_id << 8 * VALIDATOR_INDEX_LENGTH)
+        | validator_index
+    )
 
 
 def sort_validators_to_eject(
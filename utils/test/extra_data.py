@@ -1,10 +1,11 @@
+import struct
 from dataclasses import dataclass
-from itertools import groupby
+from itertools import chain, groupby
 from enum import Enum
-from typing import List, NewType, Sequence, Tuple
+from typing import Iterable, Iterator, List, NewType, Optional, Sequence, Tuple
 
+from eth_hash.auto import keccak
 from hexbytes import HexBytes
-from brownie import web3
 
 StakingModuleId = NewType("StakingModuleId", int)
 NodeOperatorId = NewType("NodeOperatorId", int)
@@ -31,21 +32,6 @@ class VoterState(Enum):
     DelegateNay = 4
 
 
-@dataclass
-class ItemPayload:
-    module_id: bytes
-    node_ops_count: bytes
-    node_operator_ids: bytes
-    vals_counts: bytes
-
-
-@dataclass
-class ExtraDataItem:
-    item_index: bytes
-    item_type: ItemType
-    item_payload: ItemPayload
-
-
 @dataclass
 class ExtraData:
     extra_data_list: List[bytes]
@@ -61,13 +47,25 @@ class ItemPayload:
     vals_counts: Sequence[int]
 
 
+@dataclass
+class ExtraDataItem:
+    item_index: int
+    item_type: ItemType
+    item_payload: ItemPayload
+
+
 class ExtraDataLengths:
+    NEXT_HASH = 32
     ITEM_INDEX = 3
     ITEM_TYPE = 2
     MODULE_ID = 3
     NODE_OPS_COUNT = 8
     NODE_OPERATOR_IDS = 8
     EXITED_VALS_COUNT = 16
+    ITEM_HEADER = ITEM_INDEX + ITEM_TYPE + MODULE_ID + NODE_OPS_COUNT
+
+
+UINT64_MASK = 2**64 - 1
 
 
 class ExtraDataService:
@@ -93,8 +91,9 @@ class ExtraDataService:
         max_no_in_payload_count: int,
     ) -> ExtraData:
         exited_payloads = cls.build_validators_payloads(exited_validators, max_no_in_payload_count)
-        items_count, txs = cls.build_extra_transactions_data(exited_payloads, max_items_count)
-        extra_data_hash_list, hashed_txs = cls.add_hashes_to_transactions(txs)
+        items_count, buffers = cls.encode_transactions(exited_payloads, max_items_count)
+        extra_data_hash_list = cls.hash_transactions(buffers)
+        hashed_txs = [bytes(buffer) for buffer in buffers]
 
         if items_count:
             extra_data_format = FormatList.EXTRA_DATA_FORMAT_LIST_NON_EMPTY
@@ -143,6 +142,21 @@ class ExtraDataService:
         exited_payloads: list[ItemPayload],
         max_items_count: int,
     ) -> tuple[int, list[bytes]]:
+        items_count, buffers = cls.encode_transactions(exited_payloads, max_items_count)
+        return items_count, [bytes(memoryview(buffer)[ExtraDataLengths.NEXT_HASH :]) for buffer in buffers]
+
+    @classmethod
+    def encode_transactions(
+        cls,
+        exited_payloads: list[ItemPayload],
+        max_items_count: int,
+    ) -> tuple[int, list[bytearray]]:
+        """
+        Encodes the items into the transactions buffers.
+
+        Every buffer is allocated at its final size with the first 32 bytes reserved
+        for the hash of the next transaction, see `hash_transactions`.
+        """
         all_payloads = [
             *[(ItemType.EXTRA_DATA_TYPE_EXITED_VALIDATORS, payload) for payload in exited_payloads],
         ]
@@ -151,45 +165,130 @@ class ExtraDataService:
         result = []
 
         for payload_batch in cls.batch(all_payloads, max_items_count):
-            tx = b''
+            buffer = bytearray(ExtraDataLengths.NEXT_HASH + sum(cls.item_size(payload) for _, payload in payload_batch))
+            offset = ExtraDataLengths.NEXT_HASH
             for item_type, payload in payload_batch:
-                tx += index.to_bytes(ExtraDataLengths.ITEM_INDEX, byteorder='big')
-                tx += item_type.value.to_bytes(ExtraDataLengths.ITEM_TYPE, byteorder='big')
-                tx += payload.module_id.to_bytes(ExtraDataLengths.MODULE_ID, byteorder='big')
-                tx += len(payload.node_operator_ids).to_bytes(ExtraDataLengths.NODE_OPS_COUNT, byteorder='big')
-                tx += b''.join(
-                    no_id.to_bytes(ExtraDataLengths.NODE_OPERATOR_IDS, byteorder='big')
-                    for no_id in payload.node_operator_ids
-                )
-                tx += b''.join(
-                    count.to_bytes(ExtraDataLengths.EXITED_VALS_COUNT, byteorder='big')
-                    for count in payload.vals_counts
-                )
-
+                offset = cls.write_item(buffer, offset, index, item_type, payload)
                 index += 1
 
-            result.append(tx)
+            result.append(buffer)
 
         return index, result
 
     @staticmethod
-    def add_hashes_to_transactions(txs_data: list[bytes]) -> tuple[bytes, list[bytes]]:
-        txs_data.reverse()
+    def item_size(payload: ItemPayload) -> int:
+        return (
+            ExtraDataLengths.ITEM_HEADER
+            + len(payload.node_operator_ids) * ExtraDataLengths.NODE_OPERATOR_IDS
+            + len(payload.vals_counts) * ExtraDataLengths.EXITED_VALS_COUNT
+        )
+
+    @staticmethod
+    def write_item(buffer: bytearray, offset: int, index: int, item_type: ItemType, payload: ItemPayload) -> int:
+        """Writes the item into the buffer at the offset and returns the offset after it"""
+        header = (
+            index.to_bytes(ExtraDataLengths.ITEM_INDEX, byteorder="big")
+            + item_type.value.to_bytes(ExtraDataLengths.ITEM_TYPE, byteorder="big")
+            + payload.module_id.to_bytes(ExtraDataLengths.MODULE_ID, byteorder="big")
+            + len(payload.node_operator_ids).to_bytes(ExtraDataLengths.NODE_OPS_COUNT, byteorder="big")
+        )
+        buffer[offset : offset + ExtraDataLengths.ITEM_HEADER] = header
+        offset += ExtraDataLengths.ITEM_HEADER
+
+        # node operator ids are uint64, the counts are uint128 written as two uint64 halves
+        ids_count, vals_count = len(payload.node_operator_ids), len(payload.vals_counts)
+        struct.pack_into(f">{ids_count}Q", buffer, offset, *payload.node_operator_ids)
+        offset += ids_count * ExtraDataLengths.NODE_OPERATOR_IDS
+        struct.pack_into(
+            f">{2 * vals_count}Q",
+            buffer,
+            offset,
+            *chain.from_iterable((count >> 64, count & UINT64_MASK) for count in payload.vals_counts),
+        )
+        return offset + vals_count * ExtraDataLengths.EXITED_VALS_COUNT
 
-        txs_with_hashes = []
+    @staticmethod
+    def hash_transactions(buffers: list[bytearray]) -> list[HexBytes]:
+        """Fills the next transaction hashes in the encoded buffers in place and returns the transactions hashes"""
         txs_hashes = []
         next_hash = ZERO_HASH
 
-        for tx in txs_data:
-            full_tx_data = next_hash + tx
-            txs_with_hashes.append(full_tx_data)
-            next_hash = web3.keccak(full_tx_data)
-            txs_hashes.append(next_hash)
+        for buffer in reversed(buffers):
+            buffer[: ExtraDataLengths.NEXT_HASH] = next_hash
+            next_hash = keccak(buffer)
+            txs_hashes.append(HexBytes(next_hash))
 
-        txs_with_hashes.reverse()
         txs_hashes.reverse()
+        return txs_hashes
 
-        return txs_hashes, txs_with_hashes
+    @classmethod
+    def add_hashes_to_transactions(cls, txs_data: list[bytes]) -> tuple[list[HexBytes], list[bytes]]:
+        buffers = []
+        for tx in txs_data:
+            buffer = bytearray(ExtraDataLengths.NEXT_HASH + len(tx))
+            buffer[ExtraDataLengths.NEXT_HASH :] = tx
+            buffers.append(buffer)
+
+        txs_hashes = cls.hash_transactions(buffers)
+        return txs_hashes, [bytes(buffer) for buffer in buffers]
+
+    @classmethod
+    def decode(cls, extra_data_list: Iterable[bytes], first_hash: Optional[bytes] = None) -> Iterator[ExtraDataItem]:
+        """
+        Decodes the items of the hashed transactions one by one.
+
+        The hash chain is checked along the way: every transaction has to match the hash
+        from the previous one (or `first_hash` for the first one) and the last one has to end the chain.
+        """
+        expected_hash = first_hash
+        for tx in extra_data_list:
+            if not isinstance(tx, (bytes, bytearray)):
+                tx = bytes(tx)
+            view = memoryview(tx)
+            if expected_hash is not None and keccak(tx) != bytes(expected_hash):
+                raise ValueError("Unexpected extra data transaction hash")
+            expected_hash = bytes(view[: ExtraDataLengths.NEXT_HASH])
+
+            offset = ExtraDataLengths.NEXT_HASH
+            while offset < len(view):
+                item, offset = cls.read_item(view, offset)
+                yield item
+
+        if expected_hash is not None and expected_hash != ZERO_HASH:
+            raise ValueError("Extra data transactions chain is incomplete")
+
+    @staticmethod
+    def read_item(view: memoryview, offset: int) -> tuple[ExtraDataItem, int]:
+        """Reads the item from the buffer at the offset and returns it with the offset after it"""
+        if offset + ExtraDataLengths.ITEM_HEADER > len(view):
+            raise ValueError(f"Extra data item at offset {offset} is truncated")
+
+        fields = []
+        for length in (
+            ExtraDataLengths.ITEM_INDEX,
+            ExtraDataLengths.ITEM_TYPE,
+            ExtraDataLengths.MODULE_ID,
+            ExtraDataLengths.NODE_OPS_COUNT,
+        ):
+            fields.append(int.from_bytes(view[offset : offset + length], byteorder="big"))
+            offset += length
+        index, item_type, module_id, count = fields
+
+        end = offset + count * (ExtraDataLengths.NODE_OPERATOR_IDS + ExtraDataLengths.EXITED_VALS_COUNT)
+        if end > len(view):
+            raise ValueError(f"Extra data item {index} is truncated")
+
+        node_operator_ids = list(struct.unpack_from(f">{count}Q", view, offset))
+        offset += count * ExtraDataLengths.NODE_OPERATOR_IDS
+        halves = struct.unpack_from(f">{2 * count}Q", view, offset)
+        vals_counts = [high << 64 | low for high, low in zip(halves[::2], halves[1::2])]
+
+        item = ExtraDataItem(
+            item_index=index,
+            item_type=ItemType(item_type),
+            item_payload=ItemPayload(module_id, node_operator_ids, vals_counts),
+        )
+        return item, end
 
     @staticmethod
     def batch(iterable, n):
@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+from typing import Callable, Dict, Iterable, Optional
+
+from brownie import chain, web3
+from brownie.network.state import _notify_registry
+
+
+class ForkStatePool:
+    """
+    Session wide storage of the fork states the test modules start from.
+
+    A state is built once and saved with `evm_snapshot` under the given key. Every next `restore`
+    reverts the fork to the saved state and snapshots it again, because the node drops the snapshot
+    it reverts to. If the snapshot was dropped by an earlier revert (e.g. `chain.reset()` in another
+    module), the state is built again from the initial fork state.
+    """
+
+    def __init__(self):
+        self.snapshots: Dict[str, str] = {}
+        self.builds = 0
+        self.restores = 0
+
+    def restore(self, key: str, build: Optional[Callable[[], None]] = None) -> bool:
+        """Returns True if the state was restored from the snapshot, False if it was built or can't be restored"""
+        snapshot_id = self.snapshots.pop(key, None)
+        if snapshot_id is not None and _revert(snapshot_id):
+            self.snapshots[key] = _snapshot()
+            _sync_brownie_chain()
+            self.restores += 1
+            return True
+
+        if build is not None:
+            chain.reset()
+            build()
+            self.snapshots[key] = _snapshot()
+            _sync_brownie_chain()
+            self.builds += 1
+        return False
+
+
+def files_state_key(paths: Iterable[str], *extra) -> str:
+    """Content hash of the files, the result changes if any of the files or the extra values change"""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as file:
+            digest.update(hashlib.sha256(file.read()).digest())
+    digest.update(json.dumps(extra, default=str).encode())
+    return digest.hexdigest()
+
+
+def _snapshot() -> str:
+    return web3.provider.make_request("evm_snapshot", [])["result"]
+
+
+def _revert(snapshot_id: str) -> bool:
+    return bool(web3.provider.make_request("evm_revert", [snapshot_id]).get("result"))
+
+
+def _sync_brownie_chain() -> None:
+    """
+    The only place the pool touches the brownie internals, the snapshots are taken and reverted behind
+    its back. Syncs the local time offset and the cached objects with the node, drops the brownie snapshot
+    and undo history as the node has dropped the snapshots taken after the reverted one, and takes
+    the current snapshot after the pooled one, so `chain.undo()` doesn't revert it away.
+    """
+    chain.sleep(0)
+    _notify_registry()
+    chain._snapshot_id = None
+    chain._undo_buffer.clear()
+    chain._redo_buffer.clear()
+    chain._current_id = _snapshot()
+
+
+fork_state_pool = ForkStatePool()
@@ -1,7 +1,16 @@
 from brownie import accounts
 from utils.config import contracts
-from utils.import_current_votes import start_and_execute_votes
-from utils.dual_governance import process_proposals
+from utils.import_current_votes import (
+    start_and_execute_votes,
+    get_vote_script_files,
+    get_upgrade_script_files,
+    is_there_any_vote_scripts,
+    is_there_any_upgrade_scripts,
+)
+from utils.dual_governance import process_proposals, is_there_any_proposals_from_env
+from utils.test.fork_state_pool import files_state_key
+
+AUTOEXECUTE_VOTE = is_there_any_vote_scripts() or is_there_any_upgrade_scripts() or is_there_any_proposals_from_env()
 
 
 def execute_vote(helpers, vote_ids_from_env):
@@ -24,3 +33,12 @@ def execute_vote_and_process_dg_proposals(helpers, vote_ids_from_env, dg_proposa
             return
         new_proposal_ids = list(range(proposals_count_before + 1, proposals_count_after + 1))
         process_proposals(new_proposal_ids)
+
+
+def enacted_state_key(vote_ids_from_env, dg_proposal_ids_from_env) -> str:
+    return files_state_key(
+        get_vote_script_files() + get_upgrade_script_files(),
+        list(vote_ids_from_env or []),
+        list(dg_proposal_ids_from_env or []),
+    )
+
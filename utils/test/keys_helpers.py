@@ -1,10 +1,43 @@
 import random
-import textwrap
+from typing import Optional, Tuple
 
 PUBKEY_LENGTH = 48
 SIGNATURE_LENGTH = 96
 
 
+class KeysBatch:
+    """
+    Pubkeys and signatures of `count` keys stored in two contiguous buffers, random if not given.
+
+    `pubkey(i)` and `signature(i)` are views into the buffers, `slice(start, count)` returns
+    the buffers of the keys range ready to be passed to `addSigningKeys` and alike.
+    """
+
+    def __init__(self, count: int, pubkeys: Optional[bytes] = None, signatures: Optional[bytes] = None):
+        self.count = count
+        self.pubkeys = random.randbytes(count * PUBKEY_LENGTH) if pubkeys is None else bytes(pubkeys)
+        self.signatures = random.randbytes(count * SIGNATURE_LENGTH) if signatures is None else bytes(signatures)
+        assert len(self.pubkeys) == count * PUBKEY_LENGTH, "invalid pubkeys length"
+        assert len(self.signatures) == count * SIGNATURE_LENGTH, "invalid signatures length"
+        self._pubkeys_view = memoryview(self.pubkeys)
+        self._signatures_view = memoryview(self.signatures)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def pubkey(self, index: int) -> memoryview:
+        return self._pubkeys_view[index * PUBKEY_LENGTH : (index + 1) * PUBKEY_LENGTH]
+
+    def signature(self, index: int) -> memoryview:
+        return self._signatures_view[index * SIGNATURE_LENGTH : (index + 1) * SIGNATURE_LENGTH]
+
+    def slice(self, start: int, count: int) -> Tuple[bytes, bytes]:
+        return (
+            self.pubkeys[start * PUBKEY_LENGTH : (start + count) * PUBKEY_LENGTH],
+            self.signatures[start * SIGNATURE_LENGTH : (start + count) * SIGNATURE_LENGTH],
+        )
+
+
 def random_pubkeys_batch(pubkeys_count: int):
     return random_hexstr(pubkeys_count * PUBKEY_LENGTH)
 
@@ -24,7 +57,10 @@ def parse_signatures_batch(signatures_batch: str):
 def hex_chunks(hexstr: str, chunk_length: int):
     stripped_hexstr = strip_0x(hexstr)
     assert len(stripped_hexstr) % chunk_length == 0, "invalid hexstr length"
-    return [prefix_0x(chunk) for chunk in textwrap.wrap(stripped_hexstr, 2 * chunk_length)]
+    return [
+        prefix_0x(stripped_hexstr[start : start + 2 * chunk_length])
+        for start in range(0, len(stripped_hexstr), 2 * chunk_length)
+    ]
 
 
 def random_hexstr(length: int):
@@ -0,0 +1,114 @@
+import os
+from typing import Dict, List, Optional
+
+from brownie import web3
+
+from utils.balance import set_balance_in_wei
+from utils.multicall import MulticallItem, aggregate
+from utils.test.helpers import ETH
+from utils.test.keys_helpers import KeysBatch
+from utils.test.transaction_queue import TransactionQueue
+
+MAX_KEYS_BATCH_SIZE = 100
+# Gas limit of a keys upload transaction, storing a key with its signature is about 110k gas
+KEYS_UPLOAD_GAS_PER_KEY = int(os.getenv("KEYS_UPLOAD_GAS_PER_KEY", 150_000))
+KEYS_UPLOAD_BASE_GAS = int(os.getenv("KEYS_UPLOAD_BASE_GAS", 300_000))
+
+
+def keys_upload_gas(keys_count: int) -> int:
+    return KEYS_UPLOAD_BASE_GAS + KEYS_UPLOAD_GAS_PER_KEY * keys_count
+
+
+def upload_simple_dvt_keys(
+    simple_dvt, keys_counts: Dict[int, int], keys: Optional[KeysBatch] = None, batch_size: int = MAX_KEYS_BATCH_SIZE
+) -> KeysBatch:
+    """
+    Adds `keys_counts[id]` keys to every node operator of the SimpleDVT (or any NodeOperatorsRegistry)
+    by their reward addresses, the state is read once before and once after all the uploads.
+    """
+    ids = list(keys_counts)
+    keys = keys or KeysBatch(sum(keys_counts.values()))
+    before = _read_signing_keys_counts(simple_dvt, ids)
+
+    queue, offset = TransactionQueue(), 0
+    for id in ids:
+        reward_address = before[id]["rewardAddress"]
+        if web3.eth.get_balance(reward_address) == 0:
+            set_balance_in_wei(reward_address, ETH(100000))
+        for start in range(0, keys_counts[id], batch_size):
+            count = min(batch_size, keys_counts[id] - start)
+            pubkeys, signatures = keys.slice(offset, count)
+            queue.add(
+                simple_dvt.addSigningKeys, (id, count, pubkeys, signatures), reward_address, keys_upload_gas(count)
+            )
+            offset += count
+    queue.send()
+
+    after = _read_signing_keys_counts(simple_dvt, ids)
+    for id in ids:
+        assert after[id]["total"] == before[id]["total"] + keys_counts[id]
+        assert after[id]["unused"] == before[id]["unused"] + keys_counts[id]
+    return keys
+
+
+def upload_csm_keys(
+    csm,
+    accounting,
+    keys_counts: Dict[int, int],
+    keys: Optional[KeysBatch] = None,
+    batch_size: int = MAX_KEYS_BATCH_SIZE,
+) -> KeysBatch:
+    """
+    Adds `keys_counts[id]` keys to every CSM node operator by their manager addresses, the bond for all the keys
+    of the operator is paid with the first batch. The state is read once before and once after all the uploads.
+    """
+    ids = list(keys_counts)
+    keys = keys or KeysBatch(sum(keys_counts.values()))
+    results = aggregate(
+        [MulticallItem(csm.getNodeOperator, (id,), allow_failure=False) for id in ids]
+        + [
+            MulticallItem(accounting.getRequiredBondForNextKeys, (id, keys_counts[id]), allow_failure=False)
+            for id in ids
+        ]
+    )
+    operators, bonds = results[: len(ids)], results[len(ids) :]
+
+    queue, offset = TransactionQueue(), 0
+    for id, operator, bond in zip(ids, operators, bonds):
+        manager_address = operator["managerAddress"]
+        set_balance_in_wei(manager_address, bond + ETH(1))
+        for start in range(0, keys_counts[id], batch_size):
+            count = min(batch_size, keys_counts[id] - start)
+            pubkeys, signatures = keys.slice(offset, count)
+            queue.add(
+                csm.addValidatorKeysETH,
+                (manager_address, id, count, pubkeys, signatures),
+                manager_address,
+                keys_upload_gas(count),
+                value=bond if start == 0 else 0,
+            )
+            offset += count
+    queue.send()
+
+    after = aggregate([MulticallItem(csm.getNodeOperator, (id,), allow_failure=False) for id in ids])
+    for id, operator, operator_after in zip(ids, operators, after):
+        assert operator_after["totalAddedKeys"] == operator["totalAddedKeys"] + keys_counts[id]
+    return keys
+
+
+def _read_signing_keys_counts(registry, ids: List[int]) -> Dict[int, Dict]:
+    results = aggregate(
+        [
+            MulticallItem(method, args, allow_failure=False)
+            for id in ids
+            for method, args in (
+                (registry.getNodeOperator, (id, False)),
+                (registry.getTotalSigningKeyCount, (id,)),
+                (registry.getUnusedSigningKeyCount, (id,)),
+            )
+        ]
+    )
+    return {
+        id: {"rewardAddress": operator["rewardAddress"], "total": total, "unused": unused}
+        for id, (operator, total, unused) in zip(ids, zip(*[iter(results)] * 3))
+    }
@@ -1,6 +1,7 @@
 # copied from lido-oracle
 import json
 from abc import abstractmethod, ABC
+from collections import deque
 from dataclasses import dataclass
 from functools import reduce
 from typing import Collection, Generic, Iterable, Sequence, TypedDict, TypeVar, TypeAlias
@@ -55,46 +56,80 @@ class MerkleTree(ABC):
 
 
 class CompleteBinaryMerkleTree(MerkleTree):
-    """The tree shaped as a [complete binary tree](https://xlinux.nist.gov/dads/HTML/completeBinaryTree.html)."""
+    """
+    The tree shaped as a [complete binary tree](https://xlinux.nist.gov/dads/HTML/completeBinaryTree.html).
+
+    The nodes are kept in the array order in a single bytearray, `NODE_SIZE` bytes each,
+    and the leaves are indexed by value for the constant time lookup.
+    """
 
-    tree: tuple[bytes, ...]
+    NODE_SIZE = 32
+
+    nodes: bytearray
+    leaf_indices: dict[bytes, int]
 
     def __init__(self, leaves: Collection[bytes]):
         if not leaves:
             raise ValueError("Attempt to create an empty tree")
+        if any(len(leaf) != self.NODE_SIZE for leaf in leaves):
+            raise ValueError(f"Leaves are expected to be {self.NODE_SIZE} bytes long")
+
+        size = 2 * len(leaves) - 1
+        nodes = bytearray(size * self.NODE_SIZE)
+        # the leaves are stored in the reversed order at the end of the tree
+        nodes[(size - len(leaves)) * self.NODE_SIZE :] = b"".join(reversed(tuple(leaves)))
+        self._set_nodes(nodes)
+
+        # hash the internal nodes level by level, the children of a level are always computed before it
+        level_end = size - len(leaves)
+        while level_end > 0:
+            level_start = (1 << (level_end.bit_length() - 1)) - 1
+            nodes[level_start * self.NODE_SIZE : level_end * self.NODE_SIZE] = b"".join(
+                [self.__hash_node__(self.node(2 * i + 1), self.node(2 * i + 2)) for i in range(level_start, level_end)]
+            )
+            level_end = level_start
 
-        tree = [b""] * (2 * len(leaves) - 1)
+    def _set_nodes(self, nodes: bytearray) -> None:
+        self.nodes = nodes
+        size = len(nodes) // self.NODE_SIZE
+        leaves_count = (size + 1) // 2
+        # iterate from the last node to keep the lowest index for the duplicated leaves
+        self.leaf_indices = {}
+        for i in range(size - 1, size - 1 - leaves_count, -1):
+            self.leaf_indices[self.node(i)] = i
 
-        for i, leaf in enumerate(leaves):
-            tree[len(tree) - 1 - i] = leaf
+    @property
+    def tree(self) -> tuple[bytes, ...]:
+        return tuple(self.node(i) for i in range(len(self)))
 
-        for i in range(len(tree) - 1 - len(leaves), -1, -1):
-            tree[i] = self.__hash_node__(tree[2 * i + 1], tree[2 * i + 2])
+    def __len__(self) -> int:
+        return len(self.nodes) // self.NODE_SIZE
 
-        self.tree = tuple(tree)
+    def node(self, index: int) -> bytes:
+        return bytes(self.nodes[index * self.NODE_SIZE : (index + 1) * self.NODE_SIZE])
 
     @property
     def root(self) -> bytes:
-        return self.tree[0]
+        return self.node(0)
 
     def find(self, leaf: bytes) -> int:
         try:
-            return self.tree.index(leaf)
-        except ValueError as e:
+            return self.leaf_indices[leaf]
+        except KeyError as e:
             raise ValueError("Node not found") from e
 
     def get_proof(self, index: int) -> Iterable[bytes]:
         i = index
         while i > 0:
-            yield self.tree[i - (-1) ** (i % 2)]
+            yield self.node(i - (-1) ** (i % 2))
             i = (i - 1) // 2
 
     def get_multi_proof(self, indices: Collection[int]) -> tuple[Iterable[bytes], Iterable[bool]]:
         if not indices:
             return [], []
 
-        indices = sorted(set(indices))
-        n = len(self.tree)
+        indices = set(indices)
+        n = len(self)
         leaves_count = (n + 1) // 2
 
         proof = []
@@ -116,12 +151,12 @@ class CompleteBinaryMerkleTree(MerkleTree):
                 return True
             elif left_needed:
                 if right < n:
-                    proof.append(self.tree[right])
+                    proof.append(self.node(right))
                 flags.append(False)
                 return True
             elif right_needed:
                 if left < n:
-                    proof.append(self.tree[left])
+                    proof.append(self.node(left))
                 flags.append(False)
                 return True
 
@@ -142,19 +177,19 @@ class CompleteBinaryMerkleTree(MerkleTree):
         if len(leaves) + len(proof) - 1 != len(flags):
             return False
 
-        queue = list(leaves)
+        queue = deque(leaves)
         proof_idx = 0
 
         for flag in flags:
             if flag:
                 if len(queue) < 2:
                     return False
-                a = queue.pop(0)
-                b = queue.pop(0)
+                a = queue.popleft()
+                b = queue.popleft()
             else:
                 if len(queue) < 1 or proof_idx >= len(proof):
                     return False
-                a = queue.pop(0)
+                a = queue.popleft()
                 b = proof[proof_idx]
                 proof_idx += 1
 
@@ -200,10 +235,10 @@ class StandardMerkleTree(Generic[T], CompleteBinaryMerkleTree):
     def __init__(self, values: Sequence[T], encoding: Iterable[TypeStr]):
         self.encoding = encoding
 
-        leaves = tuple(sorted(self.leaf(v) for v in values))
-        super().__init__(leaves)
+        leaves = [self.leaf(v) for v in values]
+        super().__init__(sorted(leaves))
 
-        self.values = tuple({"value": v, "treeIndex": self.find(self.leaf(v))} for v in values)
+        self.values = tuple({"value": v, "treeIndex": self.find(leaf)} for v, leaf in zip(values, leaves))
 
     def leaf(self, value: T) -> bytes:
         return self.__hash_leaf__(encode(self.encoding, value))
@@ -224,7 +259,18 @@ class StandardMerkleTree(Generic[T], CompleteBinaryMerkleTree):
             raise ValueError("No leaf encoding provided")
         if "values" not in data:
             raise ValueError("No values provided")
-        return cls([e["value"] for e in data["values"]], data["leafEncoding"])
+        if "tree" not in data or any("treeIndex" not in e for e in data["values"]):
+            return cls([e["value"] for e in data["values"]], data["leafEncoding"])
+
+        if len(data["tree"]) != 2 * len(data["values"]) - 1:
+            raise ValueError("Tree size does not match the values count")
+
+        # restore the dumped nodes as is instead of hashing the values again
+        tree = cls.__new__(cls)
+        tree.encoding = data["leafEncoding"]
+        tree._set_nodes(bytearray(b"".join(HexBytes(node) for node in data["tree"])))
+        tree.values = tuple({"value": e["value"], "treeIndex": e["treeIndex"]} for e in data["values"])
+        return tree
 
     @classmethod
     def __hash_leaf__(cls, leaf: bytes) -> bytes:
@@ -9,6 +9,18 @@ from eth_abi.abi import encode
 from hexbytes import HexBytes
 
 from utils.config import contracts, AO_CONSENSUS_VERSION
+from utils.finalization_batches import (
+    MAX_BATCHES_LENGTH,
+    calculate_finalization_batches,
+    read_withdrawal_requests,
+)
+from utils.test.accounting_model import (
+    ACCOUNTING_MODEL_CROSS_CHECK,
+    assert_matches_calculated_values,
+    read_accounting_state,
+    simulate_oracle_report,
+)
+from utils.test.consensus_helpers import get_frame_clock, submit_consensus_reports
 from utils.test.exit_bus_data import encode_data
 from utils.test.helpers import ETH, GWEI, eth_balance
 from utils.test.merkle_tree import RewardsTree
@@ -172,11 +184,32 @@ def get_finalization_batches(
     reserved_buffer = min(buffered_ether, unfinalized_steth)
     available_eth = limited_withdrawal_vault_balance + limited_el_rewards_vault_balance + reserved_buffer
     max_timestamp = chain.time() - requestTimestampMargin
-    MAX_REQUESTS_PER_CALL = 1000
 
     if not available_eth:
         return []
 
+    requests = read_withdrawal_requests(contracts.withdrawal_queue)
+    (remaining_eth_budget, batches) = calculate_finalization_batches(requests, share_rate, max_timestamp, available_eth)
+    if remaining_eth_budget == 0:
+        return batches
+
+    # the contract continues from the calculated state, so it has to find nothing more to finalize
+    batchesState = contracts.withdrawal_queue.calculateFinalizationBatches(
+        share_rate,
+        max_timestamp,
+        1,
+        (remaining_eth_budget, False, batches + [0] * (MAX_BATCHES_LENGTH - len(batches)), len(batches)),
+    )
+    if batchesState[1] and list(batchesState[2])[: batchesState[3]] == batches:
+        return batches
+
+    warnings.warn(f"Calculated finalization batches {batches} differ from the WithdrawalQueue ones")
+    return _get_finalization_batches_from_contract(share_rate, max_timestamp, available_eth)
+
+
+def _get_finalization_batches_from_contract(share_rate: int, max_timestamp: int, available_eth: int) -> list[int]:
+    MAX_REQUESTS_PER_CALL = 1000
+
     batchesState = contracts.withdrawal_queue.calculateFinalizationBatches(
         share_rate, max_timestamp, MAX_REQUESTS_PER_CALL, (available_eth, False, [0 for _ in range(36)], 0)
     )
@@ -190,14 +223,7 @@ def get_finalization_batches(
 
 
 def reach_consensus(slot, report, version, oracle_contract, silent=False):
-    (members, *_) = oracle_contract.getFastLaneMembers()
-    for member in members:
-        if not silent:
-            print(f"Member ${member} submitting report to hashConsensus")
-        oracle_contract.submitReport(slot, report, version, {"from": member})
-    (_, hash_, _) = oracle_contract.getConsensusState()
-    assert hash_ == report.hex(), "HashConsensus points to unexpected report"
-    return members[0]
+    return submit_consensus_reports(oracle_contract, slot, report, version, silent)
 
 
 def push_oracle_report(
@@ -284,8 +310,57 @@ def push_oracle_report(
 def simulate_report(
     *, refSlot, beaconValidators, postCLBalance, withdrawalVaultBalance, elRewardsVaultBalance, block_identifier=None
 ):
-    (_, SECONDS_PER_SLOT, GENESIS_TIME) = contracts.hash_consensus_for_accounting_oracle.getChainConfig()
-    reportTime = GENESIS_TIME + refSlot * SECONDS_PER_SLOT
+    calculatedValues = simulate_report_calculated_values(
+        refSlot=refSlot,
+        beaconValidators=beaconValidators,
+        postCLBalance=postCLBalance,
+        withdrawalVaultBalance=withdrawalVaultBalance,
+        elRewardsVaultBalance=elRewardsVaultBalance,
+        block_identifier=block_identifier,
+    )
+    return (calculatedValues[14], calculatedValues[13], calculatedValues[0], calculatedValues[1])
+
+
+def simulate_report_locally(
+    *,
+    refSlot,
+    beaconValidators,
+    postCLBalance,
+    withdrawalVaultBalance,
+    elRewardsVaultBalance,
+    block_identifier=None,
+    cross_check=None,
+):
+    """the same as `simulate_report`, but calculated by the local accounting model without the contract call"""
+    simulated = simulate_oracle_report(
+        read_accounting_state(block_identifier),
+        cl_validators=beaconValidators,
+        cl_balance=postCLBalance,
+        withdrawal_vault_balance=withdrawalVaultBalance,
+        el_rewards_vault_balance=elRewardsVaultBalance,
+    )
+    if ACCOUNTING_MODEL_CROSS_CHECK if cross_check is None else cross_check:
+        calculatedValues = simulate_report_calculated_values(
+            refSlot=refSlot,
+            beaconValidators=beaconValidators,
+            postCLBalance=postCLBalance,
+            withdrawalVaultBalance=withdrawalVaultBalance,
+            elRewardsVaultBalance=elRewardsVaultBalance,
+            block_identifier=block_identifier,
+        )
+        assert_matches_calculated_values(simulated, calculatedValues)
+    return (
+        simulated.postTotalPooledEther,
+        simulated.postTotalShares,
+        simulated.withdrawalsVaultTransfer,
+        simulated.elRewardsVaultTransfer,
+    )
+
+
+def simulate_report_calculated_values(
+    *, refSlot, beaconValidators, postCLBalance, withdrawalVaultBalance, elRewardsVaultBalance, block_identifier=None
+):
+    reportTime = get_frame_clock(contracts.hash_consensus_for_accounting_oracle).slot_timestamp(refSlot)
 
     override_slot = web3.keccak(text="lido.BaseOracle.lastProcessingRefSlot").hex()
     state_override = {
@@ -319,7 +394,7 @@ def simulate_report(
             block_identifier=block_identifier,
             override=state_override,
         )
-        return (calculatedValues[14], calculatedValues[13], calculatedValues[0], calculatedValues[1])
+        return calculatedValues
     except VirtualMachineError:
         # workaround for empty revert message from ganache on eth_call
 
@@ -339,27 +414,8 @@ def simulate_report(
 
 
 def wait_to_next_available_report_time(consensus_contract):
-    (SLOTS_PER_EPOCH, SECONDS_PER_SLOT, GENESIS_TIME) = consensus_contract.getChainConfig()
-    try:
-        (refSlot, _) = consensus_contract.getCurrentFrame()
-    except VirtualMachineError as e:
-        if "InitialEpochIsYetToArrive" in str(e):
-            frame_config = consensus_contract.getFrameConfig()
-            chain.sleep(
-                GENESIS_TIME + 1 + (frame_config["initialEpoch"] * SLOTS_PER_EPOCH * SECONDS_PER_SLOT) - chain.time()
-            )
-            chain.mine(1)
-            (refSlot, _) = consensus_contract.getCurrentFrame()
-        else:
-            raise
-
-    time = web3.eth.get_block("latest").timestamp
-    (_, EPOCHS_PER_FRAME, _) = consensus_contract.getFrameConfig()
-    frame_start_with_offset = GENESIS_TIME + (refSlot + SLOTS_PER_EPOCH * EPOCHS_PER_FRAME + 1) * SECONDS_PER_SLOT
-    chain.sleep(frame_start_with_offset - time)
-    chain.mine(1)
-    (nextRefSlot, _) = consensus_contract.getCurrentFrame()
-    assert nextRefSlot == refSlot + SLOTS_PER_EPOCH * EPOCHS_PER_FRAME, "should be next frame"
+    """fast forwards time to the start of the next frame and returns its (refSlot, reportProcessingDeadlineSlot)"""
+    return get_frame_clock(consensus_contract).wait_next_frame()
 
 
 @overload
@@ -446,7 +502,9 @@ def oracle_report(
 ):
     if wait_to_next_report_time:
         """fast forwards time to next report, compiles report, pushes through consensus and to AccountingOracle"""
-        wait_to_next_available_report_time(contracts.hash_consensus_for_accounting_oracle)
+        (nextRefSlot, _) = wait_to_next_available_report_time(contracts.hash_consensus_for_accounting_oracle)
+        if refSlot is None:
+            refSlot = nextRefSlot
     if refSlot is None:
         (refSlot, _) = contracts.hash_consensus_for_accounting_oracle.getCurrentFrame()
 
@@ -485,7 +543,8 @@ def oracle_report(
     is_bunker = False
 
     if not skip_withdrawals:
-        (postTotalPooledEther, postTotalShares, withdrawals, elRewards) = simulate_report(
+        simulate = simulate_report_locally if dry_run else simulate_report
+        (postTotalPooledEther, postTotalShares, withdrawals, elRewards) = simulate(
             refSlot=refSlot,
             beaconValidators=postBeaconValidators,
             postCLBalance=postCLBalance,
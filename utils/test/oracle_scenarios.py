@@ -0,0 +1,80 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Union
+
+from brownie import interface
+
+from utils.column_table import ColumnTable
+from utils.config import contracts
+from utils.multicall import MULTICALL3_ADDRESS, MulticallItem, aggregate
+from utils.test.oracle_report_helpers import oracle_report
+
+
+class StateProbe(NamedTuple):
+    """A view call read after every report, `field` picks one of the function outputs"""
+
+    method: Any
+    args: tuple = ()
+    field: Optional[Union[int, str]] = None
+
+
+class ScenarioResult(NamedTuple):
+    # the row 0 is the state before the first report, the row i is the state after the i-th one
+    states: ColumnTable
+    # oracle_report results in the steps order
+    reports: List[Any]
+
+
+def eth_balance_probe(address: str) -> StateProbe:
+    return StateProbe(interface.Multicall3(MULTICALL3_ADDRESS).getEthBalance, (address,))
+
+
+def default_state_probes(*names: str) -> Dict[str, StateProbe]:
+    """The protocol state the oracle tests usually check, only the `names` ones if given"""
+    probes = {
+        "block_timestamp": StateProbe(interface.Multicall3(MULTICALL3_ADDRESS).getCurrentBlockTimestamp),
+        "cl_validators": StateProbe(contracts.lido.getBeaconStat, field="beaconValidators"),
+        "cl_balance": StateProbe(contracts.lido.getBeaconStat, field="beaconBalance"),
+        "total_pooled_ether": StateProbe(contracts.lido.getTotalPooledEther),
+        "total_shares": StateProbe(contracts.lido.getTotalShares),
+        "cover_shares_to_burn": StateProbe(contracts.burner.getSharesRequestedToBurn, field=0),
+        "non_cover_shares_to_burn": StateProbe(contracts.burner.getSharesRequestedToBurn, field=1),
+        "withdrawal_vault_balance": eth_balance_probe(contracts.withdrawal_vault.address),
+        "el_rewards_vault_balance": eth_balance_probe(contracts.execution_layer_rewards_vault.address),
+        "last_finalized_request_id": StateProbe(contracts.withdrawal_queue.getLastFinalizedRequestId),
+        "report_data_count": StateProbe(contracts.oracle_report_sanity_checker.getReportDataCount),
+    }
+    if not names:
+        return probes
+    return {name: probes[name] for name in names}
+
+
+def capture_state(probes: Dict[str, StateProbe], block_identifier: Union[int, str] = "latest") -> Dict[str, Any]:
+    """Reads all the probes with a single multicall, the probes of the same call are read once"""
+    items: Dict[tuple, MulticallItem] = {}
+    keys = {}
+    for name, probe in probes.items():
+        item = MulticallItem(probe.method, probe.args, allow_failure=False)
+        keys[name] = (item.target, item.calldata)
+        items.setdefault(keys[name], item)
+    values = dict(zip(items, aggregate(list(items.values()), block_identifier)))
+
+    state = {}
+    for name, probe in probes.items():
+        value = values[keys[name]]
+        state[name] = value if probe.field is None else value[probe.field]
+    return state
+
+
+def run_oracle_reports(
+    steps: Sequence[Dict[str, Any]], probes: Optional[Dict[str, StateProbe]] = None
+) -> ScenarioResult:
+    """
+    Runs `oracle_report(**step)` for every step back-to-back (silent unless the step says otherwise)
+    and captures the probes before the first report and after every one of them.
+    """
+    probes = default_state_probes() if probes is None else probes
+    rows = [capture_state(probes)]
+    reports = []
+    for step in steps:
+        reports.append(oracle_report(**{"silent": True, **step}))
+        rows.append(capture_state(probes))
+    return ScenarioResult(ColumnTable(rows), reports)
@@ -0,0 +1,78 @@
+"""
+The single wrapper of `web3.provider.make_request` the test plugins observe the JSON-RPC requests through,
+e.g. the RPC calls counter of the timings and the RPC profiler.
+
+Both the requests going through the web3 middlewares and the ones sent with `web3.provider.make_request()`
+directly (brownie's `evm_*` calls, the batched helpers) are observed, as well as every request of
+the JSON-RPC batches posted by the storage reader.
+"""
+
+import sys
+import time
+from typing import Any, Callable, List
+
+from brownie import web3
+
+from utils import storage_reader
+
+# listener(method, params, seconds the request took, frame the request was sent from)
+RpcListener = Callable[[str, Any, float, Any], None]
+
+
+class RpcObserver:
+    def __init__(self):
+        self.listeners: List[RpcListener] = []
+
+    def subscribe(self, listener: RpcListener) -> None:
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+        self.install()
+
+    def install(self) -> None:
+        """Wraps `make_request` of the current provider, brownie replaces the provider on reconnect"""
+        self._install_batches()
+        provider = web3.provider
+        if provider is None or getattr(provider.make_request, "rpc_observer", None) is self:
+            return
+
+        make_request = provider.make_request
+
+        def observed_make_request(method, params):
+            start = time.perf_counter()
+            try:
+                return make_request(method, params)
+            finally:
+                if self.listeners:
+                    seconds = time.perf_counter() - start
+                    frame = sys._getframe(1)
+                    for listener in self.listeners:
+                        listener(method, params, seconds, frame)
+
+        observed_make_request.rpc_observer = self
+        provider.make_request = observed_make_request
+        # web3 caches the middlewares chain built around the previous `make_request`
+        provider._request_func_cache = (None, None)
+
+    def _install_batches(self) -> None:
+        post_batch = storage_reader.post_batch
+        if getattr(post_batch, "rpc_observer", None) is self:
+            return
+
+        def observed_post_batch(provider, payload):
+            start = time.perf_counter()
+            try:
+                return post_batch(provider, payload)
+            finally:
+                if self.listeners and payload:
+                    # the round trip is shared by the requests of the batch
+                    seconds = (time.perf_counter() - start) / len(payload)
+                    frame = sys._getframe(1)
+                    for request in payload:
+                        for listener in self.listeners:
+                            listener(request["method"], request["params"], seconds, frame)
+
+        observed_post_batch.rpc_observer = self
+        storage_reader.post_batch = observed_post_batch
+
+
+rpc_observer = RpcObserver()
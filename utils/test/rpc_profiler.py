@@ -0,0 +1,123 @@
+"""
+Profiler of the JSON-RPC requests sent by the tests.
+
+Every request is attributed to the running test and the stack of the repository frames
+it was sent from, and aggregated by the JSON-RPC method and by the called contract and selector.
+The report is written as the folded stacks accepted by flamegraph.pl / speedscope and a JSON summary.
+"""
+
+import json
+import os
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from brownie.network import state
+from eth_utils import is_address, to_checksum_address
+
+from utils.test.rpc_observer import rpc_observer
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Methods with the transaction object as the first param
+CALL_METHODS = ("eth_call", "eth_estimateGas", "eth_sendTransaction", "eth_createAccessList")
+
+
+class RpcStats:
+    __slots__ = ("calls", "seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.calls += 1
+        self.seconds += seconds
+
+    def as_dict(self) -> Dict:
+        return {"calls": self.calls, "seconds": round(self.seconds, 6)}
+
+
+class RpcProfiler:
+    def __init__(self):
+        self.test = "<session>"
+        self.by_method: Dict[str, RpcStats] = defaultdict(RpcStats)
+        self.by_target: Dict[Tuple[str, str], RpcStats] = defaultdict(RpcStats)
+        self.by_stack: Dict[Tuple[str, ...], RpcStats] = defaultdict(RpcStats)
+        self.frame_labels: Dict = {}
+
+    def install(self) -> None:
+        rpc_observer.subscribe(self.record)
+
+    def record(self, method: str, params, seconds: float, frame) -> None:
+        self.by_method[method].add(seconds)
+        if method in CALL_METHODS and params and isinstance(params[0], dict):
+            data = params[0].get("data") or params[0].get("input") or "0x"
+            self.by_target[(str(params[0].get("to")), str(data)[:10])].add(seconds)
+        self.by_stack[(self.test, *self._stack(frame), method)].add(seconds)
+
+    def _stack(self, frame) -> List[str]:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            label = self.frame_labels.get(code)
+            if label is None:
+                filename = os.path.abspath(code.co_filename)
+                in_repository = filename.startswith(REPOSITORY_ROOT) and "site-packages" not in filename
+                label = f"{frame.f_globals.get('__name__')}.{code.co_name}" if in_repository else ""
+                self.frame_labels[code] = label
+            if label:
+                stack.append(label)
+            frame = frame.f_back
+        return stack[::-1]
+
+    def write_report(self, directory: str, name: str) -> Tuple[str, str]:
+        """Writes `<name>.folded` with the latency in microseconds per stack and `<name>.json` summary"""
+        folded_path = os.path.join(directory, f"{name}.folded")
+        with open(folded_path, "w") as file:
+            for stack, stats in sorted(self.by_stack.items()):
+                frames = ";".join(frame.replace(";", ":").replace(" ", "_") for frame in stack)
+                file.write(f"{frames} {max(1, round(stats.seconds * 1e6))}\n")
+
+        summary_path = os.path.join(directory, f"{name}.json")
+        with open(summary_path, "w") as file:
+            json.dump(
+                {
+                    "methods": {method: stats.as_dict() for method, stats in _by_seconds(self.by_method)},
+                    "targets": [
+                        {"to": to, "selector": selector, "function": _function_name(to, selector), **stats.as_dict()}
+                        for (to, selector), stats in _by_seconds(self.by_target)
+                    ],
+                    "tests": self.by_test(),
+                },
+                file,
+                indent=2,
+            )
+        return folded_path, summary_path
+
+    def by_test(self) -> Dict[str, Dict]:
+        totals: Dict[str, RpcStats] = defaultdict(RpcStats)
+        for stack, stats in self.by_stack.items():
+            totals[stack[0]].calls += stats.calls
+            totals[stack[0]].seconds += stats.seconds
+        return {test: stats.as_dict() for test, stats in _by_seconds(totals)}
+
+    def summary(self, limit: int = 10) -> List[str]:
+        lines = [
+            f"{method}: {stats.calls} calls, {stats.seconds:.2f}s" for method, stats in _by_seconds(self.by_method)
+        ]
+        lines += [
+            f"{_function_name(to, selector) or to + ' ' + selector}: {stats.calls} calls, {stats.seconds:.2f}s"
+            for (to, selector), stats in _by_seconds(self.by_target)[:limit]
+        ]
+        return lines
+
+
+def _by_seconds(stats: Dict) -> List:
+    return sorted(stats.items(), key=lambda item: item[1].seconds, reverse=True)
+
+
+def _function_name(to: str, selector: str) -> Optional[str]:
+    # only the contracts already known to brownie, the lookup must not fetch anything from the explorer
+    contract = state._contract_map.get(to_checksum_address(to)) if is_address(to) else None
+    if contract is None:
+        return None
+    return f"{contract._name}.{contract.selectors.get(selector, selector)}"
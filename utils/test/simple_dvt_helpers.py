@@ -1,4 +1,4 @@
-from brownie import accounts, interface, web3
+from brownie import accounts, interface
 from utils.config import (
     contracts,
     EASYTRACK_SIMPLE_DVT_TRUSTED_CALLER,
@@ -6,11 +6,11 @@ from utils.config import (
     EASYTRACK_SIMPLE_DVT_SET_VETTED_VALIDATORS_LIMITS_FACTORY,
 )
 from utils.test.easy_track_helpers import _encode_calldata, create_and_enact_motion
-from utils.test.keys_helpers import random_pubkeys_batch, random_signatures_batch
+from utils.multicall import MulticallItem, aggregate
+from utils.test.keys_upload import MAX_KEYS_BATCH_SIZE, upload_simple_dvt_keys
 
 MIN_OP_KEYS_CNT = 10
 MIN_OPS_CNT = 3
-MAX_KEYS_BATCH_SIZE = 100
 
 
 def get_operator_name(id: int, group: int = 0):
@@ -43,13 +43,18 @@ def fill_simple_dvt_ops(stranger, min_ops_cnt=MIN_OPS_CNT):
 
 def fill_simple_dvt_ops_keys(stranger, min_ops_cnt=MIN_OPS_CNT, min_keys_cnt=MIN_OP_KEYS_CNT):
     fill_simple_dvt_ops(stranger, min_ops_cnt)
-    for no_id in range(0, min_ops_cnt):
-        unused_keys_count = contracts.simple_dvt.getUnusedSigningKeyCount(no_id)
-
-        if unused_keys_count < min_keys_cnt:
-            simple_dvt_add_keys(contracts.simple_dvt, no_id, min_keys_cnt - unused_keys_count)
+    unused_keys_counts = aggregate(
+        [MulticallItem(contracts.simple_dvt.getUnusedSigningKeyCount, (no_id,)) for no_id in range(0, min_ops_cnt)]
+    )
+    missing_keys = {
+        no_id: min_keys_cnt - unused_keys_count
+        for no_id, unused_keys_count in enumerate(unused_keys_counts)
+        if unused_keys_count < min_keys_cnt
+    }
 
-        assert contracts.simple_dvt.getUnusedSigningKeyCount(no_id) >= min_keys_cnt
+    # the unused keys counts are checked by the upload
+    if missing_keys:
+        upload_simple_dvt_keys(contracts.simple_dvt, missing_keys)
 
 
 def fill_simple_dvt_ops_vetted_keys(stranger, min_ops_cnt=MIN_OPS_CNT, min_keys_cnt=MIN_OP_KEYS_CNT):
@@ -118,35 +123,4 @@ def simple_dvt_add_node_operators(simple_dvt, stranger, input_params=[]):
 
 
 def simple_dvt_add_keys(simple_dvt, node_operator_id, keys_count=1):
-    remained_keys_count = keys_count
-
-    while remained_keys_count > 0:
-        batch_size = min(remained_keys_count, MAX_KEYS_BATCH_SIZE)
-
-        pubkeys_batch = random_pubkeys_batch(batch_size)
-        signatures_batch = random_signatures_batch(batch_size)
-
-        total_signing_keys_count_before = simple_dvt.getTotalSigningKeyCount(node_operator_id)
-        unused_signing_keys_count_before = simple_dvt.getUnusedSigningKeyCount(node_operator_id)
-        node_operator_before = simple_dvt.getNodeOperator(node_operator_id, False)
-
-        reward_address = node_operator_before["rewardAddress"]
-        if accounts.at(reward_address, force=True).balance() == 0:
-            web3.provider.make_request("evm_setAccountBalance", [reward_address, "0x152D02C7E14AF6800000"])
-            web3.provider.make_request("hardhat_setBalance", [reward_address, "0x152D02C7E14AF6800000"])
-
-        tx = simple_dvt.addSigningKeys(
-            node_operator_id,
-            batch_size,
-            pubkeys_batch,
-            signatures_batch,
-            {"from": node_operator_before["rewardAddress"]},
-        )
-
-        total_signing_keys_count_after = simple_dvt.getTotalSigningKeyCount(node_operator_id)
-        unused_signing_keys_count_after = simple_dvt.getUnusedSigningKeyCount(node_operator_id)
-
-        assert total_signing_keys_count_after == total_signing_keys_count_before + batch_size
-        assert unused_signing_keys_count_after == unused_signing_keys_count_before + batch_size
-
-        remained_keys_count -= batch_size
+    upload_simple_dvt_keys(simple_dvt, {node_operator_id: keys_count})
@@ -1,8 +1,10 @@
-from typing import Dict, Tuple, Callable, TypeVar, Optional, Any, TypeVar, NamedTuple, Union
+from typing import Dict, Tuple, Callable, TypeVar, Optional, Any, TypeVar, NamedTuple, Union, Hashable
 from contextlib import contextmanager
 from brownie import rpc, web3
 from brownie.network.state import _notify_registry
 
+from utils.multicall import MulticallItem, aggregate
+
 T, U = TypeVar("T"), TypeVar("U")
 ValueChanged = NamedTuple("ValueChanged", [("from_val", T), ("to_val", T)])
 
@@ -46,6 +48,30 @@ def assert_expected_diffs(step, diff, expected) -> None:
         ), f"Step '{step}': '{key}' was expected to be '{expected[key]}' but found {diff[key]}"
         del diff[key]
 
+
+class SnapshotSpec:
+    """
+    Declarative set of the view calls forming a snapshot.
+
+    The registered calls are read in bulk via Multicall3 at a single block
+    and returned as a flat dict keyed the same way they were registered.
+    """
+
+    def __init__(self):
+        self.items: Dict[Hashable, MulticallItem] = {}
+
+    def add(self, key: Hashable, method: Any, *args: Any) -> "SnapshotSpec":
+        assert key not in self.items, f"Duplicate snapshot key '{key}'"
+        self.items[key] = MulticallItem(method, args)
+        return self
+
+    def take(self, block: Optional[int] = None) -> Dict[Hashable, Any]:
+        return dict(zip(self.items.keys(), aggregate(list(self.items.values()), block_identifier=block)))
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
 @contextmanager
 def _chain_snapshot():
     """Custom chain snapshot context manager to avoid moving snapshots pointer"""
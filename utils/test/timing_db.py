@@ -0,0 +1,211 @@
+"""
+Timings of the test runs, stored in the local cache directory.
+
+    python -m utils.test.timing_db report --threshold 0.5
+    python -m utils.test.timing_db shards 2 --index 0
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from utils.cache import get_cache_directory
+
+TIMING_DB_PATH = os.getenv("TIMING_DB_PATH", os.path.join(get_cache_directory(), "test_timings.sqlite"))
+# Number of the previous runs the durations are averaged over
+TIMING_WINDOW = int(os.getenv("TIMING_WINDOW", 10))
+
+
+class TimingRecord(NamedTuple):
+    nodeid: str
+    outcome: str
+    duration: float
+    rpc_calls: int = 0
+    gas_used: int = 0
+    fixtures: Dict[str, float] = {}
+
+
+class Regression(NamedTuple):
+    nodeid: str
+    duration: float
+    median: float
+
+    @property
+    def ratio(self) -> float:
+        return self.duration / self.median
+
+
+class TimingDatabase:
+    def __init__(self, path: str = TIMING_DB_PATH):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY, started_at REAL, label TEXT);
+            CREATE TABLE IF NOT EXISTS tests (
+                run_id INTEGER, nodeid TEXT, module TEXT, outcome TEXT, duration REAL, rpc_calls INTEGER, gas_used INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS fixtures (run_id INTEGER, nodeid TEXT, fixture TEXT, duration REAL);
+            CREATE INDEX IF NOT EXISTS tests_nodeid ON tests (nodeid, run_id);
+            """
+        )
+
+    def add_run(self, timings: List[TimingRecord], label: str = "", started_at: Optional[float] = None) -> int:
+        with self.connection:
+            run_id = self.connection.execute(
+                "INSERT INTO runs (started_at, label) VALUES (?, ?)", (started_at or time.time(), label)
+            ).lastrowid
+            self.connection.executemany(
+                "INSERT INTO tests VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, t.nodeid, module_of(t.nodeid), t.outcome, t.duration, t.rpc_calls, t.gas_used)
+                    for t in timings
+                ],
+            )
+            self.connection.executemany(
+                "INSERT INTO fixtures VALUES (?, ?, ?, ?)",
+                [(run_id, t.nodeid, name, duration) for t in timings for name, duration in t.fixtures.items()],
+            )
+        return run_id
+
+    def last_run(self) -> Optional[int]:
+        (run_id,) = self.connection.execute("SELECT MAX(id) FROM runs").fetchone()
+        return run_id
+
+    def run_label(self, run_id: int) -> str:
+        (label,) = self.connection.execute("SELECT label FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return label
+
+    def module_durations(self, window: int = TIMING_WINDOW) -> Dict[str, float]:
+        """
+        Sum of the test medians over the last `window` runs of every test, so the `-k` or single test runs
+        don't count as the short runs of the whole module. The tests not run in the last `window` runs
+        of the module are considered removed.
+        """
+        module_runs: Dict[str, List[int]] = {}
+        test_durations: Dict[str, List[float]] = {}
+        for module, nodeid, run_id, duration in self.connection.execute(
+            "SELECT module, nodeid, run_id, duration FROM tests ORDER BY run_id DESC"
+        ):
+            runs = module_runs.setdefault(module, [])
+            if run_id not in runs:
+                runs.append(run_id)
+            durations = test_durations.get(nodeid)
+            if durations is None:
+                if len(runs) > window:
+                    continue
+                durations = test_durations[nodeid] = []
+            if len(durations) < window:
+                durations.append(duration)
+
+        totals: Dict[str, float] = {}
+        for nodeid, durations in test_durations.items():
+            module = module_of(nodeid)
+            totals[module] = totals.get(module, 0.0) + statistics.median(durations)
+        return totals
+
+    def regressions(
+        self, threshold: float = 0.5, window: int = TIMING_WINDOW, min_duration: float = 1.0
+    ) -> List[Regression]:
+        """
+        Tests of the last run that are slower than the median of their previous `window` runs
+        by more than `threshold`, the fastest tests are skipped as noise.
+        """
+        run_id = self.last_run()
+        if run_id is None:
+            return []
+
+        result = []
+        for nodeid, duration in self.connection.execute(
+            "SELECT nodeid, duration FROM tests WHERE run_id = ? AND outcome = 'passed'", (run_id,)
+        ):
+            previous = [
+                row[0]
+                for row in self.connection.execute(
+                    "SELECT duration FROM tests WHERE nodeid = ? AND run_id < ? AND outcome = 'passed' "
+                    "ORDER BY run_id DESC LIMIT ?",
+                    (nodeid, run_id, window),
+                )
+            ]
+            if not previous:
+                continue
+            median = statistics.median(previous)
+            if duration >= min_duration and duration > median * (1 + threshold):
+                result.append(Regression(nodeid, duration, median))
+        return sorted(result, key=lambda regression: regression.duration - regression.median, reverse=True)
+
+
+def module_of(nodeid: str) -> str:
+    return nodeid.split("::", 1)[0]
+
+
+def order_modules(modules: List[str], durations: Dict[str, float]) -> List[str]:
+    """Longest modules first, the modules without the recorded duration are considered average"""
+    known = [durations[module] for module in modules if module in durations]
+    default = statistics.mean(known) if known else 0
+    return sorted(modules, key=lambda module: durations.get(module, default), reverse=True)
+
+
+def pack_shards(modules: List[str], durations: Dict[str, float], shards: int) -> List[List[str]]:
+    """Greedy longest-first packing of the modules into the shards of close total durations"""
+    known = [durations[module] for module in modules if module in durations]
+    default = statistics.mean(known) if known else 0
+    result: List[List[str]] = [[] for _ in range(shards)]
+    loads = [0.0] * shards
+    for module in order_modules(modules, durations):
+        shard = min(range(shards), key=lambda index: (loads[index], len(result[index])))
+        result[shard].append(module)
+        loads[shard] += durations.get(module, default)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test timings")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    report = commands.add_parser("report", help="tests slowed down in the last run")
+    report.add_argument("--threshold", type=float, default=0.5, help="slowdown ratio to report, 0.5 is +50%%")
+    report.add_argument("--window", type=int, default=TIMING_WINDOW)
+    report.add_argument("--min-duration", type=float, default=1.0)
+
+    shards = commands.add_parser("shards", help="test modules split into the shards")
+    shards.add_argument("count", type=int)
+    shards.add_argument("--index", type=int, default=None, help="print the modules of a single shard")
+    shards.add_argument("--tests-dir", default="tests")
+    args = parser.parse_args()
+
+    db = TimingDatabase()
+    if args.command == "report":
+        run_id = db.last_run()
+        if run_id is not None:
+            print(f"Run #{run_id} {db.run_label(run_id)}")
+        regressions = db.regressions(args.threshold, args.window, args.min_duration)
+        for regression in regressions:
+            print(
+                f"{regression.nodeid}: {regression.duration:.2f}s, median {regression.median:.2f}s "
+                f"(x{regression.ratio:.2f})"
+            )
+        if not regressions:
+            print("No regressions")
+        return
+
+    modules = [
+        os.path.normpath(os.path.join(root, name))
+        for root, _, names in os.walk(args.tests_dir)
+        for name in names
+        if name.startswith("test_") and name.endswith(".py")
+        # the internal tests are skipped by their conftest unless WITH_INTERNAL_TESTS is set
+        and (os.getenv("WITH_INTERNAL_TESTS") or os.path.basename(root) != "internal")
+    ]
+    packed = pack_shards(sorted(modules), db.module_durations(), args.count)
+    if args.index is not None:
+        print(" ".join(packed[args.index]))
+    else:
+        for index, shard in enumerate(packed):
+            print(f"{index}: {' '.join(shard)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+from typing import Dict, List
+
+from brownie import accounts, web3
+from hexbytes import HexBytes
+
+
+class TransactionQueue:
+    """
+    Transactions sent to the fork node at once with the automine off and mined by `evm_mine`
+    as many per block as fit, instead of waiting for the receipt of every transaction.
+    """
+
+    def __init__(self):
+        self.transactions: List[Dict] = []
+
+    def __len__(self) -> int:
+        return len(self.transactions)
+
+    def add(self, method, args, sender: str, gas: int, value: int = 0) -> None:
+        # impersonates the sender on the fork
+        accounts.at(sender, force=True)
+        self.transactions.append(
+            {
+                "from": sender,
+                "to": method._address,
+                "data": method.encode_input(*args),
+                "gas": hex(gas),
+                "value": hex(value),
+            }
+        )
+
+    def send(self) -> List[Dict]:
+        """Sends and mines the queued transactions, returns the receipts in the queue order"""
+        if not self.transactions:
+            return []
+
+        _request("evm_setAutomine", [False])
+        try:
+            hashes = [HexBytes(_request("eth_sendTransaction", [tx])) for tx in self.transactions]
+            pending = set(hashes)
+            while pending:
+                _request("evm_mine", [])
+                mined = pending.intersection(web3.eth.get_block("latest")["transactions"])
+                if not mined:
+                    raise RuntimeError(f"{len(pending)} queued transactions can't be mined")
+                pending -= mined
+        finally:
+            _request("evm_setAutomine", [True])
+
+        receipts = [web3.eth.get_transaction_receipt(tx_hash) for tx_hash in hashes]
+        reverted = [index for index, receipt in enumerate(receipts) if receipt["status"] != 1]
+        assert not reverted, f"Queued transactions {reverted} reverted"
+        self.transactions = []
+        return receipts
+
+
+def _request(method: str, params: list):
+    response = web3.provider.make_request(method, params)
+    if "error" in response:
+        raise ValueError(response["error"])
+    return response["result"]
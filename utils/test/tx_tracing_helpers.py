@@ -45,22 +45,21 @@ def display_voting_call_trace(tx: TransactionReceipt) -> None:
     )
 
 
-def count_vote_items_by_events(tx: TransactionReceipt, voting_addr: str) -> int:
-    events = tx_events_from_receipt(tx)
-    ev_dict = EventDict(events)
+def count_vote_items_by_events(tx: Union[TransactionReceipt, DecodedEvents], voting_addr: str) -> int:
+    ev_dict = decoded_tx_events(tx).to_event_dict()
 
     calls_slice = ev_dict["LogScriptCall"]
     return sum(map(lambda x: web3.to_checksum_address(x["src"]) == web3.to_checksum_address(voting_addr), calls_slice))
 
 
-def display_voting_events(tx: TransactionReceipt) -> None:
-    dict_events = EventDict(tx_events_from_receipt(tx))
+def display_voting_events(tx: Union[TransactionReceipt, DecodedEvents]) -> None:
+    dict_events = decoded_tx_events(tx).to_event_dict()
     groups = [_vote_item_group, _service_item_group]
 
     display_tx_events(dict_events, "Events registered during the vote execution", groups)
 
-def display_dg_events(tx: TransactionReceipt) -> None:
-    dict_events = EventDict(tx_events_from_receipt(tx))
+def display_dg_events(tx: Union[TransactionReceipt, DecodedEvents]) -> None:
+    dict_events = decoded_tx_events(tx).to_event_dict()
     groups = [_dg_item_group, _service_item_group]
 
     display_tx_events(dict_events, "Events registered during the proposal execution", groups)
@@ -71,8 +70,8 @@ def add_event_emitter(event):
     return event
 
 
-def group_voting_events(tx: TransactionReceipt) -> List[EventDict]:
-    events = tx_events_from_receipt(tx)
+def group_voting_events(tx: Union[TransactionReceipt, DecodedEvents]) -> List[EventDict]:
+    events = decoded_tx_events(tx).to_list()
 
     # manually add event emitter address because it is dropped by EventDict class
     events = [add_event_emitter(e) for e in events]
@@ -89,8 +88,8 @@ def group_voting_events(tx: TransactionReceipt) -> List[EventDict]:
 
     return ret
 
-def group_dg_events(tx: TransactionReceipt) -> List[EventDict]:
-    events = tx_events_from_receipt(tx)
+def group_dg_events(tx: Union[TransactionReceipt, DecodedEvents]) -> List[EventDict]:
+    events = decoded_tx_events(tx).to_list()
 
     # manually add event emitter address because it is dropped by EventDict class
     events = [add_event_emitter(e) for e in events]
@@ -117,8 +116,8 @@ _dg_item_group = GroupBy(
 )
 
 
-def group_voting_events_from_receipt(tx: TransactionReceipt) -> List[EventDict]:
-    events = tx_events_from_receipt(tx)
+def group_voting_events_from_receipt(tx: Union[TransactionReceipt, DecodedEvents]) -> List[EventDict]:
+    events = decoded_tx_events(tx).to_list()
 
     # Validate "service" Voting events are in the log
     assert len(events) >= 2, "Unexpected events count"
@@ -150,8 +149,10 @@ def group_voting_events_from_receipt(tx: TransactionReceipt) -> List[EventDict]:
     return [EventDict(group) for group in groups]
 
 
-def group_dg_events_from_receipt(receipt: TransactionReceipt, timelock: str, admin_executor: str) -> List[EventDict]:
-    events = tx_events_from_receipt(receipt)
+def group_dg_events_from_receipt(
+    receipt: Union[TransactionReceipt, DecodedEvents], timelock: str, admin_executor: str
+) -> List[EventDict]:
+    events = decoded_tx_events(receipt).to_list()
 
     assert len(events) >= 1, "Unexpected events count"
     assert (
@@ -1,9 +1,10 @@
 #!/usr/bin/python3
 
-from typing import Callable, Dict, Optional, List, Annotated, Tuple
+from typing import Callable, Dict, Optional, List, Annotated, Tuple, Union
 from dataclasses import dataclass
+from functools import lru_cache
 
-from eth_event import StructLogError, decode_traceTransaction, decode_logs
+from eth_event import StructLogError, decode_traceTransaction, decode_logs, get_log_topic
 
 from brownie.network.transaction import TransactionReceipt
 from brownie.network.transaction import _step_internal, _step_external, _step_compare
@@ -70,111 +71,199 @@ def _find_fist_index_of_event_with_different_from_first_event_address(events):
     return len(events)
 
 
-def validate_events_from_abis():
-    events_signatures = {}
+class TopicIndex:
+    """
+    Event topic -> ABI multi-map over all the interfaces known to brownie.
+
+    Different contracts may declare events with the same signature but different argument
+    names or indexed flags (e.g. `TargetValidatorsCountChanged` of NodeOperatorsRegistry and
+    CSModule). All such variants are kept and the one to decode a log with is chosen by
+    the ABI of the contract that emitted it: the interface the repository knows the emitter
+    address by (`emitters`), or else the one brownie has the address registered with.
+    If the emitter is unknown, the arguments of the variants that differ by the names only
+    are named by their positions, `ARG0_VALUE`, ...
+    """
 
-    for interface_name in list(interface.__dict__)[1:]:
-        contract_abi = interface.__dict__[interface_name].abi
-        events_only = [item for item in contract_abi if item.get("type") == "event"]
-        for event in events_only:
+    def __init__(self, abis: Dict[str, List[Dict]], emitters: Optional[Dict[str, str]] = None):
+        self.variants: Dict[str, List[Dict]] = {}
+        # a proxy may be registered in brownie with its own ABI, e.g. by `interface.AppProxyUpgradeable(address)`
+        self.emitter_abis: Dict[str, List[Dict]] = {
+            address.lower(): abis[interface_name] for address, interface_name in (emitters or {}).items()
+        }
+
+        for interface_name in sorted(abis):
+            for event in abis[interface_name]:
+                if event.get("type") != "event" or event.get("anonymous"):
+                    continue
+                topic = get_log_topic(event)
+                variants = self.variants.setdefault(topic, [])
+                if all(_event_layout(variant) != _event_layout(event) for variant in variants):
+                    variants.append({"name": event["name"], "inputs": event["inputs"]})
+
+        self.topic_map: Dict[str, Dict] = {topic: variants[0] for topic, variants in self.variants.items()}
+        self._ambiguous_topics_by_name: Dict[str, List[str]] = {}
+        for topic, variants in self.variants.items():
+            if len(variants) > 1:
+                self._ambiguous_topics_by_name.setdefault(variants[0]["name"], []).append(topic)
+
+    def resolve(self, topic: str, address: str, topics_count: Optional[int] = None) -> Optional[Dict]:
+        variants = self.variants.get(topic)
+        if not variants:
+            # events of the contracts fetched from explorer or compiled by brownie
+            return _topics.get(topic)
+        if len(variants) == 1:
+            return variants[0]
+
+        emitter_abi = self.emitter_abis.get(str(address).lower())
+        if emitter_abi is None:
+            contract = state._find_contract(address)
+            emitter_abi = contract.abi if contract is not None else []
+        for event in emitter_abi:
+            if event.get("type") == "event" and not event.get("anonymous") and get_log_topic(event) == topic:
+                return {"name": event["name"], "inputs": event["inputs"]}
+
+        # the emitter is unknown, only the variants the log can be decoded with are left
+        if topics_count is not None:
+            variants = [
+                variant for variant in variants if sum(inp["indexed"] for inp in variant["inputs"]) + 1 == topics_count
+            ] or variants
+        if len(variants) == 1:
+            return variants[0]
+        return _positional_variant(variants[0])
+
+    def decode_logs(self, logs: List[Dict]) -> List[Dict]:
+        events = []
+        for log in logs:
+            topics = log["topics"] or []
+            abi = self.resolve(str(topics[0]).lower(), log["address"], len(topics)) if topics else None
+            topic_map = {str(topics[0]).lower(): abi} if abi is not None else {}
+            events.extend(decode_logs([log], topic_map, allow_undecoded=True))
+        return events
+
+    def rename_to_emitter_variant(self, event: Dict) -> Dict:
+        """
+        Rename decoded event arguments according to the emitter's ABI.
+
+        The trace decoder is only able to take a single ABI per topic, so the arguments of
+        the events declared differently by several contracts are renamed after decoding.
+        """
+        if not event["decoded"]:
+            return event
+
+        for topic in self._ambiguous_topics_by_name.get(event["name"], []):
+            abi = _topics.get(topic, self.topic_map[topic])
+            if [data["type"] for data in event["data"]] != [inp["type"] for inp in abi["inputs"]]:
+                continue
+
+            variant = self.resolve(topic, event["address"])
+            if [inp["indexed"] for inp in variant["inputs"]] == [inp["indexed"] for inp in abi["inputs"]]:
+                for data, inp in zip(event["data"], variant["inputs"]):
+                    data["name"] = inp["name"]
+            break
+
+        return event
+
+
+def _event_layout(event: Dict) -> List[Tuple[str, str, bool]]:
+    return [(inp["name"], inp["type"], inp["indexed"]) for inp in event["inputs"]]
+
+
+def _positional_variant(event: Dict) -> Dict:
+    """The event with the arguments named by their positions, for the logs it's unclear how to name"""
+    return {
+        "name": event["name"],
+        "inputs": [{**inp, "name": f"ARG{index}_VALUE"} for index, inp in enumerate(event["inputs"])],
+    }
+
+
+# Config addresses of the contracts emitting the events declared differently by other contracts,
+# mapped to the interfaces the events are decoded with
+KNOWN_EMITTERS = {
+    "NODE_OPERATORS_REGISTRY": "NodeOperatorsRegistry",
+    "SIMPLE_DVT": "SimpleDVT",
+    "SANDBOX": "Sandbox",
+    "CSM_ADDRESS": "CSModule",
+    "CS_ACCOUNTING_ADDRESS": "CSAccounting",
+    "CS_FEE_DISTRIBUTOR_ADDRESS": "CSFeeDistributor",
+    "CS_FEE_ORACLE_ADDRESS": "CSFeeOracle",
+    "LIDO": "Lido",
+    "WITHDRAWAL_QUEUE": "WithdrawalQueueERC721",
+    "BURNER": "Burner",
+    "WITHDRAWAL_VAULT": "WithdrawalVault",
+}
+
+
+@lru_cache(maxsize=None)
+def get_topic_index() -> TopicIndex:
+    """
+    Build the topic index over all brownie interfaces once per process.
 
-            event_name = event["name"]
-            event_inputs = event["inputs"]
+    Topics missing from the brownie's own `_topics` map are added there as well,
+    so `tx.events` of the brownie receipts can decode them too.
+    """
+    # the addresses of the network picked, imported here to keep the module usable without the config
+    from utils import config
+
+    topic_index = TopicIndex(
+        {interface_name: interface.__dict__[interface_name].abi for interface_name in list(interface.__dict__)[1:]},
+        {
+            getattr(config, address_name): interface_name
+            for address_name, interface_name in KNOWN_EMITTERS.items()
+            if getattr(config, address_name, None)
+        },
+    )
 
-            input_types = [inp["type"] for inp in event_inputs]
-            signature_str = event_name + "(" + ",".join(input_types) + ")"
-            event_signature = web3.keccak(text=signature_str).hex()
+    for topic, abi in topic_index.topic_map.items():
+        _topics.setdefault(topic, abi)
 
-            events_signatures[event_signature] = {
-                "name": event_name,
-                "inputs": event_inputs,
-            }
+    return topic_index
 
-    for topic in events_signatures:
-        if topic not in _topics:
-            _topics[topic] = events_signatures[topic]
-        else:
-            # check if the event name is the same
-            if _topics[topic]["name"] != events_signatures[topic]["name"]:
-                raise Exception(f"Event {topic} has different names in ABI")
-            # check if the event inputs are the same
-            for i in range(len(_topics[topic]["inputs"])):
-                if _topics[topic]["inputs"][i]["type"] != events_signatures[topic]["inputs"][i]["type"]:
-                    raise Exception(f"Event {topic} has different inputs in ABI")
 
+# Number of the decoded receipts kept in memory, a vote test usually deals with a few of them
+DECODED_EVENTS_CACHE_SIZE = 128
 
-def fix_duplicate_events(formatted_events, logs):
+
+@dataclass(frozen=True)
+class DecodedEvents:
     """
-    Brownie's `_topics` object does not reliably handle events that share the same
-    signature across multiple interface files. When this happens, Brownie treats
-    them as indistinguishable:
-    
-    TargetValidatorsCountChanged event is populated over 4 contracts:
-    NodeOperatorsRegistry:
-        event TargetValidatorsCountChanged(uint256 indexed nodeOperatorId, uint256 targetValidatorsCount, uint256 targetLimitMode);
-    SDVT:
-        event TargetValidatorsCountChanged(uint256 indexed nodeOperatorId, uint256 targetValidatorsCount, uint256 targetLimitMode);
-    Sandbox:
-        event TargetValidatorsCountChanged(uint256 indexed nodeOperatorId, uint256 targetValidatorsCount, uint256 targetLimitMode);
-    CSModule:
-        event TargetValidatorsCountChanged(uint256 indexed nodeOperatorId, uint256 targetLimitMode, uint256 targetValidatorsCount);
-
-    Although these ABIs define the same event name and signature, Brownie collects
-    only one version of the event in its internal `_topics` map. Because ABI
-    parsing order is undefined and environment-dependent (verified experimentally),
-    the version that ends up in `_topics` may differ between runs. As a result,
-    the argument order inferred by Brownie for `TargetValidatorsCountChanged`
-    becomes inconsistent, breaking `eth_event.decode_logs` when decoding logs.
-
-    To mitigate this, we explicitly append ordered parameters for each
-    encountered `TargetValidatorsCountChanged` event. This allows us to
-    validate arguments based on their positional order rather than relying
-    on potentially incorrect parameter names.
+    Decoded events of a single transaction receipt.
+
+    The instances are shared through the decoding cache, so the events are
+    handed out as fresh copies and the cached ones are never mutated.
     """
 
-    TARGET_TOPIC = web3.keccak(text='TargetValidatorsCountChanged(uint256,uint256,uint256)').hex().lower()
-    target_events = []
+    txid: str
+    events: Tuple[Dict, ...]
+
+    def to_list(self) -> List[Dict]:
+        return [{**event, "data": [dict(item) for item in event["data"]]} for event in self.events]
+
+    def to_event_dict(self) -> EventDict:
+        return EventDict(self.to_list())
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+
+def decoded_tx_events(tx: Union[TransactionReceipt, DecodedEvents]) -> DecodedEvents:
+    """
+    Return the decoded events of the receipt, fetching and decoding it once per process.
+
+    The cache key includes the block number and the transaction index, so a transaction
+    re-mined with the same hash after a chain revert is decoded again.
+    """
+    if isinstance(tx, DecodedEvents):
+        return tx
 
-    for i, log in enumerate(logs):
-        topics = log['topics'] or []
-        if len(topics) == 0:
-            continue
-        if topics[0].lower() == TARGET_TOPIC:
-            target_events.append(i)
-    
-    for ev_index in target_events:
-        # 1st (indexed) uint256 argument value
-        formatted_events[ev_index]['data'].append({
-            "name": "ARG0_VALUE",
-            "type": "uint256",
-            "value": int(logs[ev_index]['topics'][1], 16),
-        })
-
-        data_hex = logs[ev_index]['data']
-        if data_hex.startswith("0x"):
-            data_hex = data_hex[2:]
-
-        # 2nd (unindexed) uint256 argument value
-        formatted_events[ev_index]['data'].append({
-            "name": "ARG1_VALUE",
-            "type": "uint256",
-            "value": int(data_hex[0:64], 16),
-        })
-
-        # 3rd (unindexed) uint256 argument value
-        formatted_events[ev_index]['data'].append({
-            "name": "ARG2_VALUE",
-            "type": "uint256",
-            "value": int(data_hex[64:128], 16),
-        })
-
-
-def tx_events_from_receipt(tx: TransactionReceipt) -> List:
     if not tx.status:
         raise "Tx has reverted status (set to 0)"
 
-    result = web3.provider.make_request("eth_getTransactionReceipt", [tx.txid])
-    validate_events_from_abis()
+    return _decode_receipt_events(tx.txid, tx.block_number, tx.txindex)
+
+
+@lru_cache(maxsize=DECODED_EVENTS_CACHE_SIZE)
+def _decode_receipt_events(txid: str, block_number: int, txindex: int) -> DecodedEvents:
+    result = web3.provider.make_request("eth_getTransactionReceipt", [txid])
 
     # Process logs to ensure proper padding for string data
     logs = result["result"]["logs"]
@@ -187,13 +276,13 @@ def tx_events_from_receipt(tx: TransactionReceipt) -> List:
                 missing_chars = 64 - ((len(data) - 2) % 64)
                 log["data"] = data + "0" * missing_chars
 
-    events = decode_logs(logs, _topics, allow_undecoded=True)
-    
-    formatted_events = [format_event(i) for i in events]
+    events = get_topic_index().decode_logs(logs)
+
+    return DecodedEvents(txid=txid, events=tuple(format_event(i) for i in events))
+
 
-    fix_duplicate_events(formatted_events, logs)
-    
-    return formatted_events
+def tx_events_from_receipt(tx: Union[TransactionReceipt, DecodedEvents]) -> List:
+    return decoded_tx_events(tx).to_list()
 
 
 def tx_events_from_trace(tx: TransactionReceipt) -> Optional[List]:
@@ -225,12 +314,12 @@ def tx_events_from_trace(tx: TransactionReceipt) -> Optional[List]:
 
     initial_address = str(tx.receiver or tx.contract_address)
 
-    validate_events_from_abis()
+    topic_index = get_topic_index()
 
     events = decode_traceTransaction(trace, _topics, allow_undecoded=True, initial_address=initial_address)
     print(f" Done")
 
-    return [format_event(i) for i in events]
+    return [format_event(topic_index.rename_to_emitter_variant(i)) for i in events]
 
 
 def resolve_contract(addr: str) -> str:
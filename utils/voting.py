@@ -9,6 +9,7 @@ from brownie.network.event import _decode_logs
 from utils.evm_script import (
     encode_call_script,
     decode_evm_script,
+    resolve_script_abis,
     calls_info_pretty_print,
     EMPTY_CALLSCRIPT,
 )
@@ -134,13 +135,13 @@ def find_metadata_by_vote_id(vote_id: int) -> str:
     return str(events_after_voting["StartVote"]["metadata"])
 
 
-def _print_points(human_readable_script, encoded_script, vote_descriptions, cid: str) -> bool:
+def _print_points(human_readable_script, encoded_script, vote_descriptions, cid: str, resolved_abis=None) -> bool:
     print("\nPoints of voting:")
     total = len(human_readable_script)
     for ind, call in enumerate(human_readable_script):
         print(f"Point #{ind + 1}/{total}.")
         print(f'Description: {color("green")}{vote_descriptions[ind]}.{color}')
-        print(calls_info_pretty_print(call))
+        print(calls_info_pretty_print(call, resolved_abis))
         print("---------------------------")
 
     print(f"Encoded script bytes: {color('green')}{encoded_script}{color}")
@@ -197,11 +198,13 @@ def confirm_vote_script(
 
     # Show detailed description of prepared voting.
     if not silent:
+        resolved_abis = resolve_script_abis(encoded_call_script)
         human_readable_script = decode_evm_script(
             encoded_call_script,
             verbose=False,
             specific_net=CHAIN_NETWORK_NAME,
             repeat_is_error=True,
+            resolved_abis=resolved_abis,
         )
 
         vote_descriptions = list(vote_items.keys())
@@ -226,7 +229,7 @@ def confirm_vote_script(
                 )
             ]
 
-        agree = _print_points(human_readable_script, encoded_call_script, vote_descriptions, cid)
+        agree = _print_points(human_readable_script, encoded_call_script, vote_descriptions, cid, resolved_abis)
 
         if not agree:
             return False